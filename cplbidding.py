@@ -1,9 +1,7 @@
 import streamlit as st
-import pandas as pd
-from datetime import datetime
-import io
-from PIL import Image
+from functools import partial
 import os
+import sys
 from pathlib import Path
 
 # Page config
@@ -16,12 +14,26 @@ IMAGES_DIR = ASSETS_DIR / "images"
 EXCEL_PATH = ASSETS_DIR / "Cpl_data.xlsx"
 PLAYERS_CSV_PATH = ASSETS_DIR / "players.csv"
 TEAMS_CSV_PATH = ASSETS_DIR / "teams.csv"
+SCRIPTS_DIR = BASE_DIR / "scripts"
+
+# Shared modules (database sink, ...) live next to the data scripts
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+# pandas, Pillow and the shared modules are imported where they are used, so the setup screen
+# paints without paying for them (see scripts/benchmark_cold_start.py)
+
+# Optional: sales are also written to Postgres/Supabase when this is set
+DATABASE_URL = os.environ.get("CPL_DATABASE_URL")
 
 # Initialize session state
 if 'initialized' not in st.session_state:
     st.session_state.initialized = True
     st.session_state.auction_started = False
-    st.session_state.current_player_idx = 0
+    st.session_state.lot_scheduler = None
+    st.session_state.lot_ordering = 'base_desc'
+    st.session_state.auction_rounds = 3
+    st.session_state.reauction_base_pct = 100
     st.session_state.players_df = None
     st.session_state.teams = {}
     st.session_state.auction_history = []
@@ -30,6 +42,7 @@ if 'initialized' not in st.session_state:
     st.session_state.players_file_path = None
     st.session_state.teams_file_path = None
     st.session_state.unsold_players = []
+    st.session_state.ledger = None
 
 # Role emojis and CPL Category Configuration
 ROLE_EMOJIS = {
@@ -50,71 +63,112 @@ CPL_CATEGORY_BUDGETS = {
 # Total team budget
 TOTAL_TEAM_BUDGET = 1200
 
-# Auction order by category
-ROLE_ORDER = ['Batsman', 'Bowler', 'All-rounder', 'WicketKeeper']
+@st.cache_resource
+def get_db_sink():
+    """Shared database sink for sales, or None when CPL_DATABASE_URL is not set"""
+    if not DATABASE_URL:
+        return None
+    try:
+        from db_sink import DatabaseSink
+        return DatabaseSink(DATABASE_URL)
+    except Exception as e:
+        print(f"Database sync disabled: {e}")
+        return None
+
+@st.cache_resource
+def get_photo_index():
+    """Image files scanned once per process; lookups never touch the filesystem"""
+    from photo_index import PhotoIndex
+    return PhotoIndex([IMAGES_DIR / "players", IMAGES_DIR, BASE_DIR / "public" / "players"])
+
+@st.cache_resource
+def get_thumbnail_cache(size=150):
+    """Decoded size x size player photos shared across reruns; prefetches run on a background thread"""
+    from thumbnail_cache import ThumbnailCache
+    return ThumbnailCache(size=(size, size))
+
+def get_lot_prefetcher():
+    """This session's worker for the upcoming lots' photos, phase info and eligibility"""
+    if st.session_state.get('lot_prefetcher') is None:
+        from lot_prefetcher import LotPrefetcher
+        st.session_state.lot_prefetcher = LotPrefetcher()
+    return st.session_state.lot_prefetcher
+
+def get_result_exports():
+    """This session's export files (CSV/XLSX/Parquet), built on request and kept until the next lot"""
+    if st.session_state.get('result_exports') is None:
+        from result_exports import ResultExports
+        st.session_state.result_exports = ResultExports()
+    return st.session_state.result_exports
+
+def render_export(dataset, make_sheets, file_stem):
+    """Format picker with a Prepare button; the download is served from the cache until the ledger moves on"""
+    from result_exports import EXPORT_FORMATS
+    exports = get_result_exports()
+    version = len(get_ledger())
+    labels = {export_format.label: name for name, export_format in EXPORT_FORMATS.items()}
+    
+    col_format, col_prepare, col_download = st.columns([2, 1, 1])
+    with col_format:
+        fmt = labels[st.selectbox("Export format", options=list(labels), key=f'{dataset}_export_format',
+                                  label_visibility="collapsed")]
+    export_format = EXPORT_FORMATS[fmt]
+    data = exports.cached(dataset, fmt, version)
+    with col_prepare:
+        if st.button("📦 Prepare Export", key=f'{dataset}_export_prepare', disabled=data is not None,
+                     use_container_width=True):
+            try:
+                data = exports.build(dataset, fmt, version, make_sheets)
+            except ImportError:
+                st.error(f"{export_format.label} export needs pyarrow (pip install pyarrow)")
+    with col_download:
+        if data is not None:
+            st.download_button(f"📥 Download {export_format.extension.upper()}", data,
+                               f"{file_stem}.{export_format.extension}", export_format.mime,
+                               key=f'{dataset}_export_download', use_container_width=True)
+
+def player_photo_path(player):
+    """Image file for a player dict/row, or None"""
+    return get_photo_index().lookup(player.get('PhotoFileName'), player.get('PlayerID'), player.get('Name'))
+
+def set_unsold_page(number=0):
+    """Page of the Unsold grid to show (back to the first when the search or role filter changes)"""
+    st.session_state.unsold_page = number
 
 def load_team_logo(logo_filename):
-    """Load team logo from assets/images folder using filename"""
+    """Team logo from assets/images by filename, resized to 200x200 once and then served from the thumbnail cache"""
     try:
-        if logo_filename and pd.notna(logo_filename) and str(logo_filename).strip():
-            image_path = IMAGES_DIR / str(logo_filename)
-            if image_path.exists():
-                img = Image.open(image_path)
-                img = img.resize((200, 200))
-                return img
+        image_path = get_photo_index().lookup(logo_filename)
+        if image_path is not None:
+            return get_thumbnail_cache(200).get(image_path)
         return None
     except Exception as e:
         st.warning(f"Could not load logo {logo_filename}: {str(e)}")
         return None
 
-def load_player_photo(photo_filename):
-    """Load player photo from assets/images folder"""
+def load_player_photo(photo_filename, player_id=None, name=None):
+    """Load player photo by PhotoFileName, falling back to PlayerID and legacy name-based files"""
     try:
-        if photo_filename and pd.notna(photo_filename) and str(photo_filename).strip():
-            image_path = IMAGES_DIR / str(photo_filename)
-            if image_path.exists():
-                img = Image.open(image_path)
-                img = img.resize((200, 200))
-                return img
-        return None
+        return get_thumbnail_cache(200).get(get_photo_index().lookup(photo_filename, player_id, name))
     except Exception as e:
         return None
 
-def load_cpl_logo():
-    """Load CPL main logo from assets/images folder"""
+@st.cache_resource
+def load_cpl_logo(width=700):
+    """CPL main logo as a data: URI of the precomputed, width-capped PNG (no Pillow decode per run)"""
     try:
-        cpl_logo_path = IMAGES_DIR / "cpl.png"
-        if cpl_logo_path.exists():
-            img = Image.open(cpl_logo_path)
-            return img
-        return None
+        from static_assets import image_data_uri
+        return image_data_uri(IMAGES_DIR / "cpl.png", width)
     except Exception as e:
         return None
 
-def sort_players_by_category(players_df):
-    """Sort players by CPL category order (Batsmen first, then Bowlers, etc.)"""
-    # Create a copy to avoid modifying original
-    sorted_df = players_df.copy()
-    
-    # Create role order mapping
-    role_order_map = {role: i for i, role in enumerate(ROLE_ORDER)}
-    
-    # Add sort key column
-    sorted_df['role_order'] = sorted_df['Role'].map(role_order_map)
-    
-    # Sort by role order, then by base tokens (descending)
-    sorted_df = sorted_df.sort_values(['role_order', 'BaseTokens'], ascending=[True, False])
-    
-    # Remove the temporary column
-    sorted_df = sorted_df.drop('role_order', axis=1)
-    
-    return sorted_df
-
 def get_current_auction_phase(players_df, current_idx):
     """Get current auction phase information"""
     if current_idx >= len(players_df):
         return None
     
+    from player_schema import ROLE_ORDER
+    
     current_player = players_df.iloc[current_idx]
     current_role = current_player['Role']
     
@@ -177,56 +231,135 @@ def is_squad_full(team):
     """Check if team has reached max squad size"""
     return len(team['squad']) >= team['max_squad_size']
 
+def sale_violation(team, player_role, bid_price):
+    """The budget or role rule a sale would break (message), or None if it is allowed"""
+    if not can_afford_player(team, bid_price):
+        return "Insufficient tokens!"
+    if is_squad_full(team):
+        return "Squad is full!"
+    if not can_afford_category(team, player_role, bid_price):
+        return f"Insufficient {player_role} category budget!"
+    if not has_role_space(team, player_role):
+        return f"Maximum {player_role} players reached!"
+    return None
+
+def upcoming_lot_jobs(lots=None):
+    """
+    Prefetch jobs for the current lot and the next `lots` ones: photo decode, phase info and
+    each team's eligibility at the lot's base price. Keys carry what the result depends on
+    (lot order, the team's squad size, the round's base), so a sale only invalidates the
+    buying team's entries.
+    """
+    from lot_prefetcher import PREFETCH_LOTS, lot_order_key
+    players_df = st.session_state.players_df
+    teams = st.session_state.teams
+    order = lot_order_key(players_df)
+    photos = get_thumbnail_cache(200)
+    jobs = {}
+    for lot in get_lot_scheduler().upcoming((lots or PREFETCH_LOTS) + 1):
+        player = players_df.iloc[lot.row]
+        photo_path = player_photo_path(player)
+        if photo_path is not None:
+            jobs[('photo', str(photo_path))] = partial(photos.get, photo_path)
+        if lot.round == 1:
+            jobs[('phase', order, lot.row)] = partial(get_current_auction_phase, players_df, lot.row)
+        for team_name, team in teams.items():
+            jobs[('eligibility', player['PlayerID'], team_name, len(team['squad']), lot.base)] = partial(
+                sale_violation, team, player['Role'], lot.base)
+    return order, jobs
+
+def record_sale_in_db(team_name, player_data, bid_price, history_row):
+    """Mirror a sale to the database (queued, written in the background)"""
+    db_sink = get_db_sink()
+    if db_sink is not None:
+        db_sink.record_sale(
+            player_data['PlayerID'], player_data['Name'], player_data['Role'],
+            player_data['BaseTokens'], bid_price, team_name,
+            team_id=st.session_state.teams[team_name]['id'],
+            tokens_left_after=history_row['TokensLeft'], squad_size_after=history_row['SquadSize']
+        )
+
+def get_lot_scheduler():
+    """Lot queue of the auction (round 1 in players_df order, then re-auction rounds), created on first use"""
+    if st.session_state.get('lot_scheduler') is None:
+        from lot_scheduler import LotScheduler
+        st.session_state.lot_scheduler = LotScheduler.from_frame(
+            st.session_state.players_df,
+            rounds=st.session_state.get('auction_rounds', 3),
+            round_base=st.session_state.get('reauction_base_pct', 100) / 100
+        )
+    return st.session_state.lot_scheduler
+
+def get_ledger():
+    """Event ledger of the auction (for the History replay), started from the teams at auction start"""
+    if st.session_state.get('ledger') is None:
+        from auction_ledger import AuctionLedger
+        st.session_state.ledger = AuctionLedger(st.session_state.teams, st.session_state.unsold_players)
+    return st.session_state.ledger
+
 def add_player_to_team(team_name, player_data, bid_price):
     """Add player to team and update tokens"""
+    from bulk_sales import add_to_squad
     team = st.session_state.teams[team_name]
     
     # Validation
-    if not can_afford_player(team, bid_price):
-        return False, "Insufficient tokens!"
-    if is_squad_full(team):
-        return False, "Squad is full!"
-    if not can_afford_category(team, player_data['Role'], bid_price):
-        return False, f"Insufficient {player_data['Role']} category budget!"
-    if not has_role_space(team, player_data['Role']):
-        return False, f"Maximum {player_data['Role']} players reached!"
-    
-    # Add player
-    player_info = {
-        'PlayerID': player_data['PlayerID'],
-        'Name': player_data['Name'],
-        'Role': player_data['Role'],
-        'BaseTokens': player_data['BaseTokens'],
-        'BidPrice': bid_price,
-        'PhotoFileName': player_data.get('PhotoFileName', None)
-    }
-    team['squad'].append(player_info)
-    team['tokens_left'] -= bid_price
-    team['role_count'][player_data['Role']] += 1
+    error = sale_violation(team, player_data['Role'], bid_price)
+    if error:
+        return False, error
     
-    # Update category budget
-    if 'category_budgets' in team:
-        team['category_budgets'][player_data['Role']]['spent'] += bid_price
-        team['category_budgets'][player_data['Role']]['remaining'] -= bid_price
+    # Add player, update tokens/category budget and history
+    history_row = add_to_squad(team_name, team, player_data, bid_price)
+    st.session_state.auction_history.append(history_row)
+    get_ledger().record_sale(team_name, player_data, bid_price)
     
-    # Add to history
-    st.session_state.auction_history.append({
-        'Player': player_data['Name'],
-        'Role': player_data['Role'],
-        'BaseTokens': player_data['BaseTokens'],
-        'SoldPrice': bid_price,
-        'Team': team_name,
-        'TokensLeft': team['tokens_left'],
-        'SquadSize': len(team['squad'])
-    })
+    record_sale_in_db(team_name, player_data, bid_price, history_row)
     
     # Update Excel
-    update_excel_files()
+    update_excel_files({player_data['PlayerID']: {'Status': 'Sold', 'SoldTo': team_name, 'SoldPrice': bid_price}})
     
     return True, "Player added successfully!"
 
+def apply_bulk_results(uploaded_file):
+    """
+    Validate a file of paper results (PlayerID, Team, Price) in order and, if
+    every row passes, apply it in one step: teams swapped in, one Excel patch.
+    Returns (applied, violations).
+    """
+    from bulk_sales import read_results, validate_batch
+    rows = read_results(uploaded_file)
+    plan = validate_batch(rows, st.session_state.players_df, st.session_state.teams,
+                          st.session_state.unsold_players, sale_violation)
+    if plan.violations:
+        return False, plan.violations
+    
+    st.session_state.teams = plan.teams
+    sold_ids = {str(player['PlayerID']) for player, _, _, _ in plan.sales}
+    st.session_state.unsold_players = [
+        player for player in st.session_state.unsold_players if str(player['PlayerID']) not in sold_ids
+    ] + plan.unsold
+    for player, team_name, price, history_row in plan.sales:
+        st.session_state.auction_history.append(history_row)
+        record_sale_in_db(team_name, player, price, history_row)
+    ledger = get_ledger()
+    # Lots run on paper are settled in the scheduler too: sold ones (and any queued re-auction of them)
+    # are skipped, unsold ones move to the next round just like a live "Mark Unsold"
+    scheduler = get_lot_scheduler()
+    for player, team_name, price in plan.events:
+        if team_name is None:
+            ledger.record_unsold(player)
+            scheduler.defer([player['PlayerID']])
+        else:
+            ledger.record_sale(team_name, player, price)
+            scheduler.discard([player['PlayerID']])
+    
+    update_excel_files(plan.updates)
+    return True, rows
+
 def mark_player_unsold(player_data):
-    """Mark player as unsold"""
+    """Mark player as unsold (a player unsold again in a re-auction round is listed once)"""
+    get_ledger().record_unsold(player_data)
+    if any(str(player['PlayerID']) == str(player_data['PlayerID']) for player in st.session_state.unsold_players):
+        return
     st.session_state.unsold_players.append({
         'PlayerID': player_data['PlayerID'],
         'Name': player_data['Name'],
@@ -234,44 +367,27 @@ def mark_player_unsold(player_data):
         'BaseTokens': player_data['BaseTokens'],
         'PhotoFileName': player_data.get('PhotoFileName', None)
     })
-    update_excel_files()
+    update_excel_files({player_data['PlayerID']: {'Status': 'Unsold'}})
 
-def update_excel_files():
-    """Update Excel files with auction results"""
+def update_excel_files(updates):
+    """
+    Write auction results for the given players ({PlayerID: {column: value}})
+    into the Players sheet, patching only those cells; other sheets are kept as-is
+    """
     if st.session_state.players_file_path:
         try:
-            # Update players file with sold status
-            players_df = st.session_state.players_df.copy()
-            
-            # Add sold status columns if they don't exist
-            if 'Status' not in players_df.columns:
-                players_df['Status'] = 'Unsold'
-            if 'SoldTo' not in players_df.columns:
-                players_df['SoldTo'] = ''
-            if 'SoldPrice' not in players_df.columns:
-                players_df['SoldPrice'] = 0
-            
-            # Mark sold players
-            for history in st.session_state.auction_history:
-                mask = players_df['Name'] == history['Player']
-                players_df.loc[mask, 'Status'] = 'Sold'
-                players_df.loc[mask, 'SoldTo'] = history['Team']
-                players_df.loc[mask, 'SoldPrice'] = history['SoldPrice']
-            
-            # Mark explicitly unsold players
-            for unsold in st.session_state.unsold_players:
-                mask = players_df['Name'] == unsold['Name']
-                if len(players_df.loc[mask]) > 0 and players_df.loc[mask, 'Status'].values[0] != 'Sold':
-                    players_df.loc[mask, 'Status'] = 'Unsold'
-            
-            # Save to Excel
-            players_df.to_excel(st.session_state.players_file_path, index=False)
-            
+            from cell_patcher import patch_cells
+            report = patch_cells(st.session_state.players_file_path, updates)
+            if report.missing:
+                st.warning(f"Players not found in Excel: {', '.join(map(str, report.missing))}")
         except Exception as e:
             st.error(f"Error updating Excel: {str(e)}")
 
 def load_data_from_excel():
     """Load players and teams from Cpl_data.xlsx"""
+    import pandas as pd
+    from player_schema import compact_players, normalize_roles
+    
     try:
         if not EXCEL_PATH.exists():
             st.error(f"Excel file not found at {EXCEL_PATH}")
@@ -291,9 +407,6 @@ def load_data_from_excel():
             players_df = pd.read_excel(EXCEL_PATH, sheet_name=0)
             st.warning(f"⚠️ Using first sheet '{xls.sheet_names[0]}' for Players")
         
-        # Sort players by category for CPL auction order
-        players_df = sort_players_by_category(players_df)
-        
         # Load Teams sheet
         if 'Teams' in xls.sheet_names:
             teams_df = pd.read_excel(EXCEL_PATH, sheet_name='Teams')
@@ -312,22 +425,29 @@ def load_data_from_excel():
             """)
             return None, None
         
-        # Validate required columns
-        required_player_cols = ['PlayerID', 'Name', 'Role', 'BaseTokens']
-        required_team_cols = ['TeamID', 'TeamName', 'LogoFile']
+        # Known role spellings ('Wicket Keeper') are accepted; only roles that match none are errors
+        if 'Role' in players_df.columns:
+            players_df['Role'] = normalize_roles(players_df['Role'])
         
-        missing_player_cols = [col for col in required_player_cols if col not in players_df.columns]
-        missing_team_cols = [col for col in required_team_cols if col not in teams_df.columns]
-        
-        if missing_player_cols:
-            st.error(f"❌ Players sheet missing columns: {missing_player_cols}")
-            st.info(f"Found columns: {list(players_df.columns)}")
+        # Validate both sheets in one pass (columns, IDs, roles, tokens, photos) before anything uses them
+        from sheet_validator import validate_sheets
+        report = validate_sheets(players_df, teams_df, get_photo_index())
+        if report.warnings:
+            with st.expander(f"⚠️ {len(report.warnings)} warning(s) in Cpl_data.xlsx"):
+                for issue in report.warnings:
+                    st.write(f"{issue.sheet} row {issue.row}: {issue.message}")
+        if not report.ok:
+            st.error(f"❌ {len(report.errors)} problem(s) in Cpl_data.xlsx must be fixed before the auction:")
+            for issue in report.errors[:50]:
+                where = f"row {issue.row}" if issue.row else "sheet"
+                st.write(f"{issue.sheet} {where}: {issue.message}")
+            if len(report.errors) > 50:
+                st.write(f"... and {len(report.errors) - 50} more")
             return None, None
         
-        if missing_team_cols:
-            st.error(f"❌ Teams sheet missing columns: {missing_team_cols}")
-            st.info(f"Found columns: {list(teams_df.columns)}")
-            return None, None
+        # Compact dtypes (categorical Role/Status, small ints); players stay in sheet order until
+        # Start Auction fixes the lot order with order_players()
+        players_df = compact_players(players_df)
         
         return players_df, teams_df
         
@@ -338,6 +458,52 @@ def load_data_from_excel():
         st.code(traceback.format_exc())
         return None, None
 
+def render_team_dashboards(teams):
+    """Logo, tokens, squad and category budget cards for each team (live or replayed state)"""
+    from player_schema import ROLE_ORDER
+    
+    num_cols = min(4, len(teams))
+    rows_needed = (len(teams) + num_cols - 1) // num_cols
+
+    for row in range(rows_needed):
+        cols = st.columns(num_cols)
+        for col_idx in range(num_cols):
+            team_idx = row * num_cols + col_idx
+            if team_idx < len(teams):
+                team_name = list(teams.keys())[team_idx]
+                team_data = teams[team_name]
+
+                with cols[col_idx]:
+                    # Load and display logo using filename from Excel
+                    logo_img = load_team_logo(team_data['logo'])
+
+                    if logo_img:
+                        st.image(logo_img, width=100)
+
+                    st.markdown(f"### {team_name}")
+
+                    st.metric("Tokens Left", f"🪙 {team_data['tokens_left']}", 
+                             delta=f"-{team_data['max_tokens'] - team_data['tokens_left']}")
+                    st.metric("Squad", f"{len(team_data['squad'])}/{team_data['max_squad_size']}")
+
+                    # Role breakdown
+                    breakdown = " ".join([
+                        f"{ROLE_EMOJIS[role]}{count}" 
+                        for role, count in team_data['role_count'].items() 
+                        if count > 0
+                    ])
+                    if breakdown:
+                        st.caption(f"**Squad:** {breakdown}")
+                    else:
+                        st.caption("No players yet")
+
+                    # Category budgets
+                    if 'category_budgets' in team_data:
+                        st.caption("**Category Budgets:**")
+                        for role in ROLE_ORDER:
+                            budget = team_data['category_budgets'][role]
+                            st.caption(f"{ROLE_EMOJIS[role]} {budget['remaining']} tokens left")
+
 # Custom CSS
 st.markdown("""
 <style>
@@ -393,6 +559,7 @@ with st.sidebar:
                 st.write(f"**File size:** {file_size} bytes ({file_size/1024:.2f} KB)")
                 
                 # Try to read Excel file
+                import pandas as pd
                 xls = pd.ExcelFile(EXCEL_PATH)
                 st.write(f"**Number of sheets:** {len(xls.sheet_names)}")
                 st.write(f"**Sheet names:** {xls.sheet_names}")
@@ -425,11 +592,18 @@ with st.sidebar:
         st.session_state.max_tokens = st.number_input("Max Tokens per Team", 500, 5000, TOTAL_TEAM_BUDGET, 100)
         st.session_state.max_squad_size = st.number_input("Max Squad Size", 10, 25, 15, 1)
         
+        from lot_scheduler import ORDERINGS
+        ordering_labels = {label: ordering for ordering, label in ORDERINGS.items()}
+        st.session_state.lot_ordering = ordering_labels[st.selectbox("Lot Order", options=list(ordering_labels))]
+        st.session_state.auction_rounds = st.number_input("Auction Rounds (unsold players are re-auctioned)", 1, 3, 3, 1)
+        st.session_state.reauction_base_pct = st.number_input("Re-auction Base Price (% of previous round)", 50, 100, 100, 5)
+        
         st.subheader("2. Load Data")
         
         # Load from Cpl_data.xlsx
         if st.button("📂 Load CPL Data", type="primary"):
             players_df, teams_df = load_data_from_excel()
+            get_photo_index.clear()  # pick up photos added since the last load
             
             if players_df is not None and teams_df is not None:
                 st.session_state.players_df = players_df
@@ -449,6 +623,7 @@ with st.sidebar:
                 st.dataframe(st.session_state.players_df.head())
             
             with st.expander("👀 Preview Teams"):
+                import pandas as pd
                 teams_preview = pd.DataFrame([
                     {'Team': name, 'ID': data['id'], 'Logo': data['logo']} 
                     for name, data in st.session_state.teams.items()
@@ -459,7 +634,14 @@ with st.sidebar:
         
         if st.button("🚀 Start Auction", type="primary", disabled=(st.session_state.players_df is None)):
             if st.session_state.players_df is not None and len(st.session_state.teams) > 0:
+                from lot_scheduler import order_players
+                # The lot order is fixed once here; re-auction rounds never re-sort players_df
+                st.session_state.players_df = order_players(st.session_state.players_df, st.session_state.lot_ordering)
                 st.session_state.auction_started = True
+                st.session_state.ledger = None
+                st.session_state.lot_scheduler = None
+                get_ledger()
+                get_lot_scheduler()
                 st.rerun()
             else:
                 st.error("Please load players and teams data first!")
@@ -467,6 +649,9 @@ with st.sidebar:
     else:
         st.success("🎯 Auction in Progress")
         if st.button("🔄 Reset Auction"):
+            # Stop this session's prefetch worker before dropping the only reference to it
+            if st.session_state.get('lot_prefetcher') is not None:
+                st.session_state.lot_prefetcher.close()
             for key in list(st.session_state.keys()):
                 del st.session_state[key]
             st.rerun()
@@ -479,10 +664,39 @@ with st.sidebar:
         progress = (len(st.session_state.auction_history) + len(st.session_state.unsold_players)) / len(st.session_state.players_df)
         st.progress(progress)
         
+        db_sink = get_db_sink()
+        if db_sink is not None:
+            sync = db_sink.metrics()
+            st.metric("DB Sync Lag", f"{sync['lag_seconds']:.1f}s", f"{sync['pending']} pending", delta_color="off")
+            if sync['failed']:
+                st.warning(f"⚠️ {sync['failed']} sale(s) failed to sync: {sync['last_error']}")
+        
+        st.divider()
+        
+        # Paper results (e.g. lots run while the hall Wi-Fi was down), applied in one validated pass
+        with st.expander("📋 Bulk Import Results"):
+            st.caption("CSV/XLSX with PlayerID, Team, Price in auction order; leave Team blank or 'Unsold' for unsold lots")
+            results_file = st.file_uploader("Results file", type=['csv', 'xlsx'], key='bulk_results_file')
+            if results_file is not None and st.button("✅ Validate & Apply", use_container_width=True):
+                try:
+                    applied, outcome = apply_bulk_results(results_file)
+                except ValueError as e:
+                    st.error(f"❌ {str(e)}")
+                else:
+                    if applied:
+                        st.session_state.bulk_import_message = f"Applied {len(outcome)} result(s) from {results_file.name}"
+                        st.rerun()
+                    st.error(f"❌ {len(outcome)} problem(s) found, nothing was applied:")
+                    for violation in outcome:
+                        st.write(f"Line {violation.line} ({violation.player_id}): {violation.message}")
+            if st.session_state.get('bulk_import_message'):
+                st.success(f"🎉 {st.session_state.bulk_import_message}")
+        
         st.divider()
         
         # Category Overview
         st.subheader("📊 Category Overview")
+        from player_schema import ROLE_ORDER
         for role in ROLE_ORDER:
             role_players = st.session_state.players_df[st.session_state.players_df['Role'] == role]
             sold_in_role = len([h for h in st.session_state.auction_history if h['Role'] == role])
@@ -499,7 +713,7 @@ cpl_logo = load_cpl_logo()
 if cpl_logo:
     col1, col2, col3 = st.columns([1, 2, 1])
     with col2:
-        st.image(cpl_logo, width=700)
+        st.markdown(f'<img src="{cpl_logo}" width="700" style="max-width: 100%;" alt="CPL">', unsafe_allow_html=True)
 
 if not st.session_state.auction_started:
     # Welcome text
@@ -524,60 +738,42 @@ if not st.session_state.auction_started:
     """)
     
 else:
+    import pandas as pd
+    from player_schema import ROLE_ORDER
+    
     # Header with tabs
     tab1, tab2, tab3 = st.tabs(["🎯 Live Auction", "👁️ Unsold Players", "📜 Auction History"])
     
     with tab1:
+        # Queue the current and next lots' photos, phase info and eligibility on the worker thread;
+        # lots that dropped out of the window (sale, skip, reorder) are cancelled
+        prefetcher = get_lot_prefetcher()
+        scheduler = get_lot_scheduler()
+        lot = scheduler.current()
+        lot_order, lot_jobs = upcoming_lot_jobs()
+        prefetcher.schedule(lot_jobs)
+        
         # Team Dashboards
         st.subheader("📊 Team Dashboards")
         
-        num_cols = min(4, len(st.session_state.teams))
-        rows_needed = (len(st.session_state.teams) + num_cols - 1) // num_cols
-        
-        for row in range(rows_needed):
-            cols = st.columns(num_cols)
-            for col_idx in range(num_cols):
-                team_idx = row * num_cols + col_idx
-                if team_idx < len(st.session_state.teams):
-                    team_name = list(st.session_state.teams.keys())[team_idx]
-                    team_data = st.session_state.teams[team_name]
-                    
-                    with cols[col_idx]:
-                        # Load and display logo using filename from Excel
-                        logo_img = load_team_logo(team_data['logo'])
-                        
-                        if logo_img:
-                            st.image(logo_img, width=100)
-                        
-                        st.markdown(f"### {team_name}")
-                        
-                        st.metric("Tokens Left", f"🪙 {team_data['tokens_left']}", 
-                                 delta=f"-{team_data['max_tokens'] - team_data['tokens_left']}")
-                        st.metric("Squad", f"{len(team_data['squad'])}/{team_data['max_squad_size']}")
-                        
-                        # Role breakdown
-                        breakdown = " ".join([
-                            f"{ROLE_EMOJIS[role]}{count}" 
-                            for role, count in team_data['role_count'].items() 
-                            if count > 0
-                        ])
-                        if breakdown:
-                            st.caption(f"**Squad:** {breakdown}")
-                        else:
-                            st.caption("No players yet")
-                        
-                        # Category budgets
-                        if 'category_budgets' in team_data:
-                            st.caption("**Category Budgets:**")
-                            for role in ROLE_ORDER:
-                                budget = team_data['category_budgets'][role]
-                                st.caption(f"{ROLE_EMOJIS[role]} {budget['remaining']} tokens left")
+        render_team_dashboards(st.session_state.teams)
         
         st.divider()
         
         # Current Auction Phase
-        if st.session_state.current_player_idx < len(st.session_state.players_df):
-            current_phase = get_current_auction_phase(st.session_state.players_df, st.session_state.current_player_idx)
+        if lot is not None and lot.round > 1:
+            lot_number, round_lots = scheduler.round_progress(lot)
+            st.markdown(f"""
+            <div style='background: linear-gradient(135deg, #f7971e 0%, #ffd200 100%); padding: 20px; border-radius: 15px; color: #333; text-align: center; margin-bottom: 20px;'>
+                <h2 style='margin: 0; font-size: 28px;'>🔁 Re-auction Round {lot.round}/{scheduler.rounds}</h2>
+                <p style='margin: 10px 0; font-size: 16px;'>Unsold players: lot {lot_number}/{round_lots}</p>
+            </div>
+            """, unsafe_allow_html=True)
+        elif lot is not None:
+            current_phase = prefetcher.result(
+                ('phase', lot_order, lot.row),
+                partial(get_current_auction_phase, st.session_state.players_df, lot.row)
+            )
             
             if current_phase:
                 st.markdown(f"""
@@ -589,8 +785,8 @@ else:
                 """, unsafe_allow_html=True)
         
         # Current Player
-        if st.session_state.current_player_idx < len(st.session_state.players_df):
-            player = st.session_state.players_df.iloc[st.session_state.current_player_idx]
+        if lot is not None:
+            player = st.session_state.players_df.iloc[lot.row]
             
             col1, col2 = st.columns([2, 3])
             
@@ -598,7 +794,9 @@ else:
                 st.subheader("🎯 Current Player")
                 
                 # Display player photo if available
-                player_img = load_player_photo(player.get('PhotoFileName'))
+                photo_job = partial(load_player_photo, player.get('PhotoFileName'), player.get('PlayerID'), player.get('Name'))
+                photo_path = player_photo_path(player)
+                player_img = prefetcher.result(('photo', str(photo_path)), photo_job) if photo_path else photo_job()
                 if player_img:
                     st.image(player_img, width=200)
                 
@@ -610,7 +808,7 @@ else:
                         {ROLE_EMOJIS.get(player['Role'], '⭐')} {player['Role']}
                     </p>
                     <p style='font-size: 24px; font-weight: bold; margin: 5px 0;'>
-                        Base: {player['BaseTokens']} 🪙
+                        Base: {lot.base} 🪙
                     </p>
                     <p style='font-size: 14px; opacity: 0.9;'>
                         Player ID: {player['PlayerID']}
@@ -621,13 +819,29 @@ else:
             with col2:
                 st.subheader("💰 Place Bid")
                 
+                # Teams that can still buy this player at base price (prefetched during the previous lot)
+                blocked = {}
+                for team_name, team in st.session_state.teams.items():
+                    reason = prefetcher.result(
+                        ('eligibility', player['PlayerID'], team_name, len(team['squad']), lot.base),
+                        partial(sale_violation, team, player['Role'], lot.base)
+                    )
+                    if reason:
+                        blocked[team_name] = reason
+                num_teams = len(st.session_state.teams)
+                if blocked:
+                    st.caption(f"⚠️ {num_teams - len(blocked)}/{num_teams} teams can buy at base price. "
+                               + "; ".join(f"{name}: {reason}" for name, reason in blocked.items()))
+                else:
+                    st.caption(f"✅ All {num_teams} teams can buy at base price")
+                
                 # Bid form
                 selected_team = st.selectbox("Select Winning Team", 
                                             options=list(st.session_state.teams.keys()))
                 
                 bid_price = st.number_input("Final Bid Price (Tokens)", 
-                                           min_value=int(player['BaseTokens']),
-                                           value=int(player['BaseTokens']),
+                                           min_value=lot.base,
+                                           value=lot.base,
                                            step=5)
                 
                 # Show team affordability
@@ -678,7 +892,12 @@ else:
                         success, message = add_player_to_team(selected_team, player, bid_price)
                         if success:
                             st.success(f"🎉 {player['Name']} sold to {selected_team} for {bid_price} tokens!")
-                            st.session_state.current_player_idx += 1
+                            if lot.round > 1:
+                                st.session_state.unsold_players = [
+                                    unsold for unsold in st.session_state.unsold_players
+                                    if str(unsold['PlayerID']) != str(player['PlayerID'])
+                                ]
+                            scheduler.advance()
                             st.rerun()
                         else:
                             st.error(message)
@@ -686,8 +905,11 @@ else:
                 with col_btn2:
                     if st.button("⏭️ Mark Unsold", use_container_width=True):
                         mark_player_unsold(player)
-                        st.warning(f"{player['Name']} marked as UNSOLD")
-                        st.session_state.current_player_idx += 1
+                        requeued = scheduler.requeue()
+                        if requeued:
+                            st.warning(f"{player['Name']} marked as UNSOLD - back in round {requeued.round} at {requeued.base} tokens")
+                        else:
+                            st.warning(f"{player['Name']} marked as UNSOLD")
                         st.rerun()
         
         else:
@@ -710,7 +932,7 @@ else:
             st.info(f"Total Unsold Players: {len(st.session_state.unsold_players)}")
             
             # Assign unsold players section
-            if st.session_state.current_player_idx >= len(st.session_state.players_df):
+            if get_lot_scheduler().current() is None:
                 st.markdown("### 🔄 Assign Unsold Players to Teams")
                 st.info("Auction is complete! You can now manually assign unsold players to teams.")
                 
@@ -746,33 +968,59 @@ else:
                 
                 st.divider()
             
-            # Display unsold players in cards
+            # Searchable, paged grid: only the visible page's photos are loaded, the next page's are prefetched
+            from unsold_grid import UnsoldIndex, index_key
+            key = index_key(st.session_state.unsold_players)
+            if st.session_state.get('unsold_index_key') != key:
+                st.session_state.unsold_index = UnsoldIndex(st.session_state.unsold_players)
+                st.session_state.unsold_index_key = key
+            
+            col_search, col_role = st.columns([3, 1])
+            with col_search:
+                query = st.text_input("🔍 Search by name or Player ID", key='unsold_query',
+                                      on_change=set_unsold_page)
+            with col_role:
+                role_filter = st.selectbox("Role", options=['All'] + ROLE_ORDER, key='unsold_role',
+                                           on_change=set_unsold_page)
+            
+            page = st.session_state.unsold_index.page(query, None if role_filter == 'All' else role_filter,
+                                                      st.session_state.get('unsold_page', 0))
+            st.session_state.unsold_page = page.number
+            
+            thumbnails = get_thumbnail_cache()
+            thumbnails.prefetch(player_photo_path(player) for player in page.next_players)
+            
             cols_per_row = 4
-            for i in range(0, len(st.session_state.unsold_players), cols_per_row):
+            for i in range(0, len(page.players), cols_per_row):
                 cols = st.columns(cols_per_row)
-                for j in range(cols_per_row):
-                    idx = i + j
-                    if idx < len(st.session_state.unsold_players):
-                        player = st.session_state.unsold_players[idx]
-                        with cols[j]:
-                            # Display player photo if available
-                            player_img = load_player_photo(player.get('PhotoFileName'))
-                            if player_img:
-                                st.image(player_img, width=150)
-                            
-                            st.markdown(f"""
-                            <div style='background: #ff6b6b; padding: 15px; border-radius: 10px; color: white; text-align: center;'>
-                                <h4 style='margin: 0;'>{player['Name']}</h4>
-                                <p style='margin: 5px 0;'>{ROLE_EMOJIS.get(player['Role'], '⭐')} {player['Role']}</p>
-                                <p style='font-weight: bold; margin: 5px 0;'>Base: {player['BaseTokens']} 🪙</p>
-                            </div>
-                            """, unsafe_allow_html=True)
+                for j, player in enumerate(page.players[i:i + cols_per_row]):
+                    with cols[j]:
+                        # Display player photo if available
+                        player_img = thumbnails.get(player_photo_path(player))
+                        if player_img:
+                            st.image(player_img, width=150)
+                        
+                        st.markdown(f"""
+                        <div style='background: #ff6b6b; padding: 15px; border-radius: 10px; color: white; text-align: center;'>
+                            <h4 style='margin: 0;'>{player['Name']}</h4>
+                            <p style='margin: 5px 0;'>{ROLE_EMOJIS.get(player['Role'], '⭐')} {player['Role']}</p>
+                            <p style='font-weight: bold; margin: 5px 0;'>Base: {player['BaseTokens']} 🪙</p>
+                        </div>
+                        """, unsafe_allow_html=True)
+            
+            col_prev, col_page, col_next = st.columns([1, 2, 1])
+            with col_prev:
+                st.button("⬅️ Previous", disabled=page.number == 0, use_container_width=True,
+                          on_click=set_unsold_page, args=(page.number - 1,))
+            with col_page:
+                st.caption(f"Page {page.number + 1}/{page.total_pages} | {page.matches} matching player(s)")
+            with col_next:
+                st.button("Next ➡️", disabled=page.number + 1 >= page.total_pages, use_container_width=True,
+                          on_click=set_unsold_page, args=(page.number + 1,))
             
-            # Download unsold players
-            if st.button("📥 Download Unsold Players List"):
-                unsold_df = pd.DataFrame(st.session_state.unsold_players)
-                csv = unsold_df.to_csv(index=False)
-                st.download_button("Download CSV", csv, "unsold_players.csv", "text/csv")
+            # Download unsold players (built only when asked for, reused until the next lot)
+            from result_exports import unsold_sheets
+            render_export('unsold', partial(unsold_sheets, st.session_state.unsold_players), "unsold_players")
         else:
             st.info("No unsold players yet")
     
@@ -783,8 +1031,27 @@ else:
             history_df = pd.DataFrame(st.session_state.auction_history)
             st.dataframe(history_df, use_container_width=True)
             
-            # Export option
-            csv = history_df.to_csv(index=False)
-            st.download_button("📥 Download Auction Results", csv, "auction_results.csv", "text/csv")
+            # Export option: all sales, plus one sheet per team squad in the Excel file
+            from result_exports import results_sheets
+            render_export('results', partial(results_sheets, st.session_state.auction_history, st.session_state.teams),
+                          "auction_results")
         else:
             st.info("No auction history yet")
+        
+        # Team dashboards as they stood after any lot, rebuilt from the nearest ledger checkpoint
+        ledger = get_ledger()
+        if len(ledger) > 0:
+            st.divider()
+            st.subheader("⏪ Replay Auction")
+            event_number = st.slider("Show teams after lot", min_value=0, max_value=len(ledger),
+                                     value=len(ledger), key='replay_event')
+            if event_number == 0:
+                st.caption("Before the first lot")
+            else:
+                event = ledger.events[event_number - 1]
+                outcome = f"sold to {event.team} for {event.price} 🪙" if event.kind == 'sale' else "unsold"
+                st.caption(f"Lot {event.number}: {event.player['Name']} ({event.player['Role']}) {outcome} at {event.at}")
+            
+            replayed = ledger.state_at(event_number)
+            render_team_dashboards(replayed.teams)
+            st.caption(f"Unsold at this point: {len(replayed.unsold)}")
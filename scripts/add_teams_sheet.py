@@ -6,6 +6,8 @@ Add Teams sheet to CPL_Players_Editable.xlsx
 import pandas as pd
 from pathlib import Path
 
+import workbook_cache
+
 def add_teams_sheet():
     """Add Teams sheet with team information"""
     
@@ -14,7 +16,7 @@ def add_teams_sheet():
     
     # Read captain assignments to get team info
     captain_file = Path('data/captain_team_assignments.xlsx')
-    teams_df = pd.read_excel(captain_file, sheet_name='Teams')
+    teams_df = workbook_cache.read_excel(captain_file, sheet_name='Teams')
     
     print(f"📊 Found {len(teams_df)} teams")
     print()
@@ -38,12 +40,11 @@ def add_teams_sheet():
     players_file = Path('data/CPL_Players_Editable.xlsx')
     
     # Read all existing sheets
-    with pd.ExcelFile(players_file) as xls:
-        existing_sheets = xls.sheet_names
-        print(f"📄 Existing sheets: {existing_sheets}")
+    existing_sheets = workbook_cache.sheet_names(players_file)
+    print(f"📄 Existing sheets: {existing_sheets}")
     
     # Read players data
-    players_df = pd.read_excel(players_file, sheet_name='Players')
+    players_df = workbook_cache.read_excel(players_file, sheet_name='Players')
     
     print()
     print("💾 Saving updated Excel file with Teams sheet...")
@@ -1,45 +1,58 @@
 #!/usr/bin/env python3
 """
-Assign the two missing captains to their teams
+Assign captains and vice-captains that earlier exact-name passes missed
 """
 
 import pandas as pd
 from pathlib import Path
 
+import workbook_cache
+from name_matcher import resolve_team_leaders
+
 def assign_missing_captains():
-    """Assign Mahethar and Anil as captains"""
+    """Assign every resolvable captain/vice-captain not yet pre-sold to its team"""
     
     print("👑 Assigning Missing Captains...")
     print("=" * 70)
     
+    captain_file = Path('data/captain_team_assignments.xlsx')
+    teams_df = workbook_cache.read_excel(captain_file, sheet_name='Teams')
+    
     players_file = Path('data/CPL_Players_Editable.xlsx')
-    players_df = pd.read_excel(players_file, sheet_name='Players')
+    players_df = workbook_cache.read_excel(players_file, sheet_name='Players')
+    
+    for flag in ['IsCaptain', 'IsViceCaptain']:
+        if flag not in players_df.columns:
+            players_df[flag] = False
+    
+    # Resolve all team leaders against the players list in one pass
+    leaders = resolve_team_leaders(teams_df, players_df)
+    
+    for _, row in leaders[leaders['PlayerID'].isna() | leaders['Ambiguous']].iterrows():
+        print(f"  ❌ {row['TeamName']}: could not resolve {row['Name']}")
+    leaders = leaders[leaders['PlayerID'].notna() & ~leaders['Ambiguous']]
+    
+    # Only touch leaders that are not already flagged and sold to the right team
+    position_flag = leaders['Position'].map({'Captain': 'IsCaptain', 'ViceCaptain': 'IsViceCaptain'})
+    current = players_df.drop_duplicates('PlayerID').set_index('PlayerID')
+    # Empty IsCaptain/IsViceCaptain cells read as NaN, which is not a flag
+    is_flagged = current[['IsCaptain', 'IsViceCaptain']].eq(True)
+    flagged = [bool(is_flagged.at[pid, flag]) for pid, flag in zip(leaders['PlayerID'], position_flag)]
+    sold_to_team = (leaders['PlayerID'].map(current['SoldTo']) == leaders['TeamName']).values
+    missing = leaders[~(pd.Series(flagged, index=leaders.index) & sold_to_team)]
     
-    # Assign Mahethar Reddy Bhavanam (14HB) to Team 1 as Captain
-    mahethar_idx = players_df[players_df['PlayerID'] == '14HB'].index
-    if not mahethar_idx.empty:
-        idx = mahethar_idx[0]
-        base_tokens = players_df.at[idx, 'BaseTokens']
-        players_df.at[idx, 'IsCaptain'] = True
-        players_df.at[idx, 'Status'] = 'Sold'
-        players_df.at[idx, 'SoldTo'] = 'Team 1'
-        players_df.at[idx, 'SoldPrice'] = base_tokens
-        print(f"  ✅ Assigned Mahethar Reddy Bhavanam (14HB) as Captain of Team 1")
-    else:
-        print(f"  ❌ Player 14HB not found")
+    for _, row in missing.iterrows():
+        mask = players_df['PlayerID'] == row['PlayerID']
+        flag = 'IsCaptain' if row['Position'] == 'Captain' else 'IsViceCaptain'
+        players_df.loc[mask, flag] = True
+        players_df.loc[mask, 'Status'] = 'Sold'
+        players_df.loc[mask, 'SoldTo'] = row['TeamName']
+        players_df.loc[mask, 'SoldPrice'] = players_df.loc[mask, 'BaseTokens']
+        label = 'Captain' if row['Position'] == 'Captain' else 'Vice-Captain'
+        print(f"  ✅ Assigned {row['MatchedName']} ({row['PlayerID']}) as {label} of {row['TeamName']}")
     
-    # Assign Anil Mardani (MXL5) to Team 2 as Captain
-    anil_idx = players_df[players_df['PlayerID'] == 'MXL5'].index
-    if not anil_idx.empty:
-        idx = anil_idx[0]
-        base_tokens = players_df.at[idx, 'BaseTokens']
-        players_df.at[idx, 'IsCaptain'] = True
-        players_df.at[idx, 'Status'] = 'Sold'
-        players_df.at[idx, 'SoldTo'] = 'Team 2'
-        players_df.at[idx, 'SoldPrice'] = base_tokens
-        print(f"  ✅ Assigned Anil Mardani (MXL5) as Captain of Team 2")
-    else:
-        print(f"  ❌ Player MXL5 not found")
+    if missing.empty:
+        print("  ℹ️  All captains and vice-captains are already assigned")
     
     print()
     
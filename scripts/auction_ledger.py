@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Event ledger with periodic checkpoints for replaying the auction
+Every sale and unsold lot is appended as a LedgerEvent, and a copy of the
+full state (teams and unsold list) is kept after every K events. The state
+as of any event n is rebuilt from the checkpoint at or before n plus at
+most K-1 replayed events, so the app can show the team dashboards at any
+point of the auction without replaying it from the start.
+
+    ledger = AuctionLedger(teams)
+    ledger.record_sale('Mavericks', player, 60)
+    ledger.state_at(37).teams
+"""
+
+import copy
+from collections import namedtuple
+from datetime import datetime
+
+from bulk_sales import add_to_squad, player_record
+
+# number counts from 1; team and price are None for unsold lots
+LedgerEvent = namedtuple('LedgerEvent', ['number', 'kind', 'player', 'team', 'price', 'at'])
+
+LedgerState = namedtuple('LedgerState', ['teams', 'unsold'])
+
+# Checkpoint spacing: replays touch at most this many events, at one
+# teams-sized copy per CHECKPOINT_EVERY lots
+CHECKPOINT_EVERY = 16
+
+
+def apply_event(state, event):
+    """Apply one event to a LedgerState in place"""
+    player_id = event.player['PlayerID']
+    if event.kind == 'sale':
+        add_to_squad(event.team, state.teams[event.team], event.player, event.price)
+        state.unsold[:] = [player for player in state.unsold if player['PlayerID'] != player_id]
+    else:
+        # A player unsold again in a re-auction round is listed once
+        state.unsold[:] = [player for player in state.unsold if player['PlayerID'] != player_id]
+        state.unsold.append(dict(event.player))
+
+
+class AuctionLedger:
+    """Append-only sale/unsold log of one auction, checkpointed every `checkpoint_every` events"""
+
+    def __init__(self, teams, unsold=(), checkpoint_every=CHECKPOINT_EVERY):
+        self.checkpoint_every = checkpoint_every
+        self.events = []
+        self._head = LedgerState(copy.deepcopy(teams), [dict(player) for player in unsold])
+        self._checkpoints = [copy.deepcopy(self._head)]
+
+    def __len__(self):
+        return len(self.events)
+
+    def record_sale(self, team_name, player_data, price):
+        return self._record('sale', player_data, team_name, price)
+
+    def record_unsold(self, player_data):
+        return self._record('unsold', player_data, None, None)
+
+    def _record(self, kind, player_data, team_name, price):
+        event = LedgerEvent(len(self.events) + 1, kind, player_record(player_data), team_name, price,
+                            datetime.now().isoformat(timespec='seconds'))
+        apply_event(self._head, event)
+        self.events.append(event)
+        if len(self.events) % self.checkpoint_every == 0:
+            self._checkpoints.append(copy.deepcopy(self._head))
+        return event
+
+    def state_at(self, n):
+        """LedgerState after the first n events (0 is the start of the auction); a copy, safe to modify"""
+        if not 0 <= n <= len(self.events):
+            raise IndexError(f"Event {n} is outside the ledger (0-{len(self.events)})")
+        checkpoint = n // self.checkpoint_every
+        state = copy.deepcopy(self._checkpoints[checkpoint])
+        for event in self.events[checkpoint * self.checkpoint_every:n]:
+            apply_event(state, event)
+        return state
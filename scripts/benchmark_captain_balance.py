@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Benchmark the captain balancer on synthetic candidate pools
+Builds --runs random pools of captain candidates (mixed roles, 20-80
+BaseTokens), assigns them to --teams teams with captain_balancer and
+reports the time per run, the objective of the greedy start against the
+local-search result, and the worst leader-token range and role clashes.
+
+Usage:
+    python scripts/benchmark_captain_balance.py --teams 32 --candidates 100
+"""
+
+import argparse
+import random
+
+import pandas as pd
+
+from captain_balancer import TIME_LIMIT, balance_captains
+from player_schema import ROLE_ORDER
+
+
+def synthetic_candidates(count, seed):
+    rng = random.Random(seed)
+    return pd.DataFrame({
+        'Name': [f'Candidate {number}' for number in range(count)],
+        'Role': [rng.choice(ROLE_ORDER) for _ in range(count)],
+        'BaseTokens': [rng.randint(20, 80) for _ in range(count)],
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the captain/vice-captain balancer')
+    parser.add_argument('--teams', type=int, default=32, help='Number of teams')
+    parser.add_argument('--candidates', type=int, default=100, help='Captain candidates per pool')
+    parser.add_argument('--runs', type=int, default=20, help='Random pools to solve')
+    args = parser.parse_args()
+
+    results = [balance_captains(synthetic_candidates(args.candidates, seed), num_teams=args.teams)
+               for seed in range(args.runs)]
+    seconds = sorted(result.seconds for result in results)
+    start = sum(result.start_objective for result in results) / len(results)
+    final = sum(result.objective for result in results) / len(results)
+
+    print("=" * 70)
+    print(f"📊 CAPTAIN BALANCE BENCHMARK ({args.teams} teams, {args.candidates} candidates, {args.runs} runs)")
+    print("=" * 70)
+    print(f"   Time per run:  median {seconds[len(seconds) // 2] * 1000:.1f} ms, max {seconds[-1] * 1000:.1f} ms")
+    print(f"   Objective:     greedy {start:,.1f} -> local search {final:,.1f} (mean)")
+    print(f"   Worst token range: {max(result.token_range for result in results):g}   "
+          f"worst role clashes: {max(result.role_clashes for result in results)}")
+    print(f"   Converged under {TIME_LIMIT:g}s: {'✅' if seconds[-1] < TIME_LIMIT else '❌'}")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark the start-up cost of cplbidding.py
+Runs the app headless with streamlit's AppTest and times three cases:
+cold start (the first run in a fresh interpreter, so every import the
+script triggers is paid), a new session in an already warm process (what
+each further browser tab costs) and a rerun of an open session (what
+every click costs). Each case is repeated --runs times, the cold one in a
+new subprocess each time; the median is reported. Pass --app to time
+another version of the script (e.g. one checked out from git) the same way.
+AppTest polls the script thread, so tens of milliseconds of each warm
+timing are the harness itself.
+
+Usage:
+    python scripts/benchmark_cold_start.py --runs 5
+    git worktree add /tmp/cpl_old HEAD~1 && \\
+        python scripts/benchmark_cold_start.py --app /tmp/cpl_old/cplbidding.py
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+# Runs inside the child interpreter; streamlit itself is imported before the clock starts,
+# since a server process has always imported it before the first session arrives
+_CHILD = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+app = sys.argv[1]
+timings = {}
+start = time.perf_counter()
+at = AppTest.from_file(app, default_timeout=600).run()
+timings['cold'] = time.perf_counter() - start
+start = time.perf_counter()
+at.run()
+timings['rerun'] = time.perf_counter() - start
+start = time.perf_counter()
+AppTest.from_file(app, default_timeout=600).run()
+timings['new_session'] = time.perf_counter() - start
+timings['modules'] = sorted(name for name in ('pandas', 'PIL', 'numpy', 'openpyxl') if name in sys.modules)
+print(json.dumps(timings))
+"""
+
+
+def time_app(app, runs):
+    """[{'cold': s, 'rerun': s, 'new_session': s, 'modules': [...]}] from `runs` fresh interpreters"""
+    results = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, '-c', _CHILD, str(app)], cwd=BASE_DIR,
+                                capture_output=True, text=True, check=True).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark cold start and warm reruns of the auction app')
+    parser.add_argument('--app', default=str(BASE_DIR / 'cplbidding.py'), help='App script to time')
+    parser.add_argument('--runs', type=int, default=5, help='Fresh interpreters to time')
+    args = parser.parse_args()
+
+    results = time_app(Path(args.app).resolve(), args.runs)
+
+    print("=" * 70)
+    print(f"📊 COLD START BENCHMARK ({Path(args.app).name}, median of {args.runs} runs)")
+    print("=" * 70)
+    for case, label in [('cold', 'Cold start (first run):'), ('new_session', 'New session, warm process:'),
+                        ('rerun', 'Rerun of an open session:')]:
+        print(f"   {label:<28} {statistics.median(result[case] for result in results) * 1000:8.1f} ms")
+    print(f"   Heavy modules loaded by the landing page: {', '.join(results[0]['modules']) or 'none'}")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark object-string player frames against the compact schema
+Builds N synthetic players, compacts them with player_schema and reports
+deep memory usage and the time of the role filter, isin() and auction-order
+sort the app and scripts run, on both frames.
+
+Usage:
+    python scripts/benchmark_dtypes.py --rows 200000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from benchmark_copy_load import synthetic_players
+from player_schema import ROLE_ORDER, STATUS_ORDER, compact_players, memory_bytes
+
+ROLE_ORDER_MAP = {role: i for i, role in enumerate(ROLE_ORDER)}
+
+
+def best_of(fn, repeat=5):
+    """Fastest of `repeat` runs, in milliseconds"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark object vs categorical player frames')
+    parser.add_argument('--rows', type=int, default=200000, help='Number of synthetic players')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    players_df = synthetic_players(args.rows)
+    players_df['Status'] = rng.choice(STATUS_ORDER, args.rows)
+    players_df['SoldTo'] = rng.choice([f'Team {i}' for i in range(1, 33)], args.rows)
+    players_df['SoldPrice'] = rng.integers(35, 200, args.rows).astype(float)
+    compact_df = compact_players(players_df)
+
+    operations = {
+        "Role == 'Bowler'": lambda df: df[df['Role'] == 'Bowler'],
+        "Status.isin(['Sold', 'Unsold'])": lambda df: df[df['Status'].isin(['Sold', 'Unsold'])],
+        'groupby(SoldTo).SoldPrice.sum()': lambda df: df.groupby('SoldTo', observed=True)['SoldPrice'].sum(),
+    }
+
+    def sort_object(df):
+        return df.assign(role_order=df['Role'].map(ROLE_ORDER_MAP)).sort_values(
+            ['role_order', 'BaseTokens'], ascending=[True, False])
+
+    def sort_compact(df):
+        return df.sort_values(['Role', 'BaseTokens'], ascending=[True, False])
+
+    print("=" * 70)
+    print(f"📊 DTYPE BENCHMARK ({args.rows:,} players)")
+    print("=" * 70)
+    before, after = memory_bytes(players_df), memory_bytes(compact_df)
+    print(f"   Memory:  {before / 2**20:8.1f} MB -> {after / 2**20:8.1f} MB  ({before / after:.1f}x smaller)")
+    for name, operation in operations.items():
+        object_ms = best_of(lambda: operation(players_df))
+        compact_ms = best_of(lambda: operation(compact_df))
+        print(f"   {name:<34} {object_ms:7.1f} ms -> {compact_ms:7.1f} ms  ({object_ms / compact_ms:.1f}x)")
+    object_ms, compact_ms = best_of(lambda: sort_object(players_df)), best_of(lambda: sort_compact(compact_df))
+    print(f"   {'auction-order sort':<34} {object_ms:7.1f} ms -> {compact_ms:7.1f} ms  ({object_ms / compact_ms:.1f}x)")
+    same_order = sort_object(players_df)['PlayerID'].tolist() == sort_compact(compact_df)['PlayerID'].tolist()
+    print(f"   Same auction order: {'✅' if same_order else '❌'}")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Bulk sale import for lots run on paper
+Reads a CSV/XLSX of auction results (PlayerID, Team, Price; a blank Team or
+"Unsold" marks the lot unsold) and replays it, in file order, against copies
+of the app's teams with the same budget and role rules as "Confirm Sale".
+Every violation is collected, so the whole sheet can be fixed in one go;
+nothing is applied unless the batch is clean. A clean batch comes back as
+a BatchPlan holding the new teams, history rows and the combined Excel
+cell updates, which the app applies in one step.
+
+    plan = validate_batch(read_results('paper_lots.csv'), players_df, teams, unsold, sale_violation)
+"""
+
+import copy
+from collections import namedtuple
+from pathlib import Path
+
+import pandas as pd
+
+SaleRow = namedtuple('SaleRow', ['line', 'player_id', 'team', 'price'])
+
+Violation = namedtuple('Violation', ['line', 'player_id', 'message'])
+
+# teams: validated copy of the app's teams; sales: (player, team name, price, history row);
+# unsold: player dicts; updates: {PlayerID: {column: value}} for the Players sheet;
+# events: (player, team name or None if unsold, price) in file order
+BatchPlan = namedtuple('BatchPlan', ['teams', 'sales', 'unsold', 'updates', 'events', 'violations'])
+
+# Accepted header spellings (compared case-insensitively, spaces ignored)
+COLUMN_ALIASES = {
+    'playerid': 'PlayerID',
+    'team': 'Team',
+    'soldto': 'Team',
+    'price': 'Price',
+    'soldprice': 'Price',
+    'bidprice': 'Price',
+}
+
+UNSOLD_MARKERS = {'', 'unsold', '-'}
+
+
+def read_results(source, name=None):
+    """
+    SaleRows from a CSV or XLSX path or uploaded file (name picks the format
+    for file objects). line is the spreadsheet line, counting the header as 1.
+    """
+    name = name or getattr(source, 'name', None) or str(source)
+    if Path(name).suffix.lower() in ('.xlsx', '.xls'):
+        df = pd.read_excel(source, dtype=str)
+    else:
+        df = pd.read_csv(source, dtype=str)
+
+    df = df.rename(columns=lambda column: COLUMN_ALIASES.get(str(column).replace(' ', '').lower(), column))
+    missing = [column for column in ['PlayerID', 'Team'] if column not in df.columns]
+    if missing:
+        raise ValueError(f"Results file is missing column(s): {', '.join(missing)}")
+    if 'Price' not in df.columns:
+        df['Price'] = None
+
+    df = df[['PlayerID', 'Team', 'Price']].apply(lambda column: column.str.strip()).fillna('')
+    return [SaleRow(line + 2, player_id, team, price)
+            for line, (player_id, team, price) in enumerate(df.itertuples(index=False, name=None))
+            if player_id or team or price]
+
+
+def player_record(player_data):
+    """The fields the app keeps for a player in squads and the unsold list"""
+    return {
+        'PlayerID': player_data['PlayerID'],
+        'Name': player_data['Name'],
+        'Role': player_data['Role'],
+        'BaseTokens': player_data['BaseTokens'],
+        'PhotoFileName': player_data.get('PhotoFileName', None),
+    }
+
+
+def add_to_squad(team_name, team, player_data, bid_price):
+    """Add a player to a team dict (squad, tokens, role count, category budget); returns the history row"""
+    player_info = player_record(player_data)
+    player_info['BidPrice'] = bid_price
+    team['squad'].append(player_info)
+    team['tokens_left'] -= bid_price
+    team['role_count'][player_data['Role']] += 1
+
+    if 'category_budgets' in team:
+        team['category_budgets'][player_data['Role']]['spent'] += bid_price
+        team['category_budgets'][player_data['Role']]['remaining'] -= bid_price
+
+    return {
+        'Player': player_data['Name'],
+        'Role': player_data['Role'],
+        'BaseTokens': player_data['BaseTokens'],
+        'SoldPrice': bid_price,
+        'Team': team_name,
+        'TokensLeft': team['tokens_left'],
+        'SquadSize': len(team['squad']),
+    }
+
+
+def _parse_price(text):
+    try:
+        price = float(text)
+    except ValueError:
+        return None
+    return int(price) if price.is_integer() and price >= 0 else None
+
+
+def _batch_players(players_df, rows):
+    """{PlayerID as text: player dict} for the players named in the batch"""
+    ids = players_df['PlayerID'].astype(str)
+    batch = players_df[ids.isin({row.player_id for row in rows})]
+    players = {}
+    for record in batch.to_dict('records'):
+        record['BaseTokens'] = int(record['BaseTokens'])
+        players[str(record['PlayerID'])] = record
+    return players
+
+
+def validate_batch(rows, players_df, teams, unsold_players, check_sale):
+    """
+    Replay rows in order on a copy of teams. check_sale(team, role, price)
+    returns the app's message for a rule the sale breaks, or None. Rows that
+    fail are reported and skipped, so later rows are checked against the
+    state the clean rows leave behind. Returns a BatchPlan; apply it only
+    when plan.violations is empty.
+    """
+    teams = copy.deepcopy(teams)
+    team_names = {name.casefold(): name for name in teams}
+    players = _batch_players(players_df, rows)
+
+    # PlayerID -> team name for sold players, None for unsold ones
+    status = {str(player['PlayerID']): team_name for team_name, team in teams.items() for player in team['squad']}
+    status.update((str(player['PlayerID']), None) for player in unsold_players)
+
+    sales, unsold, updates, events, violations = [], [], {}, [], []
+    for row in rows:
+        def reject(message):
+            violations.append(Violation(row.line, row.player_id, message))
+
+        player = players.get(row.player_id)
+        if player is None:
+            reject(f"Unknown PlayerID '{row.player_id}'")
+            continue
+        if status.get(row.player_id) is not None:
+            reject(f"{player['Name']} is already sold to {status[row.player_id]}")
+            continue
+
+        if row.team.casefold() in UNSOLD_MARKERS:
+            # Unsold again in a re-auction round: one more event, but the player is listed once (as live)
+            if row.player_id not in status:
+                status[row.player_id] = None
+                unsold.append(player_record(player))
+                updates[player['PlayerID']] = {'Status': 'Unsold'}
+            events.append((player, None, None))
+            continue
+
+        team_name = team_names.get(row.team.casefold())
+        if team_name is None:
+            reject(f"Unknown team '{row.team}'")
+            continue
+        price = _parse_price(row.price)
+        if price is None:
+            reject(f"Price '{row.price}' is not a whole number of tokens")
+            continue
+        # Lots re-auctioned from the unsold list may go below base, as in the Unsold tab
+        if row.player_id not in status and price < player['BaseTokens']:
+            reject(f"Price {price} is below {player['Name']}'s base of {player['BaseTokens']}")
+            continue
+        error = check_sale(teams[team_name], player['Role'], price)
+        if error:
+            reject(f"{player['Name']} to {team_name} for {price}: {error}")
+            continue
+
+        history_row = add_to_squad(team_name, teams[team_name], player, price)
+        status[row.player_id] = team_name
+        unsold = [record for record in unsold if str(record['PlayerID']) != row.player_id]
+        sales.append((player, team_name, price, history_row))
+        updates[player['PlayerID']] = {'Status': 'Sold', 'SoldTo': team_name, 'SoldPrice': price}
+        events.append((player, team_name, price))
+
+    return BatchPlan(teams, sales, unsold, updates, events, violations)
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+In-place cell patcher for one sheet of an .xlsx workbook
+Updates individual cells of the rows found through a key -> row index
+(PlayerID by default) by rewriting just those <c> elements while the
+sheet XML is streamed through. Every other part of the workbook (other
+sheets, styles, shared strings) is copied through unchanged. New values
+are written as inline strings and numbers, so sharedStrings.xml is never
+rewritten.
+
+The index is cached per workbook and kept current across patches, so the
+app's per-sale write does not re-scan or re-parse anything.
+
+    patch_cells('assets/Cpl_data.xlsx', {'14HB': {'Status': 'Sold', 'SoldTo': 'Mavericks', 'SoldPrice': 60}})
+"""
+
+import math
+import re
+import zipfile
+from collections import namedtuple
+from pathlib import Path
+from xml.etree import ElementTree as ET
+from xml.sax.saxutils import escape, unescape
+
+from openpyxl.utils import column_index_from_string, get_column_letter
+
+from workbook_writer import SML_NS, row_chunks, sheet_parts
+
+PatchReport = namedtuple('PatchReport', ['cells', 'rows', 'missing'])
+
+SheetIndex = namedtuple('SheetIndex', ['part', 'header_row', 'columns', 'rows', 'max_column'])
+
+_ROW_RE = re.compile(rb'<row\b([^>]*?)(?:/>|>(.*?)</row>)', re.S)
+_ROW_NUMBER_RE = re.compile(rb'\br="(\d+)"')
+_CELL_RE = re.compile(rb'<c\b([^>]*?)(?:/>|>(.*?)</c>)', re.S)
+_CELL_REF_RE = re.compile(rb'\br="([A-Z]+)(\d+)"')
+_CELL_TYPE_RE = re.compile(rb'\bt="([^"]*)"')
+_CELL_STYLE_RE = re.compile(rb'\ss="\d+"')
+_SPANS_RE = re.compile(rb'\sspans="[^"]*"')
+_VALUE_RE = re.compile(rb'<v>(.*?)</v>', re.S)
+_TEXT_RE = re.compile(rb'<t(?:\s[^>]*)?>(.*?)</t>', re.S)
+_DIMENSION_RE = re.compile(rb'<dimension ref="([A-Z]+\d+):([A-Z]+)(\d+)"/>')
+
+# The patched sheet is re-deflated on every sale; fast compression keeps that cheap
+PATCHED_PART_COMPRESSLEVEL = 1
+
+# (path, sheet, key column) -> ((mtime_ns, size), SheetIndex)
+_INDEX_CACHE = {}
+
+
+def _stat_key(path):
+    st = Path(path).stat()
+    return st.st_mtime_ns, st.st_size
+
+
+def _shared_strings(archive):
+    if 'xl/sharedStrings.xml' not in archive.namelist():
+        return []
+    root = ET.fromstring(archive.read('xl/sharedStrings.xml'))
+    return [''.join(t.text or '' for t in si.iter(f'{{{SML_NS}}}t')) for si in root.iter(f'{{{SML_NS}}}si')]
+
+
+def _cell_text(attrs, body, shared_strings):
+    """Displayed value of a cell as a string (numbers without a trailing .0)"""
+    if body is None:
+        return None
+    cell_type = _CELL_TYPE_RE.search(attrs)
+    cell_type = cell_type.group(1) if cell_type else b'n'
+    if cell_type == b'inlineStr':
+        return unescape(b''.join(_TEXT_RE.findall(body)).decode('utf-8'))
+    value = _VALUE_RE.search(body)
+    if value is None:
+        return None
+    text = unescape(value.group(1).decode('utf-8'))
+    if cell_type == b's':
+        return shared_strings[int(text)]
+    if cell_type == b'n' and text.endswith('.0'):
+        return text[:-2]
+    return text
+
+
+def build_index(path, sheet_name='Players', key_column='PlayerID'):
+    """Scan the sheet once: header names -> column letters, key values -> row numbers"""
+    with zipfile.ZipFile(path) as archive:
+        part = sheet_parts(archive).get(sheet_name)
+        if part is None:
+            raise KeyError(f"Sheet '{sheet_name}' not found in {path}")
+        shared_strings = _shared_strings(archive)
+
+        header_row, columns, rows, max_column = None, {}, {}, 0
+        key_letter = None
+        with archive.open(part) as stream:
+            for chunk in row_chunks(stream):
+                for row in _ROW_RE.finditer(chunk):
+                    if row.group(2) is None:
+                        continue
+                    row_number = int(_ROW_NUMBER_RE.search(row.group(1)).group(1))
+                    for cell in _CELL_RE.finditer(row.group(2)):
+                        letter = _CELL_REF_RE.search(cell.group(1)).group(1).decode('ascii')
+                        if header_row is None or row_number == header_row:
+                            max_column = max(max_column, column_index_from_string(letter))
+                            text = _cell_text(cell.group(1), cell.group(2), shared_strings)
+                            if text is not None:
+                                columns.setdefault(text, letter)
+                        elif letter == key_letter:
+                            key = _cell_text(cell.group(1), cell.group(2), shared_strings)
+                            if key is not None:
+                                rows.setdefault(key, row_number)
+                            break
+                    if header_row is None:
+                        header_row = row_number
+                        if key_column not in columns:
+                            raise KeyError(f"Column '{key_column}' not found in sheet '{sheet_name}' of {path}")
+                        key_letter = columns[key_column]
+
+    if header_row is None:
+        raise ValueError(f"Sheet '{sheet_name}' of {path} is empty")
+    return SheetIndex(part, header_row, columns, rows, max_column)
+
+
+def get_index(path, sheet_name='Players', key_column='PlayerID'):
+    """Cached build_index, rebuilt only when the file changed since it was indexed"""
+    cache_key = (str(Path(path).resolve()), sheet_name, key_column)
+    stat_key = _stat_key(path)
+    cached = _INDEX_CACHE.get(cache_key)
+    if cached is not None and cached[0] == stat_key:
+        return cached[1]
+    index = build_index(path, sheet_name, key_column)
+    _INDEX_CACHE[cache_key] = (stat_key, index)
+    return index
+
+
+def _cell_xml(ref, value, style):
+    """A <c> element holding value; strings are inline so shared strings stay untouched"""
+    if type(value).__module__ == 'numpy':
+        value = value.item()
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return b'<c r="%s"%s/>' % (ref, style)
+    if isinstance(value, bool):
+        return b'<c r="%s"%s t="b"><v>%d</v></c>' % (ref, style, value)
+    if isinstance(value, (int, float)):
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)
+        return b'<c r="%s"%s><v>%s</v></c>' % (ref, style, str(value).encode('ascii'))
+    text = escape(str(value)).encode('utf-8')
+    return b'<c r="%s"%s t="inlineStr"><is><t xml:space="preserve">%s</t></is></c>' % (ref, style, text)
+
+
+def _patch_row(attrs, body, row_number, values):
+    """Replace or insert the cells in values ({column letter: value}) of one row"""
+    cells = {}
+    for cell in _CELL_RE.finditer(body or b''):
+        letter = _CELL_REF_RE.search(cell.group(1)).group(1).decode('ascii')
+        cells[column_index_from_string(letter)] = (cell.group(1), cell.group(0))
+
+    for letter, value in values.items():
+        column = column_index_from_string(letter)
+        ref = f"{letter}{row_number}".encode('ascii')
+        style = b''
+        if column in cells:
+            existing_style = _CELL_STYLE_RE.search(cells[column][0])
+            style = existing_style.group(0) if existing_style else b''
+        cells[column] = (None, _cell_xml(ref, value, style))
+
+    # spans is only a hint and may no longer cover the row's cells
+    attrs = _SPANS_RE.sub(b'', attrs)
+    return b'<row%s>%s</row>' % (attrs, b''.join(cells[column][1] for column in sorted(cells)))
+
+
+def patch_cells(path, updates, sheet_name='Players', key_column='PlayerID'):
+    """
+    Set cells of the rows whose key_column matches.
+    updates maps key -> {column name: value}; columns missing from the sheet
+    are added after the last one. Keys not in the sheet are skipped and
+    reported. Returns a PatchReport(cells, rows, missing).
+    """
+    path = Path(path)
+    index = get_index(path, sheet_name, key_column)
+
+    columns = dict(index.columns)
+    max_column = index.max_column
+    targets = {}
+    missing = []
+    for key, values in updates.items():
+        row_number = index.rows.get(str(key))
+        if row_number is None:
+            missing.append(key)
+            continue
+        for column_name, value in values.items():
+            if column_name not in columns:
+                max_column += 1
+                columns[column_name] = get_column_letter(max_column)
+                targets.setdefault(index.header_row, {})[columns[column_name]] = column_name
+            targets.setdefault(row_number, {})[columns[column_name]] = value
+
+    patched_cells = sum(len(values) for row, values in targets.items() if row != index.header_row)
+    if not targets:
+        return PatchReport(0, 0, missing)
+
+    # Matches only the targeted rows, so untouched rows never reach Python
+    target_rows = re.compile(rb'<row\b([^>]*?\sr="(?:%s)"[^>]*?)(?:/>|>(.*?)</row>)'
+                             % b'|'.join(str(row).encode('ascii') for row in targets), re.S)
+
+    def patch(match):
+        attrs = match.group(1)
+        row_number = int(_ROW_NUMBER_RE.search(attrs).group(1))
+        return _patch_row(attrs, match.group(2), row_number, targets[row_number])
+
+    def widen(match):
+        return b'<dimension ref="%s:%s%s"/>' % (match.group(1), get_column_letter(max_column).encode('ascii'),
+                                                 match.group(3))
+
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    try:
+        with zipfile.ZipFile(path) as source, zipfile.ZipFile(
+                tmp_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=PATCHED_PART_COMPRESSLEVEL) as out:
+            for info in source.infolist():
+                if info.filename != index.part:
+                    out.writestr(info, source.read(info.filename))
+                    continue
+                with source.open(info) as stream, out.open(info.filename, 'w') as dest:
+                    for chunk in row_chunks(stream):
+                        if max_column > index.max_column:
+                            chunk = _DIMENSION_RE.sub(widen, chunk, count=1)
+                        dest.write(target_rows.sub(patch, chunk))
+        tmp_path.replace(path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+    # The rows did not move, so the index stays valid for the rewritten file
+    new_index = index._replace(columns=columns, max_column=max_column)
+    _INDEX_CACHE[(str(path.resolve()), sheet_name, key_column)] = (_stat_key(path), new_index)
+    return PatchReport(patched_cells, len([row for row in targets if row != index.header_row]), missing)
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description='Set one cell of a player row in place')
+    parser.add_argument('player_id')
+    parser.add_argument('column')
+    parser.add_argument('value')
+    parser.add_argument('--workbook', default='assets/Cpl_data.xlsx')
+    parser.add_argument('--sheet', default='Players')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    report = patch_cells(args.workbook, {args.player_id: {args.column: args.value}}, args.sheet)
+    elapsed = time.perf_counter() - start
+    if report.missing:
+        print(f"❌ {args.player_id} not found in sheet '{args.sheet}' of {args.workbook}")
+    else:
+        print(f"✅ Patched {report.cells} cell(s) in {elapsed * 1000:.1f} ms")
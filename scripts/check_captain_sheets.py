@@ -3,17 +3,17 @@
 Check what sheets are in the captain assignments file
 """
 
-import pandas as pd
 from pathlib import Path
 
+import workbook_cache
+
 captain_file = Path('data/captain_team_assignments.xlsx')
-xl = pd.ExcelFile(captain_file)
 
 print("\nSheets in captain_team_assignments.xlsx:")
 print("=" * 70)
-for sheet_name in xl.sheet_names:
+for sheet_name in workbook_cache.sheet_names(captain_file):
     print(f"\n  Sheet: {sheet_name}")
-    df = pd.read_excel(captain_file, sheet_name=sheet_name)
+    df = workbook_cache.read_excel(captain_file, sheet_name=sheet_name)
     print(f"  Columns: {list(df.columns)}")
     print(f"  Rows: {len(df)}")
     print("\n  Sample data:")
@@ -9,6 +9,12 @@ import numpy as np
 from pathlib import Path
 import re
 
+import workbook_cache
+from sql_emitter import frame_rows, write_insert
+from player_schema import ROLE_ORDER
+from registration_dedup import find_duplicates, print_duplicate_report
+from workbook_writer import WorkbookWriter
+
 def clean_cpl_players_data():
     """Clean and standardize the CPL players data"""
     
@@ -23,7 +29,7 @@ def clean_cpl_players_data():
     
     try:
         # Read the Players sheet
-        df = pd.read_excel(excel_path, sheet_name='Players')
+        df = workbook_cache.read_excel(excel_path, sheet_name='Players')
         print(f"📊 Loaded {len(df)} players from Excel")
         
         # Create a backup
@@ -57,7 +63,7 @@ def clean_cpl_players_data():
         df['Role'] = df['Role'].map(role_mapping).fillna(df['Role'])
         
         # Check for any unmapped roles
-        valid_roles = ['Batsman', 'Bowler', 'All-rounder', 'WicketKeeper']
+        valid_roles = ROLE_ORDER
         invalid_roles = df[~df['Role'].isin(valid_roles)]['Role'].unique()
         if len(invalid_roles) > 0:
             print(f"⚠️  Warning: Found invalid roles: {invalid_roles}")
@@ -92,8 +98,14 @@ def clean_cpl_players_data():
         duplicates = df[df['PlayerID'].duplicated()]['PlayerID'].unique()
         if len(duplicates) > 0:
             print(f"⚠️  Warning: Found duplicate PlayerIDs: {duplicates}")
-            # Make unique by adding suffix
-            df['PlayerID'] = df.groupby('PlayerID').cumcount().astype(str).replace('0', '') + df['PlayerID']
+            # Make unique by adding a suffix to the second and later rows (P001, P001_2, ...)
+            repeat = df.groupby('PlayerID').cumcount()
+            df['PlayerID'] = df['PlayerID'].astype(str) + ('_' + (repeat + 1).astype(str)).where(repeat > 0, '')
+        
+        # The same player entered twice under different IDs (typo'd names) is only reported
+        name_duplicates = find_duplicates(df[['PlayerID', 'Name']].assign(Row=np.arange(len(df)) + 2))
+        if not name_duplicates.clusters.empty:
+            print_duplicate_report(name_duplicates, columns=['Row', 'PlayerID', 'Name'])
         
         # Ensure PlayerID is string and clean
         df['PlayerID'] = df['PlayerID'].astype(str).str.strip().str.upper()
@@ -213,7 +225,7 @@ def clean_cpl_players_data():
         df = df[final_columns]
         
         # Sort by Role (auction order) then by BaseTokens (descending)
-        role_order = ['Batsman', 'Bowler', 'All-rounder', 'WicketKeeper']
+        role_order = ROLE_ORDER
         df['RoleOrder'] = df['Role'].map({role: i for i, role in enumerate(role_order)})
         df = df.sort_values(['RoleOrder', 'BaseTokens'], ascending=[True, False])
         df = df.drop('RoleOrder', axis=1)
@@ -252,13 +264,12 @@ def clean_cpl_players_data():
         
         # Save cleaned data to new file (avoid permission issues)
         cleaned_path = Path('assets/Cpl_data_cleaned.xlsx')
-        with pd.ExcelWriter(cleaned_path, engine='openpyxl') as writer:
-            # Read teams data to preserve it
-            teams_df = pd.read_excel(excel_path, sheet_name='Teams')
-            teams_df.to_excel(writer, sheet_name='Teams', index=False)
+        with WorkbookWriter(cleaned_path) as writer:
+            # Teams is carried over unchanged, without reading it back in
+            writer.copy_sheet(excel_path, 'Teams')
             
             # Write cleaned players data
-            df.to_excel(writer, sheet_name='Players', index=False)
+            writer.write_frame('Players', df, validations={'Role': ROLE_ORDER})
         
         print(f"✅ Cleaned data saved to {cleaned_path}")
         
@@ -274,16 +285,13 @@ def clean_cpl_players_data():
             f.write("-- DELETE FROM players;\n\n")
             
             f.write("-- Insert cleaned player data\n")
-            f.write("INSERT INTO players (player_id, name, role, base_tokens, photo_filename, department, status) VALUES\n")
-            
-            values = []
-            for _, row in df.iterrows():
-                # Escape single quotes in names
-                clean_name = row['Name'].replace("'", "''")
-                values.append(f"('{row['PlayerID']}', '{clean_name}', '{row['Role']}', {row['BaseTokens']}, '{row['PhotoFileName']}', '{row['Department']}', 'Available')")
-            
-            f.write(',\n'.join(values))
-            f.write(';\n\n')
+            write_insert(
+                f, 'players',
+                ['player_id', 'name', 'role', 'base_tokens', 'photo_filename', 'department', 'status'],
+                frame_rows(df.assign(Status='Available'),
+                           ['PlayerID', 'Name', 'Role', 'BaseTokens', 'PhotoFileName', 'Department', 'Status'])
+            )
+            f.write('\n')
             
             f.write("-- Verify insertion\n")
             f.write("SELECT role, COUNT(*) as player_count FROM players GROUP BY role ORDER BY role;\n")
@@ -7,6 +7,10 @@ Allows manual control over player roles and base tokens before SQL generation
 import pandas as pd
 from pathlib import Path
 
+import workbook_cache
+from player_schema import ROLE_ORDER, compact_players
+from workbook_writer import WorkbookWriter
+
 def create_editable_players_excel():
     """Create editable Excel template for players"""
     
@@ -14,7 +18,7 @@ def create_editable_players_excel():
     print("=" * 70)
     
     # Read the complete data with all details
-    complete_df = pd.read_excel('assets/CPL_Auction_Data_2025.xlsx', sheet_name='Complete_Data')
+    complete_df = workbook_cache.read_excel('assets/CPL_Auction_Data_2025.xlsx', sheet_name='Complete_Data')
     
     # Filter only auction players (not captains)
     players_df = complete_df[complete_df.get('IsCaptain', False) != True].copy()
@@ -46,11 +50,9 @@ def create_editable_players_excel():
         'Notes': ''
     })
     
-    # Sort by role for easier editing
-    role_order = {'Batsman': 1, 'Bowler': 2, 'All-rounder': 3, 'WicketKeeper': 4}
-    editable_df['_sort'] = editable_df['Role'].map(role_order)
-    editable_df = editable_df.sort_values('_sort').drop('_sort', axis=1)
-    editable_df = editable_df.reset_index(drop=True)
+    # Sort by role for easier editing (Role is an ordered categorical in ROLE_ORDER)
+    editable_df = compact_players(editable_df)
+    editable_df = editable_df.sort_values('Role', kind='stable').reset_index(drop=True)
     
     # Create instructions sheet
     instructions = pd.DataFrame({
@@ -156,15 +158,16 @@ def create_editable_players_excel():
     # Save to Excel
     output_file = Path('CPL_Players_Editable.xlsx')
     
-    with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
-        # Main editable sheet
-        editable_df.to_excel(writer, sheet_name='Players', index=False)
+    with WorkbookWriter(output_file) as writer:
+        # Main editable sheet: Role is a dropdown, BaseTokens a whole number
+        writer.write_frame('Players', editable_df, column_formats={'BaseTokens': '0'},
+                           validations={'Role': ROLE_ORDER}, column_widths={'Name': 30, 'Notes': 40})
         
         # Reference sheets
-        instructions.to_excel(writer, sheet_name='Instructions', index=False)
-        validation.to_excel(writer, sheet_name='Validation', index=False)
-        token_guidelines.to_excel(writer, sheet_name='Token_Guidelines', index=False)
-        role_summary.to_excel(writer, sheet_name='Summary', index=False)
+        writer.write_frame('Instructions', instructions)
+        writer.write_frame('Validation', validation)
+        writer.write_frame('Token_Guidelines', token_guidelines)
+        writer.write_frame('Summary', role_summary, column_formats={'CurrentAvgTokens': '0.0'})
     
     print(f"✅ Created: {output_file}")
     print()
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Optional database sink for sales made in cplbidding.py
+Sale events are queued and written by a background worker through a small
+psycopg2 connection pool, many events per transaction: players are marked
+Sold, teams.tokens_left is decremented and an auction_history row is added.
+Every event carries an event_id that is unique in auction_history, so a
+batch retried after a dropped connection never applies a sale twice. While
+the database is unreachable the batch stays pending and is resent with
+capped backoff until it lands; only events the database rejects fail.
+
+Requires sql/auction_history_event_id.sql to have been run once.
+"""
+
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict, namedtuple
+
+APPLICATION_NAME = 'cplbidding-db-sink'
+
+SaleEvent = namedtuple('SaleEvent', [
+    'event_id', 'player_id', 'player_name', 'role', 'base_tokens', 'sold_price',
+    'team_id', 'team_name', 'tokens_left_after', 'squad_size_after', 'created_at',
+])
+
+# One statement per batch: history rows whose event_id already exists are
+# skipped by ON CONFLICT, and only the rows actually inserted drive the
+# players/teams updates.
+APPLY_SALES_SQL = """
+WITH batch (event_id, player_id, player_name, role, base_tokens, sold_price,
+            team_id, team_name, tokens_left_after, squad_size_after) AS (
+    SELECT * FROM unnest(%s::text[], %s::text[], %s::text[], %s::text[], %s::int[], %s::int[],
+                         %s::text[], %s::text[], %s::int[], %s::int[])
+),
+inserted AS (
+    INSERT INTO auction_history (event_id, player_id, player_name, role, base_tokens, sold_price,
+                                 team_id, team_name, tokens_left_after, squad_size_after)
+    SELECT * FROM batch
+    ON CONFLICT (event_id) DO NOTHING
+    RETURNING event_id, player_id, team_name, sold_price
+),
+sold AS (
+    UPDATE players AS p SET status = 'Sold', sold_to = i.team_name, sold_price = i.sold_price
+    FROM inserted AS i
+    WHERE p.player_id = i.player_id
+    RETURNING p.player_id
+),
+spent AS (
+    UPDATE teams AS t SET tokens_left = t.tokens_left - s.total
+    FROM (SELECT team_name, SUM(sold_price) AS total FROM inserted GROUP BY team_name) AS s
+    WHERE t.team_name = s.team_name
+    RETURNING t.team_name
+)
+SELECT event_id FROM inserted
+"""
+
+
+def apply_sales(conn, events):
+    """
+    Apply a batch of SaleEvents in one transaction.
+    Returns the set of event IDs that were new (the rest were already applied).
+    """
+    columns = list(zip(*[event[:10] for event in events]))
+    try:
+        with conn.cursor() as cur:
+            cur.execute(APPLY_SALES_SQL, [list(column) for column in columns])
+            applied = {row[0] for row in cur.fetchall()}
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return applied
+
+
+class DatabaseSink:
+    """Background writer for sale events with batching, retries and lag metrics"""
+
+    def __init__(self, dsn, pool_size=2, batch_size=50, flush_interval=0.25, max_backoff=5.0):
+        import psycopg2
+        from psycopg2 import pool
+
+        self._connection_errors = (psycopg2.OperationalError, psycopg2.InterfaceError)
+        self.pool = pool.ThreadedConnectionPool(1, pool_size, dsn, application_name=APPLICATION_NAME)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_backoff = max_backoff
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._unsynced = OrderedDict()
+        self._stats = {'synced': 0, 'duplicates': 0, 'failed': 0, 'retries': 0,
+                       'last_batch_lag_seconds': 0.0, 'last_error': None}
+        self._closed = threading.Event()
+        self._worker = threading.Thread(target=self._run, name='db-sink', daemon=True)
+        self._worker.start()
+
+    def record_sale(self, player_id, player_name, role, base_tokens, sold_price, team_name,
+                    team_id=None, tokens_left_after=None, squad_size_after=None, event_id=None):
+        """Queue a sale; returns its event_id (pass the same one to resend it)"""
+        event = SaleEvent(
+            event_id or uuid.uuid4().hex, str(player_id), str(player_name), str(role),
+            int(base_tokens), int(sold_price), None if team_id is None else str(team_id), str(team_name),
+            None if tokens_left_after is None else int(tokens_left_after),
+            None if squad_size_after is None else int(squad_size_after),
+            time.time(),
+        )
+        with self._lock:
+            self._unsynced.setdefault(event.event_id, event.created_at)
+        self._queue.put(event)
+        return event.event_id
+
+    def metrics(self):
+        """Pending count, sync lag (age of the oldest unsynced sale) and counters"""
+        with self._lock:
+            oldest = next(iter(self._unsynced.values()), None)
+            return {
+                'pending': len(self._unsynced),
+                'lag_seconds': 0.0 if oldest is None else time.time() - oldest,
+                **self._stats,
+            }
+
+    def flush(self, timeout=10.0):
+        """Wait until every queued sale is written or failed; True if drained"""
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            with self._lock:
+                if not self._unsynced:
+                    return True
+            time.sleep(0.01)
+        return False
+
+    def close(self, timeout=10.0):
+        """Flush, stop the worker and close the pool; sales still unsynced stay in metrics()['pending']"""
+        self.flush(timeout)
+        self._closed.set()
+        self._worker.join(timeout)
+        self.pool.closeall()
+
+    def _next_batch(self):
+        try:
+            batch = [self._queue.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while not self._closed.is_set() or not self._queue.empty():
+            batch = self._next_batch()
+            if batch:
+                self._write(batch)
+
+    def _write(self, batch):
+        attempt = 0
+        while True:
+            conn = None
+            try:
+                conn = self.pool.getconn()
+                applied = apply_sales(conn, batch)
+            except self._connection_errors as e:
+                # The connection is gone; discard it and resend the same event IDs until the database
+                # is back. The events stay pending, so metrics() shows the outage as a growing lag.
+                if conn is not None:
+                    self.pool.putconn(conn, close=True)
+                with self._lock:
+                    self._stats['retries'] += 1
+                    self._stats['last_error'] = str(e)
+                if self._closed.wait(min(0.1 * 2 ** min(attempt, 10), self.max_backoff)):
+                    return  # Closed while offline: the sales stay pending
+                attempt += 1
+                continue
+            except Exception as e:
+                if conn is not None:
+                    self.pool.putconn(conn)
+                if len(batch) > 1:
+                    # Isolate the bad event so the rest of the batch still lands
+                    for event in batch:
+                        self._write([event])
+                else:
+                    self._finish(batch, set(), failed=True, error=str(e))
+                return
+            self.pool.putconn(conn)
+            self._finish(batch, applied)
+            return
+
+    def _finish(self, batch, applied, failed=False, error=None):
+        now = time.time()
+        with self._lock:
+            for event in batch:
+                self._unsynced.pop(event.event_id, None)
+            if failed:
+                self._stats['failed'] += len(batch)
+                self._stats['last_error'] = error
+            else:
+                self._stats['synced'] += len(applied)
+                self._stats['duplicates'] += len(batch) - len(applied)
+                self._stats['last_batch_lag_seconds'] = now - min(event.created_at for event in batch)
@@ -7,6 +7,11 @@ Reads CPL_Players_Editable.xlsx and creates Supabase-ready SQL
 import pandas as pd
 from pathlib import Path
 
+import workbook_cache
+from player_schema import ROLE_ORDER, compact_players
+from sheet_validator import print_validation_report, validate_sheets
+from sql_emitter import frame_rows, write_insert
+
 def generate_sql_from_excel():
     """Generate SQL INSERT statements from edited Excel"""
     
@@ -22,37 +27,23 @@ def generate_sql_from_excel():
     
     try:
         # Read the edited players data
-        players_df = pd.read_excel(input_file, sheet_name='Players')
+        players_df = workbook_cache.read_excel(input_file, sheet_name='Players')
         
         print(f"📊 Loaded {len(players_df)} players from Excel")
         print()
         
-        # Validate data
-        print("🔍 Validating data...")
-        
-        valid_roles = ['Batsman', 'Bowler', 'All-rounder', 'WicketKeeper']
-        invalid_roles = players_df[~players_df['Role'].isin(valid_roles)]
-        
-        if len(invalid_roles) > 0:
-            print("❌ ERROR: Invalid roles found!")
-            print(invalid_roles[['Name', 'Role']])
-            print()
-            print("Valid roles are: Batsman, Bowler, All-rounder, WicketKeeper")
+        # Validate data (same rules as the auction app; row numbers are the Excel rows)
+        report = validate_sheets(players_df)
+        print_validation_report(report)
+        if not report.ok:
             return False
-        
-        # Check for missing required fields
-        required_fields = ['PlayerID', 'Name', 'Role', 'BaseTokens']
-        for field in required_fields:
-            if players_df[field].isnull().any():
-                print(f"❌ ERROR: Missing values in {field} column!")
-                return False
-        
-        print("✅ All validations passed")
         print()
         
-        # Calculate auction order based on role
-        role_order_map = {'Batsman': 1, 'Bowler': 2, 'All-rounder': 3, 'WicketKeeper': 4}
-        players_df['auction_order'] = players_df['Role'].map(role_order_map) * 1000 + players_df.index
+        players_df = compact_players(players_df)
+        valid_roles = ROLE_ORDER
+        
+        # Calculate auction order based on role (category codes follow ROLE_ORDER)
+        players_df['auction_order'] = (players_df['Role'].cat.codes.astype(int) + 1) * 1000 + players_df.index
         
         # Sort by auction order
         players_df = players_df.sort_values('auction_order')
@@ -94,26 +85,14 @@ def generate_sql_from_excel():
             f.write("-- STEP 2: Insert players\n")
             f.write("-- =====================================================\n\n")
             
-            f.write("INSERT INTO players (\n")
-            f.write("  player_id, name, role, department, base_tokens,\n")
-            f.write("  photo_filename, status, auction_order\n")
-            f.write(") VALUES\n")
-            
-            values = []
-            for _, row in players_df.iterrows():
-                # Escape single quotes in names
-                clean_name = str(row['Name']).replace("'", "''")
-                clean_dept = str(row['Department']).replace("'", "''")
-                
-                value = (
-                    f"('{row['PlayerID']}', '{clean_name}', '{row['Role']}', "
-                    f"'{clean_dept}', {int(row['BaseTokens'])}, "
-                    f"'{row['PhotoFileName']}', '{row['Status']}', {int(row['auction_order'])})"
-                )
-                values.append(value)
-            
-            f.write(',\n'.join(values))
-            f.write(';\n\n')
+            insert_df = players_df.astype({'Name': str, 'Department': str, 'BaseTokens': int, 'auction_order': int})
+            write_insert(
+                f, 'players',
+                ['player_id', 'name', 'role', 'department', 'base_tokens', 'photo_filename', 'status', 'auction_order'],
+                frame_rows(insert_df, ['PlayerID', 'Name', 'Role', 'Department', 'BaseTokens',
+                                       'PhotoFileName', 'Status', 'auction_order'])
+            )
+            f.write('\n')
             
             f.write("-- =====================================================\n")
             f.write("-- STEP 3: Verify insertion\n")
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Web-optimized derivatives for player photos and team logos
+For every public/players/*.jpg and public/*.png logo, writes a size-capped
+progressive JPEG (PNG for logos with transparency), a WebP, an AVIF when
+Pillow has an AVIF plugin, and a tiny blurred placeholder, using a process
+pool. Sources whose content hash is unchanged since the last run are
+skipped. public/derived/manifest.json maps PlayerID (and logo name) to the
+derivative paths and byte sizes.
+"""
+
+import base64
+import io
+import json
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from PIL import Image, ImageFilter, ImageOps
+
+from photo_sync import file_hash
+
+PUBLIC_DIR = Path('public')
+DERIVED_DIR_NAME = 'derived'
+MANIFEST_NAME = 'manifest.json'
+
+# Bump when the encoding settings change so cached derivatives are rebuilt
+PIPELINE_VERSION = 1
+
+MAX_SIZE = {'players': 480, 'logos': 320}
+JPEG_QUALITY = 80
+WEBP_QUALITY = 78
+AVIF_QUALITY = 60
+PLACEHOLDER_SIZE = 16
+
+DERIVATIVE_FORMATS = ('png', 'jpeg', 'webp', 'avif')
+
+# public/*.png files that are browser icons rather than logos
+ICON_PREFIXES = ('favicon', 'android-chrome', 'apple-touch-icon')
+
+try:
+    import pillow_avif  # noqa: F401  (registers the AVIF codec with Pillow)
+except ImportError:
+    pass
+AVIF_AVAILABLE = 'AVIF' in Image.SAVE
+
+
+def _encode(img, fmt, **options):
+    buffer = io.BytesIO()
+    img.save(buffer, fmt, **options)
+    return buffer.getvalue()
+
+
+def _placeholder(img):
+    """Tiny blurred WebP as a data: URI, shown while the real image loads"""
+    tiny = img.copy()
+    tiny.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE))
+    tiny = tiny.filter(ImageFilter.GaussianBlur(1))
+    data = _encode(tiny, 'WEBP', quality=40)
+    return 'data:image/webp;base64,' + base64.b64encode(data).decode('ascii')
+
+
+def render_derivatives(job):
+    """
+    Build every derivative for one source image (runs in a worker process).
+    job is (source path, output directory, output stem, max size);
+    returns the manifest entry without the source fields.
+    """
+    source, out_dir, stem, max_size = job
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    with Image.open(source) as opened:
+        img = ImageOps.exif_transpose(opened)
+        img.load()
+    has_alpha = img.mode in ('RGBA', 'LA') or (img.mode == 'P' and 'transparency' in img.info)
+    img = img.convert('RGBA' if has_alpha else 'RGB')
+    img.thumbnail((max_size, max_size), Image.LANCZOS)
+
+    outputs = {}
+    if has_alpha:
+        outputs['png'] = _encode(img, 'PNG', optimize=True)
+    else:
+        outputs['jpeg'] = _encode(img, 'JPEG', quality=JPEG_QUALITY, progressive=True, optimize=True)
+    outputs['webp'] = _encode(img, 'WEBP', quality=WEBP_QUALITY, method=4)
+    if AVIF_AVAILABLE:
+        outputs['avif'] = _encode(img, 'AVIF', quality=AVIF_QUALITY)
+
+    extensions = {'png': 'png', 'jpeg': 'jpg', 'webp': 'webp', 'avif': 'avif'}
+    entry = {'width': img.width, 'height': img.height}
+    for fmt, data in outputs.items():
+        path = out_dir / f"{stem}.{extensions[fmt]}"
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        tmp_path.write_bytes(data)
+        tmp_path.replace(path)
+        entry[fmt] = {'path': path, 'bytes': len(data)}
+    entry['placeholder'] = _placeholder(img)
+    return entry
+
+
+def collect_sources(public_dir=PUBLIC_DIR):
+    """{group: {key: source path}} for player photos (keyed by PlayerID) and logos"""
+    public_dir = Path(public_dir)
+    players = {path.stem: path for path in sorted((public_dir / 'players').glob('*.jpg'))}
+    logos = {path.stem: path for path in sorted(public_dir.glob('*.png'))
+             if not path.name.lower().startswith(ICON_PREFIXES)}
+    return {'players': players, 'logos': logos}
+
+
+def load_manifest(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return manifest if manifest.get('version') == PIPELINE_VERSION else {}
+
+
+def _outputs_exist(entry, public_dir):
+    return all((public_dir / entry[fmt]['path']).exists() for fmt in DERIVATIVE_FORMATS if fmt in entry)
+
+
+def build_derivatives(public_dir=PUBLIC_DIR, workers=None):
+    """
+    Build missing/stale derivatives, drop those whose source is gone and
+    rewrite the manifest. Returns (manifest, built count, cached count).
+    """
+    public_dir = Path(public_dir)
+    derived_dir = public_dir / DERIVED_DIR_NAME
+    manifest_path = derived_dir / MANIFEST_NAME
+    old_manifest = load_manifest(manifest_path)
+
+    manifest = {'version': PIPELINE_VERSION, 'players': {}, 'logos': {}}
+    jobs, pending = [], []
+    cached_count = 0
+    for group, sources in collect_sources(public_dir).items():
+        for key, source in sources.items():
+            source_hash = file_hash(source)
+            cached = old_manifest.get(group, {}).get(key)
+            if cached and cached['source_hash'] == source_hash and _outputs_exist(cached, public_dir):
+                manifest[group][key] = cached
+                cached_count += 1
+                continue
+            jobs.append((source, derived_dir / group, key, MAX_SIZE[group]))
+            pending.append((group, key, source, source_hash))
+
+    if jobs:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(render_derivatives, jobs))
+        for (group, key, source, source_hash), entry in zip(pending, results):
+            for fmt in DERIVATIVE_FORMATS:
+                if fmt in entry:
+                    entry[fmt]['path'] = entry[fmt]['path'].relative_to(public_dir).as_posix()
+            manifest[group][key] = {
+                'source': source.relative_to(public_dir).as_posix(),
+                'source_hash': source_hash,
+                'source_bytes': source.stat().st_size,
+                **entry,
+            }
+
+    for group in ('players', 'logos'):
+        for key, entry in old_manifest.get(group, {}).items():
+            if key not in manifest[group]:
+                for fmt in DERIVATIVE_FORMATS:
+                    if fmt in entry:
+                        (public_dir / entry[fmt]['path']).unlink(missing_ok=True)
+
+    derived_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = manifest_path.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    tmp_path.replace(manifest_path)
+
+    return manifest, len(jobs), cached_count
+
+
+def summarize(manifest):
+    """(source bytes, smallest-derivative bytes) over all manifest entries"""
+    source_bytes = derived_bytes = 0
+    for group in ('players', 'logos'):
+        for entry in manifest.get(group, {}).values():
+            source_bytes += entry['source_bytes']
+            derived_bytes += min(entry[fmt]['bytes'] for fmt in DERIVATIVE_FORMATS if fmt in entry)
+    return source_bytes, derived_bytes
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from photo_sync import format_bytes
+
+    parser = argparse.ArgumentParser(description='Build web-optimized image derivatives under public/derived')
+    parser.add_argument('--public-dir', default=PUBLIC_DIR)
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    args = parser.parse_args()
+
+    manifest, built, cached = build_derivatives(args.public_dir, args.workers)
+    source_bytes, derived_bytes = summarize(manifest)
+    print(f"🖼️  {built} image(s) processed, {cached} cached"
+          f"{'' if AVIF_AVAILABLE else ' (AVIF skipped: install pillow-avif-plugin)'}")
+    print(f"📉 {format_bytes(source_bytes)} of originals -> {format_bytes(derived_bytes)} smallest derivatives")
@@ -3,11 +3,12 @@
 List all player names from the Excel file
 """
 
-import pandas as pd
 from pathlib import Path
 
+import workbook_cache
+
 players_file = Path('data/CPL_Players_Editable.xlsx')
-players_df = pd.read_excel(players_file, sheet_name='Players')
+players_df = workbook_cache.read_excel(players_file, sheet_name='Players')
 
 print(f"\nTotal Players: {len(players_df)}\n")
 print("PlayerID | Name")
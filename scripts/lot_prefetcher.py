@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Background work for the next lots of the auction
+The app walks players_df in order, so while one lot is being bid it
+schedules the work the next ones will need (photo decode, phase info,
+per-team eligibility) on a worker thread. Each job has a key that names
+everything its result depends on (lot order, team squad size, ...); a
+new schedule() cancels queued jobs whose keys are no longer wanted, so
+a reorder, a skip or a sale never leaves the worker busy with stale lots.
+result() returns the prefetched value, or computes it in the foreground
+when it was never scheduled, was cancelled or failed.
+
+    prefetcher = LotPrefetcher()
+    prefetcher.schedule({('phase', order, 12): partial(get_phase, players_df, 12), ...})
+    phase = prefetcher.result(('phase', order, 12), partial(get_phase, players_df, 12))
+"""
+
+import threading
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+
+import pandas as pd
+
+PREFETCH_LOTS = 5
+
+
+def lot_order_key(players_df):
+    """Fingerprint of the auction order (PlayerIDs in row order); changes when the lots are reordered"""
+    row_hashes = pd.util.hash_pandas_object(players_df['PlayerID'].astype(str), index=False)
+    return hash(row_hashes.to_numpy().tobytes())
+
+
+class LotPrefetcher:
+    """Keyed jobs on a worker thread; schedule() replaces the wanted set and cancels the rest"""
+
+    def __init__(self, workers=1):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='lot-prefetch')
+        self._futures = {}
+        self._lock = threading.Lock()
+        self.cancelled = 0
+
+    def __len__(self):
+        return len(self._futures)
+
+    def schedule(self, jobs):
+        """
+        jobs maps key -> zero-argument callable, in the order they should run.
+        Keys already scheduled keep their result; others are cancelled
+        (if not started yet) and dropped. Returns the number of new jobs.
+        """
+        with self._lock:
+            for key in [key for key in self._futures if key not in jobs]:
+                if self._futures.pop(key).cancel():
+                    self.cancelled += 1
+            queued = 0
+            for key, job in jobs.items():
+                if key not in self._futures:
+                    self._futures[key] = self._executor.submit(job)
+                    queued += 1
+        return queued
+
+    def result(self, key, job):
+        """Prefetched result for key (waiting if it is running), else job() run here"""
+        with self._lock:
+            future = self._futures.get(key)
+        if future is not None:
+            try:
+                return future.result()
+            except (CancelledError, Exception):
+                # Cancelled, or failed: re-run in the foreground so any error surfaces here
+                pass
+        return job()
+
+    def close(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
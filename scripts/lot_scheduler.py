@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Lot scheduler with re-auction rounds
+Round 1 walks players_df in its row order (the auction order, set once by
+order_players() when the auction starts) with a cursor, so the next lot
+is O(1). A lot that goes unsold is re-queued on a heap keyed by (round,
+row) for the next round, at an optionally reduced base price, in
+O(log n); later rounds are drawn from the heap in the same player order.
+Lots settled elsewhere (the bulk import) are discarded lazily and skipped
+when they reach the front; lots recorded unsold there are deferred to the
+next round the same way. players_df itself is never re-sorted or
+copied after the auction starts. numpy and pandas are imported only by
+the functions that need them: the app's setup screen imports ORDERINGS.
+
+    scheduler = LotScheduler.from_frame(players_df, rounds=3, round_base=0.8)
+    lot = scheduler.current()          # Lot(row, round, base)
+    scheduler.requeue()                # unsold: back in round 2 at 80% of base
+    scheduler.advance()                # sold
+"""
+
+import heapq
+from collections import namedtuple
+
+# row is the position in players_df; base is the starting price in this round
+Lot = namedtuple('Lot', ['row', 'round', 'base'])
+
+# Every ordering keeps the roles in ROLE_ORDER (the app's auction phases) and orders players within a role
+ORDERINGS = {
+    'base_desc': 'Role, then base tokens (high first)',
+    'base_asc': 'Role, then base tokens (low first)',
+    'sheet': 'Role, then sheet order',
+    'shuffle': 'Role, then shuffled',
+}
+DEFAULT_ORDERING = 'base_desc'
+
+AUCTION_ROUNDS = 3
+
+
+def order_players(players_df, ordering=DEFAULT_ORDERING, seed=None):
+    """players_df in auction order for one of ORDERINGS (a stable sort, so ties keep the sheet order)"""
+    import numpy as np
+
+    if ordering == 'base_desc':
+        return players_df.sort_values(['Role', 'BaseTokens'], ascending=[True, False], kind='stable')
+    if ordering == 'base_asc':
+        return players_df.sort_values(['Role', 'BaseTokens'], kind='stable')
+    if ordering == 'sheet':
+        return players_df.sort_values('Role', kind='stable')
+    if ordering == 'shuffle':
+        draw = np.random.default_rng(seed).permutation(len(players_df))
+        order = np.lexsort((draw, players_df['Role'].cat.codes.to_numpy()))
+        return players_df.iloc[order]
+    raise ValueError(f"Unknown lot ordering '{ordering}' (expected one of {', '.join(ORDERINGS)})")
+
+
+class LotScheduler:
+    """Round 1 by cursor over the rows, later rounds from a (round, row) heap"""
+
+    def __init__(self, player_ids, base_tokens, rounds=AUCTION_ROUNDS, round_base=1.0):
+        self.player_ids = [str(player_id) for player_id in player_ids]
+        self.base_tokens = [int(tokens) for tokens in base_tokens]
+        self.rounds = rounds
+        self.round_base = round_base
+        self.cursor = 0
+        self._heap = []
+        self._pending = {}
+        self._discarded = set()
+        self._rows = {player_id: row for row, player_id in enumerate(self.player_ids)}
+        # Lots queued and finished per round, for the "lot x of y" progress of a re-auction round
+        self.queued = {1: len(self.player_ids)}
+        self.finished = {}
+
+    @classmethod
+    def from_frame(cls, players_df, rounds=AUCTION_ROUNDS, round_base=1.0):
+        import pandas as pd
+
+        tokens = pd.to_numeric(players_df['BaseTokens'], errors='coerce').fillna(0)
+        return cls(players_df['PlayerID'].tolist(), tokens.tolist(), rounds, round_base)
+
+    def __len__(self):
+        """Lots still to be auctioned, this round and queued for later ones"""
+        return sum(self.queued.values()) - sum(self.finished.values())
+
+    def base_price(self, row, round_number):
+        """Base tokens of a row in a round: round_base applied once per re-auction"""
+        return int(round(self.base_tokens[row] * self.round_base ** (round_number - 1)))
+
+    def _lot(self, row, round_number):
+        return Lot(row, round_number, self.base_price(row, round_number))
+
+    def _skipped(self, row, round_number):
+        """Discarded, or deferred past this round (a row ahead of the cursor can only be pending if deferred)"""
+        return row in self._discarded or self._pending.get(row, 1) != round_number
+
+    def _settle_front(self):
+        """Drop discarded and deferred lots from the front of round 1 and of the heap"""
+        while self.cursor < len(self.player_ids) and self._skipped(self.cursor, 1):
+            self.cursor += 1
+        while self._heap and self._skipped(self._heap[0][1], self._heap[0][0]):
+            heapq.heappop(self._heap)
+
+    def current(self):
+        """The lot being auctioned, or None when every round is done"""
+        self._settle_front()
+        if self.cursor < len(self.player_ids):
+            return self._lot(self.cursor, 1)
+        if self._heap:
+            return self._lot(self._heap[0][1], self._heap[0][0])
+        return None
+
+    def advance(self):
+        """The current lot is settled (sold); returns it"""
+        lot = self.current()
+        if lot is None:
+            return None
+        if lot.round == 1:
+            self.cursor += 1
+        else:
+            heapq.heappop(self._heap)
+            del self._pending[lot.row]
+        self.finished[lot.round] = self.finished.get(lot.round, 0) + 1
+        return lot
+
+    def _queue_next_round(self, lot):
+        """Queue an unsold lot for the next round; the re-queued Lot, or None after the last round"""
+        if lot.round >= self.rounds:
+            return None
+        next_round = lot.round + 1
+        heapq.heappush(self._heap, (next_round, lot.row))
+        self._pending[lot.row] = next_round
+        self.queued[next_round] = self.queued.get(next_round, 0) + 1
+        return self._lot(lot.row, next_round)
+
+    def requeue(self):
+        """
+        The current lot went unsold: queue it for the next round. Returns the
+        re-queued Lot, or None when it was already in the last round.
+        """
+        lot = self.advance()
+        if lot is None:
+            return None
+        return self._queue_next_round(lot)
+
+    def _settle(self, player_id):
+        """Finish the waiting lot of a PlayerID outside the scheduler; the Lot, or None if none is waiting"""
+        row = self._rows.get(str(player_id))
+        if row is None or row in self._discarded:
+            return None
+        if row in self._pending:
+            round_number = self._pending.pop(row)
+        elif row >= self.cursor:
+            round_number = 1
+        else:
+            return None
+        self.finished[round_number] = self.finished.get(round_number, 0) + 1
+        return self._lot(row, round_number)
+
+    def discard(self, player_ids):
+        """Lots settled outside the scheduler (by PlayerID) are skipped when they come up"""
+        for player_id in player_ids:
+            lot = self._settle(player_id)
+            if lot is not None:
+                self._discarded.add(lot.row)
+
+    def defer(self, player_ids):
+        """
+        Lots recorded unsold outside the scheduler (by PlayerID) move to their
+        next round, as requeue() does for the current lot; after the last round
+        they are discarded. Returns the re-queued Lots.
+        """
+        lots = []
+        for player_id in player_ids:
+            lot = self._settle(player_id)
+            if lot is None:
+                continue
+            requeued = self._queue_next_round(lot)
+            if requeued is None:
+                self._discarded.add(lot.row)
+            else:
+                lots.append(requeued)
+        return lots
+
+    def upcoming(self, count):
+        """The next `count` lots in order, current first, without changing the queue"""
+        lots = []
+        row = self.cursor
+        while row < len(self.player_ids) and len(lots) < count:
+            if not self._skipped(row, 1):
+                lots.append(self._lot(row, 1))
+            row += 1
+        # Best-first walk of the heap tree: only the nodes that can be among the smallest are visited
+        frontier = [(self._heap[0], 0)] if self._heap else []
+        while frontier and len(lots) < count:
+            (round_number, row), position = heapq.heappop(frontier)
+            if not self._skipped(row, round_number):
+                lots.append(self._lot(row, round_number))
+            for child in (2 * position + 1, 2 * position + 2):
+                if child < len(self._heap):
+                    heapq.heappush(frontier, (self._heap[child], child))
+        return lots
+
+    def round_progress(self, lot):
+        """(number of this lot within its round, lots in the round)"""
+        return self.finished.get(lot.round, 0) + 1, self.queued.get(lot.round, 0)
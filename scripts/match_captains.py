@@ -5,7 +5,9 @@ Helper script to match captain names with player names
 
 import pandas as pd
 from pathlib import Path
-from difflib import get_close_matches
+
+import workbook_cache
+from name_matcher import NameIndex
 
 def match_captains():
     """Find closest matches for captain names"""
@@ -17,10 +19,10 @@ def match_captains():
     captain_file = Path('data/captain_team_assignments.xlsx')
     players_file = Path('data/CPL_Players_Editable.xlsx')
     
-    captains_df = pd.read_excel(captain_file)
-    players_df = pd.read_excel(players_file, sheet_name='Players')
+    captains_df = workbook_cache.read_excel(captain_file)
+    players_df = workbook_cache.read_excel(players_file, sheet_name='Players')
     
-    player_names = players_df['Name'].tolist()
+    name_index = NameIndex.from_frame(players_df)
     
     print("\n👑 CAPTAIN MATCHES:")
     print("-" * 70)
@@ -29,13 +31,12 @@ def match_captains():
         if pd.isna(captain_name) or str(captain_name).strip() == '':
             continue
             
-        matches = get_close_matches(str(captain_name), player_names, n=3, cutoff=0.6)
+        matches = name_index.query(captain_name, k=3, cutoff=0.6)
         print(f"\nCaptain: {captain_name}")
         if matches:
             print(f"  Possible matches:")
             for i, match in enumerate(matches, 1):
-                player_id = players_df[players_df['Name'] == match].iloc[0]['PlayerID']
-                print(f"    {i}. {match} (ID: {player_id})")
+                print(f"    {i}. {match.name} (ID: {match.player_id}, score: {match.score:.2f})")
         else:
             print(f"  ❌ No close matches found")
     
@@ -46,13 +47,12 @@ def match_captains():
         if pd.isna(vice_captain_name) or str(vice_captain_name).strip() == '':
             continue
             
-        matches = get_close_matches(str(vice_captain_name), player_names, n=3, cutoff=0.6)
+        matches = name_index.query(vice_captain_name, k=3, cutoff=0.6)
         print(f"\nVice-Captain: {vice_captain_name}")
         if matches:
             print(f"  Possible matches:")
             for i, match in enumerate(matches, 1):
-                player_id = players_df[players_df['Name'] == match].iloc[0]['PlayerID']
-                print(f"    {i}. {match} (ID: {player_id})")
+                print(f"    {i}. {match.name} (ID: {match.player_id}, score: {match.score:.2f})")
         else:
             print(f"  ❌ No close matches found")
     
@@ -6,6 +6,9 @@ Merge captains from captain_team_assignments into CPL_Players_Editable
 import pandas as pd
 from pathlib import Path
 
+import workbook_cache
+from name_matcher import resolve_team_leaders
+
 def merge_captains():
     """Merge captain data into players file"""
     
@@ -17,42 +20,43 @@ def merge_captains():
     players_file = Path('data/CPL_Players_Editable.xlsx')
     
     # Read available captains
-    available_captains_df = pd.read_excel(captain_file, sheet_name='Available_Captains')
+    available_captains_df = workbook_cache.read_excel(captain_file, sheet_name='Available_Captains')
     
     # Read team assignments
-    teams_df = pd.read_excel(captain_file, sheet_name='Teams')
+    teams_df = workbook_cache.read_excel(captain_file, sheet_name='Teams')
     
     # Read current players
-    players_df = pd.read_excel(players_file, sheet_name='Players')
+    players_df = workbook_cache.read_excel(players_file, sheet_name='Players')
     
     print(f"📊 Current players in file: {len(players_df)}")
     print(f"📊 Available captains to add: {len(available_captains_df)}")
     print()
     
-    # Create team assignment mapping
-    captain_to_team = {}
-    vice_captain_to_team = {}
+    # Create team assignment mapping keyed by resolved ID (uppercase IDs for consistency)
+    available_captains_df['PlayerID'] = available_captains_df['EmployeeID'].astype(str).str.upper()
+    leaders = resolve_team_leaders(teams_df, available_captains_df[['Name', 'PlayerID']])
+    leaders = leaders[leaders['PlayerID'].notna() & ~leaders['Ambiguous']]
+    
+    captain_to_team = leaders[leaders['Position'] == 'Captain'].set_index('PlayerID')['TeamName'].to_dict()
+    vice_captain_to_team = leaders[leaders['Position'] == 'ViceCaptain'].set_index('PlayerID')['TeamName'].to_dict()
     
-    for _, row in teams_df.iterrows():
-        team_name = row['TeamName']
-        captain_to_team[str(row['Captain']).strip()] = team_name
-        vice_captain_to_team[str(row['ViceCaptain']).strip()] = team_name
+    available_captains_df['AlreadyListed'] = available_captains_df['PlayerID'].isin(players_df['PlayerID'])
     
     # Add captains to players list
     new_players = []
     for _, row in available_captains_df.iterrows():
-        player_id = str(row['EmployeeID']).upper()
+        player_id = row['PlayerID']
         name = str(row['Name']).strip()
         
         # Skip if already in players list
-        if player_id in players_df['PlayerID'].values:
+        if row['AlreadyListed']:
             print(f"  ⏭️  Skipping {name} ({player_id}) - already in players list")
             continue
         
         # Determine if captain or vice-captain and which team
-        is_captain = name in captain_to_team
-        is_vice_captain = name in vice_captain_to_team
-        team = captain_to_team.get(name) or vice_captain_to_team.get(name)
+        is_captain = player_id in captain_to_team
+        is_vice_captain = player_id in vice_captain_to_team
+        team = captain_to_team.get(player_id) or vice_captain_to_team.get(player_id)
         
         new_player = {
             'PlayerID': player_id,
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Indexed fuzzy name matcher
+Builds a character trigram inverted index over player names once, then
+answers top-k lookups by scoring only names that share one of the query's
+rarest trigrams (prefix filtering), so common grams never fan out.
+"""
+
+import math
+import re
+import unicodedata
+from collections import defaultdict, namedtuple
+
+import pandas as pd
+
+NameMatch = namedtuple('NameMatch', ['name', 'player_id', 'score'])
+
+_NON_ALNUM = re.compile(r'[^a-z0-9\s]')
+_SPACES = re.compile(r'\s+')
+
+
+def normalize_name(name):
+    """Lowercase, strip accents and punctuation, collapse whitespace"""
+    if name is None:
+        return ''
+    text = unicodedata.normalize('NFKD', str(name))
+    text = text.encode('ascii', 'ignore').decode('ascii').lower()
+    text = _NON_ALNUM.sub(' ', text)
+    return _SPACES.sub(' ', text).strip()
+
+
+def name_trigrams(normalized):
+    """Trigrams of each token padded with spaces, so word order does not matter"""
+    grams = set()
+    for token in normalized.split():
+        padded = f"  {token} "
+        for i in range(len(padded) - 2):
+            grams.add(padded[i:i + 3])
+    return grams
+
+
+class NameIndex:
+    """Trigram inverted index over a list of names"""
+
+    def __init__(self, names, player_ids=None):
+        self.names = [str(name).strip() for name in names]
+        self.player_ids = list(player_ids) if player_ids is not None else [None] * len(self.names)
+        self.normalized = [normalize_name(name) for name in self.names]
+        self.exact = defaultdict(list)
+        self.gram_sets = []
+        self.postings = defaultdict(list)
+
+        for pos, normalized in enumerate(self.normalized):
+            self.exact[normalized].append(pos)
+            grams = name_trigrams(normalized)
+            self.gram_sets.append(grams)
+            for gram in grams:
+                self.postings[gram].append(pos)
+
+    @classmethod
+    def from_frame(cls, df, name_col='Name', id_col='PlayerID'):
+        """Build an index from a players DataFrame"""
+        ids = df[id_col].tolist() if id_col in df.columns else None
+        return cls(df[name_col].fillna('').tolist(), ids)
+
+    def __len__(self):
+        return len(self.names)
+
+    def _match(self, pos, score):
+        return NameMatch(self.names[pos], self.player_ids[pos], round(score, 4))
+
+    def query(self, name, k=3, cutoff=0.6):
+        """
+        Return up to k NameMatch tuples with score >= cutoff, best first.
+        Score is the Dice coefficient of the trigram sets (1.0 for an exact
+        normalized match).
+        """
+        normalized = normalize_name(name)
+        if not normalized:
+            return []
+
+        exact_hits = self.exact.get(normalized, [])
+        if len(exact_hits) >= k:
+            return [self._match(pos, 1.0) for pos in exact_hits[:k]]
+
+        query_grams = name_trigrams(normalized)
+        query_size = len(query_grams)
+
+        # Dice >= cutoff needs at least min_overlap shared grams, so every
+        # qualifying name shares one of the (query_size - min_overlap + 1)
+        # rarest query grams; only those postings generate candidates.
+        min_overlap = max(1, math.ceil(cutoff * query_size / (2.0 - cutoff)))
+        by_rarity = sorted(query_grams, key=lambda gram: len(self.postings.get(gram, ())))
+        candidates = set()
+        for gram in by_rarity[:query_size - min_overlap + 1]:
+            candidates.update(self.postings.get(gram, ()))
+
+        scored = []
+        for pos in candidates:
+            if pos in exact_hits:
+                continue
+            grams = self.gram_sets[pos]
+            score = 2.0 * len(query_grams & grams) / (query_size + len(grams))
+            if score >= cutoff:
+                scored.append((score, pos))
+        scored.sort(key=lambda item: (-item[0], item[1]))
+
+        matches = [self._match(pos, 1.0) for pos in exact_hits]
+        matches.extend(self._match(pos, score) for score, pos in scored[:k - len(matches)])
+        return matches
+
+    def best(self, name, cutoff=0.75):
+        """Return the single best match, or None if absent or tied"""
+        matches = self.query(name, k=2, cutoff=cutoff)
+        if not matches:
+            return None
+        if len(matches) > 1 and matches[1].score == matches[0].score:
+            return None
+        return matches[0]
+
+
+def resolve_player_ids(names, players_df, name_col='Name', id_col='PlayerID', cutoff=0.75):
+    """
+    Resolve a whole column of names to PlayerIDs in one pass.
+    Exact matches are a hash join on the normalized name; only the distinct
+    names left over go through the fuzzy index.
+
+    Returns a DataFrame aligned with `names` with columns:
+    Name, PlayerID, MatchedName, Confidence, MatchType
+    ('exact', 'fuzzy', 'missing') and Ambiguous.
+    """
+    names = pd.Series(names).reset_index(drop=True)
+    keys = names.map(lambda name: '' if pd.isna(name) else normalize_name(name))
+
+    reference = pd.DataFrame({
+        'key': players_df[name_col].map(lambda name: '' if pd.isna(name) else normalize_name(name)),
+        'PlayerID': players_df[id_col].values,
+        'MatchedName': players_df[name_col].astype(str).str.strip().values,
+    })
+    reference = reference[reference['key'] != '']
+    key_counts = reference.groupby('key').size()
+    exact = reference.drop_duplicates('key').set_index('key')
+
+    result = pd.DataFrame({'Name': names})
+    result['PlayerID'] = keys.map(exact['PlayerID'])
+    result['MatchedName'] = keys.map(exact['MatchedName'])
+    result['Confidence'] = result['PlayerID'].notna().astype(float)
+    result['MatchType'] = result['PlayerID'].notna().map({True: 'exact', False: 'missing'})
+    result['Ambiguous'] = keys.map(key_counts).fillna(0).gt(1)
+
+    pending = keys[result['PlayerID'].isna() & (keys != '')].unique()
+    if len(pending) > 0:
+        name_index = NameIndex(reference['MatchedName'].tolist(), reference['PlayerID'].tolist())
+        fuzzy = {}
+        for key in pending:
+            matches = name_index.query(key, k=2, cutoff=cutoff)
+            if matches:
+                tied = len(matches) > 1 and matches[1].score == matches[0].score
+                fuzzy[key] = (matches[0], tied)
+
+        if fuzzy:
+            hit = keys.isin(list(fuzzy.keys()))
+            result.loc[hit, 'PlayerID'] = keys[hit].map(lambda key: fuzzy[key][0].player_id)
+            result.loc[hit, 'MatchedName'] = keys[hit].map(lambda key: fuzzy[key][0].name)
+            result.loc[hit, 'Confidence'] = keys[hit].map(lambda key: fuzzy[key][0].score)
+            result.loc[hit, 'MatchType'] = 'fuzzy'
+            result.loc[hit, 'Ambiguous'] = keys[hit].map(lambda key: fuzzy[key][1])
+
+    result['Ambiguous'] = result['Ambiguous'].astype(bool)
+    return result
+
+
+def resolve_team_leaders(teams_df, players_df, name_col='Name', id_col='PlayerID', cutoff=0.75):
+    """
+    Resolve the Captain and ViceCaptain columns of a Teams sheet in one pass.
+    Returns one row per named leader (all captains first, then vice-captains)
+    with TeamName and Position ('Captain'/'ViceCaptain') followed by the
+    resolve_player_ids columns.
+    """
+    positions = [col for col in ['Captain', 'ViceCaptain'] if col in teams_df.columns]
+    leaders = teams_df.melt(id_vars=['TeamName'], value_vars=positions,
+                            var_name='Position', value_name='LeaderName')
+    named = leaders['LeaderName'].notna() & (leaders['LeaderName'].astype(str).str.strip() != '')
+    leaders = leaders[named].reset_index(drop=True)
+
+    resolved = resolve_player_ids(leaders['LeaderName'], players_df, name_col, id_col, cutoff)
+    return pd.concat([leaders[['TeamName', 'Position']], resolved], axis=1)
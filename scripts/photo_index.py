@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Photo coverage index: PlayerID -> image file on disk
+Scans the image directories once and answers lookups from memory, trying
+the sheet's PhotoFileName (case-insensitively), then <PlayerID>.<ext>,
+then the legacy name-based filename (first_last.jpg). The report lists
+players without a photo and image files no player resolves to.
+"""
+
+import os
+import re
+from collections import namedtuple
+from pathlib import Path
+
+import pandas as pd
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp')
+DEFAULT_PHOTO_DIRS = [Path('assets/images/players'), Path('public/players'), Path('assets/images')]
+
+PhotoMatch = namedtuple('PhotoMatch', ['path', 'match_type'])
+
+_LEGACY_STRIP_RE = re.compile(r'[^a-zA-Z0-9\s]')
+
+
+def legacy_photo_stem(name):
+    """Stem of the name-based filename the registration scripts used to generate"""
+    if name is None or pd.isna(name):
+        return None
+    parts = _LEGACY_STRIP_RE.sub('', str(name)).lower().split()
+    if not parts:
+        return None
+    return f"{parts[0]}_{parts[-1]}" if len(parts) >= 2 else parts[0]
+
+
+class PhotoIndex:
+    """In-memory index of image files, built with one directory scan"""
+
+    def __init__(self, directories):
+        self.directories = [Path(directory) for directory in directories]
+        self.by_filename = {}
+        self.by_stem = {}
+        for directory in self.directories:
+            if not directory.is_dir():
+                continue
+            with os.scandir(directory) as entries:
+                for entry in sorted(entries, key=lambda entry: entry.name):
+                    stem, ext = os.path.splitext(entry.name)
+                    if ext.lower() not in IMAGE_EXTENSIONS or not entry.is_file():
+                        continue
+                    # Earlier directories win, so list the preferred one first
+                    path = directory / entry.name
+                    self.by_filename.setdefault(entry.name.lower(), path)
+                    self.by_stem.setdefault(stem.lower(), path)
+
+    def __len__(self):
+        return len(self.by_filename)
+
+    def resolve(self, photo_filename=None, player_id=None, name=None):
+        """Return a PhotoMatch; match_type is filename, stem, player_id, legacy or missing"""
+        if photo_filename is not None and not pd.isna(photo_filename) and str(photo_filename).strip():
+            filename = os.path.basename(str(photo_filename).strip()).lower()
+            if filename in self.by_filename:
+                return PhotoMatch(self.by_filename[filename], 'filename')
+            stem = os.path.splitext(filename)[0]
+            if stem in self.by_stem:
+                return PhotoMatch(self.by_stem[stem], 'stem')
+
+        if player_id is not None and not pd.isna(player_id):
+            path = self.by_stem.get(str(player_id).strip().lower())
+            if path is not None:
+                return PhotoMatch(path, 'player_id')
+
+        legacy = legacy_photo_stem(name)
+        if legacy and legacy in self.by_stem:
+            return PhotoMatch(self.by_stem[legacy], 'legacy')
+
+        return PhotoMatch(None, 'missing')
+
+    def lookup(self, photo_filename=None, player_id=None, name=None):
+        """Resolved Path or None"""
+        return self.resolve(photo_filename, player_id, name).path
+
+    def coverage(self, players_df):
+        """
+        Resolve every player. Returns (DataFrame of PlayerID, Name,
+        PhotoFileName, ResolvedPath, MatchType; list of orphan file paths).
+        """
+        photo_names = players_df['PhotoFileName'] if 'PhotoFileName' in players_df.columns else [None] * len(players_df)
+        matches = [self.resolve(photo, player_id, name)
+                   for photo, player_id, name in zip(photo_names, players_df['PlayerID'], players_df['Name'])]
+
+        report = pd.DataFrame({
+            'PlayerID': players_df['PlayerID'].values,
+            'Name': players_df['Name'].values,
+            'PhotoFileName': list(photo_names),
+            'ResolvedPath': [None if match.path is None else str(match.path) for match in matches],
+            'MatchType': [match.match_type for match in matches],
+        })
+
+        claimed = {os.path.splitext(match.path.name)[0].lower() for match in matches if match.path is not None}
+        orphans = sorted(str(path) for stem, path in self.by_stem.items() if stem not in claimed)
+        return report, orphans
+
+
+def print_coverage_report(report, orphans):
+    print("📸 PHOTO COVERAGE")
+    print("=" * 70)
+    counts = report['MatchType'].value_counts()
+    for match_type in ['filename', 'stem', 'player_id', 'legacy', 'missing']:
+        if counts.get(match_type, 0):
+            print(f"   {match_type:<10} {counts[match_type]}")
+    print()
+
+    missing = report[report['MatchType'] == 'missing']
+    if len(missing) > 0:
+        print(f"❌ {len(missing)} player(s) without a photo:")
+        for _, row in missing.iterrows():
+            print(f"   {row['PlayerID']}  {row['Name']}  (PhotoFileName: {row['PhotoFileName']})")
+        print()
+
+    if orphans:
+        print(f"⚠️  {len(orphans)} image(s) not used by any player:")
+        for path in orphans:
+            print(f"   {path}")
+        print()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    import workbook_cache
+
+    parser = argparse.ArgumentParser(description='Report which players have a photo on disk')
+    parser.add_argument('--workbook', default='data/CPL_Players_Editable.xlsx')
+    parser.add_argument('--sheet', default='Players')
+    parser.add_argument('--dirs', nargs='+', default=DEFAULT_PHOTO_DIRS[:2],
+                        help='Player photo directories, preferred first')
+    args = parser.parse_args()
+
+    players = workbook_cache.read_excel(args.workbook, sheet_name=args.sheet)
+    print_coverage_report(*PhotoIndex(args.dirs).coverage(players))
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Incremental, parallel directory sync for player photos
+Compares each source image's size/mtime (and content hash when those
+changed) against a manifest from the previous run, then copies or
+hardlinks only new and changed files on a thread pool. An unchanged
+directory costs one stat per file and no reads.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from fnmatch import fnmatch
+from pathlib import Path
+
+MANIFEST_DIR = Path(__file__).resolve().parent.parent / '.cache' / 'photo_sync'
+DEFAULT_WORKERS = 8
+
+_HASH_CHUNK = 1 << 20
+
+SyncReport = namedtuple('SyncReport', [
+    'copied', 'unchanged', 'orphans', 'deleted', 'bytes_copied', 'bytes_saved',
+])
+
+
+def file_hash(path):
+    """blake2b content hash of a file"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def manifest_path_for(dest_dir):
+    """Default manifest location for a destination directory (kept out of public/)"""
+    resolved = str(Path(dest_dir).resolve())
+    key = hashlib.blake2b(resolved.encode('utf-8'), digest_size=8).hexdigest()
+    return MANIFEST_DIR / f"{Path(dest_dir).name}-{key}.json"
+
+
+def load_manifest(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(path, manifest):
+    path = Path(path)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, sort_keys=True)
+        tmp_path.replace(path)
+    except OSError:
+        # Without a manifest the next run re-hashes, it does not re-copy
+        pass
+
+
+def _scan(directory, pattern):
+    """{name: os.stat_result} for the files in directory matching pattern"""
+    if not Path(directory).exists():
+        return {}
+    with os.scandir(directory) as entries:
+        return {entry.name: entry.stat() for entry in entries
+                if entry.is_file() and fnmatch(entry.name, pattern)}
+
+
+def _place(source, dest, link):
+    """Copy (or hardlink) source to dest through a temp name, so readers never see half a file"""
+    tmp_dest = dest.with_name(f".{dest.name}.tmp")
+    if tmp_dest.exists():
+        tmp_dest.unlink()
+    if link:
+        try:
+            os.link(source, tmp_dest)
+        except OSError:
+            shutil.copy2(source, tmp_dest)
+    else:
+        shutil.copy2(source, tmp_dest)
+    tmp_dest.replace(dest)
+
+
+def sync_directory(source_dir, dest_dir, pattern='*.jpg', manifest_path=None, workers=DEFAULT_WORKERS,
+                   link=False, delete_orphans=False):
+    """
+    Make dest_dir hold the same `pattern` files as source_dir.
+    A file is copied when the destination is missing or differs in size, or
+    when the source's size/mtime changed and its content hash differs from
+    the manifest's (or, with no manifest entry, from the destination's). Orphans (in dest, not in source) are deleted only when
+    delete_orphans is set. Returns a SyncReport.
+    """
+    source_dir, dest_dir = Path(source_dir), Path(dest_dir)
+    manifest_path = Path(manifest_path) if manifest_path else manifest_path_for(dest_dir)
+    dest_dir.mkdir(parents=True, exist_ok=True)
+
+    old_manifest = load_manifest(manifest_path)
+    sources = _scan(source_dir, pattern)
+    dests = _scan(dest_dir, pattern)
+
+    manifest = {}
+    to_hash = []
+    for name, st in sources.items():
+        entry = old_manifest.get(name)
+        dest_st = dests.get(name)
+        dest_ok = dest_st is not None and dest_st.st_size == st.st_size
+        if entry and dest_ok and entry['size'] == st.st_size and entry['mtime_ns'] == st.st_mtime_ns:
+            manifest[name] = entry
+        else:
+            to_hash.append(name)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        hashes = dict(zip(to_hash, pool.map(lambda name: file_hash(source_dir / name), to_hash)))
+
+        # Without a manifest entry (first run), a same-size destination is
+        # trusted only if its content hashes the same
+        unknown = [name for name in to_hash if name not in old_manifest
+                   and name in dests and dests[name].st_size == sources[name].st_size]
+        dest_hashes = dict(zip(unknown, pool.map(lambda name: file_hash(dest_dir / name), unknown)))
+
+        to_copy = []
+        for name in to_hash:
+            st = sources[name]
+            dest_st = dests.get(name)
+            dest_ok = dest_st is not None and dest_st.st_size == st.st_size
+            known_hash = old_manifest[name]['hash'] if name in old_manifest else dest_hashes.get(name)
+            if not (dest_ok and known_hash == hashes[name]):
+                to_copy.append(name)
+            manifest[name] = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'hash': hashes[name]}
+
+        list(pool.map(lambda name: _place(source_dir / name, dest_dir / name, link), to_copy))
+
+    orphans = sorted(set(dests) - set(sources))
+    deleted = []
+    if delete_orphans:
+        for name in orphans:
+            (dest_dir / name).unlink()
+            deleted.append(name)
+
+    save_manifest(manifest_path, manifest)
+
+    copied = set(to_copy)
+    return SyncReport(
+        copied=sorted(copied),
+        unchanged=len(sources) - len(copied),
+        orphans=orphans,
+        deleted=deleted,
+        bytes_copied=sum(sources[name].st_size for name in copied),
+        bytes_saved=sum(st.st_size for name, st in sources.items() if name not in copied),
+    )
+
+
+def format_bytes(size):
+    """Human-readable byte count"""
+    for unit in ['B', 'KB', 'MB']:
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Incrementally sync player photos')
+    parser.add_argument('source', nargs='?', default='assets/images/players')
+    parser.add_argument('dest', nargs='?', default='public/players')
+    parser.add_argument('--pattern', default='*.jpg')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS)
+    parser.add_argument('--link', action='store_true', help='Hardlink instead of copying when possible')
+    parser.add_argument('--delete-orphans', action='store_true', help='Remove destination files missing from source')
+    args = parser.parse_args()
+
+    report = sync_directory(args.source, args.dest, args.pattern, workers=args.workers,
+                            link=args.link, delete_orphans=args.delete_orphans)
+    print(f"📁 {len(report.copied)} copied ({format_bytes(report.bytes_copied)}), "
+          f"{report.unchanged} unchanged ({format_bytes(report.bytes_saved)} saved), "
+          f"{len(report.orphans)} orphan(s), {len(report.deleted)} deleted")
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Compact dtypes for player and team frames
+Role, Status, Department and SoldTo become pandas Categoricals (Role and
+Status with a fixed order), and token/price columns the smallest integer
+dtype that holds them. Role filters and isin() then compare small integer
+codes instead of Python strings, and sorting by Role follows ROLE_ORDER.
+Apply right after loading a sheet; values outside the known categories
+are kept (appended after them), never dropped.
+"""
+
+import numpy as np
+import pandas as pd
+
+ROLE_ORDER = ['Batsman', 'Bowler', 'All-rounder', 'WicketKeeper']
+STATUS_ORDER = ['Available', 'Sold', 'Unsold']
+
+# column -> (fixed category order or None to use the values present, ordered)
+PLAYER_CATEGORIES = {
+    'Role': (ROLE_ORDER, True),
+    'Status': (STATUS_ORDER, True),
+    'Department': (None, False),
+    'SoldTo': (None, False),
+}
+PLAYER_INTEGERS = ['BaseTokens', 'SoldPrice']
+
+TEAM_INTEGERS = ['TokensLeft', 'MaxTokens', 'MaxSquadSize']
+
+# Spellings of the roles seen in the sheets ('Wicket Keeper', 'all rounder'), keyed without case, spaces or dashes
+_ROLE_KEYS = {role.lower().replace('-', ''): role for role in ROLE_ORDER}
+
+# int8 is skipped on purpose: token arithmetic (sums, x1000 order keys) would overflow it
+_INT_DTYPES = [np.int16, np.int32, np.int64]
+
+
+def categorical(values, categories=None, ordered=False):
+    """values as a Categorical; values missing from `categories` are appended in sorted order"""
+    present = pd.Series(values).dropna().unique()
+    if categories is None:
+        categories = sorted(present, key=str)
+    else:
+        known = set(categories)
+        categories = list(categories) + sorted((value for value in present if value not in known), key=str)
+    return pd.Series(values).astype(pd.CategoricalDtype(categories, ordered=ordered))
+
+
+def compact_int(values):
+    """
+    values in the smallest integer dtype (from int16 up) that holds them, as a
+    nullable Int dtype when some are missing. Columns with text or
+    fractional numbers are returned unchanged.
+    """
+    values = pd.Series(values)
+    numeric = pd.to_numeric(values, errors='coerce')
+    present = numeric.dropna()
+    if len(present) != values.notna().sum() or not (present == present.round()).all():
+        return values
+    low, high = (present.min(), present.max()) if len(present) else (0, 0)
+    dtype = next(dtype for dtype in _INT_DTYPES if np.iinfo(dtype).min <= low and high <= np.iinfo(dtype).max)
+    if len(present) < len(values):
+        return numeric.astype(dtype.__name__.capitalize())
+    return numeric.astype(dtype)
+
+
+def normalize_roles(values):
+    """
+    Role values with known spellings ('Wicket Keeper', 'all-rounder', ' Bowler')
+    mapped onto ROLE_ORDER; anything else is kept as it is, for the validator to report.
+    """
+    values = pd.Series(values)
+    keys = values.astype(str).str.lower().str.replace(r'[\s_-]+', '', regex=True)
+    return keys.map(_ROLE_KEYS).fillna(values).where(values.notna())
+
+
+def compact_players(df):
+    """Players frame with categorical and narrowed integer columns (a new frame)"""
+    columns = {}
+    for column, (categories, ordered) in PLAYER_CATEGORIES.items():
+        if column in df.columns:
+            columns[column] = categorical(df[column], categories, ordered)
+    for column in PLAYER_INTEGERS:
+        if column in df.columns:
+            columns[column] = compact_int(df[column])
+    return df.assign(**columns)
+
+
+def compact_teams(df):
+    """Teams frame with narrowed integer columns (a new frame)"""
+    return df.assign(**{column: compact_int(df[column]) for column in TEAM_INTEGERS if column in df.columns})
+
+
+def memory_bytes(df):
+    """Deep memory usage of a frame, including the Python string objects"""
+    return int(df.memory_usage(deep=True).sum())
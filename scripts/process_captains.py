@@ -7,6 +7,10 @@ Reads captain assignments and updates the system
 import pandas as pd
 from pathlib import Path
 
+import workbook_cache
+from name_matcher import resolve_team_leaders
+from sql_emitter import frame_rows, write_bulk_update, write_update_where_in
+
 def process_captains():
     """Process captain team assignments"""
     
@@ -22,42 +26,39 @@ def process_captains():
     
     try:
         # Read captain data from Teams sheet
-        captains_df = pd.read_excel(captain_file, sheet_name='Teams')
+        captains_df = workbook_cache.read_excel(captain_file, sheet_name='Teams')
         
         # Read available captains with IDs
-        available_captains_df = pd.read_excel(captain_file, sheet_name='Available_Captains')
+        available_captains_df = workbook_cache.read_excel(captain_file, sheet_name='Available_Captains')
         
         print(f"📊 Loaded {len(captains_df)} team assignments")
         print(f"📊 Loaded {len(available_captains_df)} available captains/vice-captains")
         print()
         
-        # Create name to ID mapping (uppercase IDs for consistency)
-        name_to_id = {}
-        for _, row in available_captains_df.iterrows():
-            name_to_id[str(row['Name']).strip()] = str(row['EmployeeID']).upper()
+        # Resolve every captain and vice-captain name to an ID in one pass
+        # (uppercase IDs for consistency)
+        id_reference = pd.DataFrame({
+            'Name': available_captains_df['Name'],
+            'PlayerID': available_captains_df['EmployeeID'].astype(str).str.upper()
+        })
+        leaders = resolve_team_leaders(captains_df, id_reference)
         
-        print(f"📋 Name to ID mapping created for {len(name_to_id)} players")
+        print(f"📋 Resolved {leaders['PlayerID'].notna().sum()}/{len(leaders)} captain names to IDs")
         print()
         
         # Display captain assignments with resolved IDs
         print("👑 CAPTAIN ASSIGNMENTS")
         print("=" * 70)
-        for _, row in captains_df.iterrows():
-            team = row.get('TeamName', 'Unknown')
-            captain = row.get('Captain', 'Unknown')
-            vice_captain = row.get('ViceCaptain', 'Unknown')
-            
-            captain_id = name_to_id.get(str(captain).strip(), 'N/A')
-            vice_captain_id = name_to_id.get(str(vice_captain).strip(), 'N/A')
-            
-            print(f"  {team}:")
-            print(f"    Captain: {captain} (ID: {captain_id})")
-            print(f"    Vice-Captain: {vice_captain} (ID: {vice_captain_id})")
+        for _, row in leaders.sort_values('TeamName', kind='stable').iterrows():
+            player_id = row['PlayerID'] if pd.notna(row['PlayerID']) else 'N/A'
+            label = 'Captain' if row['Position'] == 'Captain' else 'Vice-Captain'
+            note = f" ~ {row['MatchedName']} ({row['Confidence']:.2f})" if row['MatchType'] == 'fuzzy' else ''
+            print(f"  {row['TeamName']} {label}: {row['Name']} (ID: {player_id}){note}")
         print()
         
         # Read players data
         players_file = Path('data/CPL_Players_Editable.xlsx')
-        players_df = pd.read_excel(players_file, sheet_name='Players')
+        players_df = workbook_cache.read_excel(players_file, sheet_name='Players')
         
         # Add captain columns if they don't exist
         if 'IsCaptain' not in players_df.columns:
@@ -65,76 +66,42 @@ def process_captains():
         if 'IsViceCaptain' not in players_df.columns:
             players_df['IsViceCaptain'] = False
         
-        # Process Captains using ID mapping
-        print("👑 MATCHING CAPTAINS BY ID:")
-        print("-" * 70)
-        
-        captain_ids = []
-        for captain_name in captains_df['Captain'].tolist():
-            if pd.isna(captain_name) or str(captain_name).strip() == '':
-                continue
-            
-            player_id = name_to_id.get(str(captain_name).strip())
-            if player_id and player_id in players_df['PlayerID'].values:
-                captain_ids.append(player_id)
-                print(f"  ✅ Captain: {captain_name} → {player_id}")
-            else:
-                print(f"  ⚠️  Captain not found: {captain_name}")
+        leaders['Found'] = leaders['PlayerID'].isin(players_df['PlayerID']) & ~leaders['Ambiguous']
+        
+        # Report matches per position
+        for position, label, header in [('Captain', 'Captain', '👑 MATCHING CAPTAINS BY ID:'),
+                                        ('ViceCaptain', 'Vice-Captain', '🥈 MATCHING VICE-CAPTAINS BY ID:')]:
+            print(header)
+            print("-" * 70)
+            for _, row in leaders[leaders['Position'] == position].iterrows():
+                if row['Found']:
+                    print(f"  ✅ {label}: {row['Name']} → {row['PlayerID']}")
+                elif row['Ambiguous']:
+                    print(f"  ⚠️  {label} ambiguous: {row['Name']} (closest: {row['MatchedName']})")
+                else:
+                    print(f"  ⚠️  {label} not found: {row['Name']}")
+            print()
+        
+        found = leaders[leaders['Found']]
+        captain_ids = found.loc[found['Position'] == 'Captain', 'PlayerID'].tolist()
+        vice_captain_ids = found.loc[found['Position'] == 'ViceCaptain', 'PlayerID'].tolist()
         
         players_df['IsCaptain'] = players_df['PlayerID'].isin(captain_ids)
-        print()
-        
-        # Process Vice-Captains using ID mapping
-        print("🥈 MATCHING VICE-CAPTAINS BY ID:")
-        print("-" * 70)
-        
-        vice_captain_ids = []
-        for vice_captain_name in captains_df['ViceCaptain'].tolist():
-            if pd.isna(vice_captain_name) or str(vice_captain_name).strip() == '':
-                continue
-            
-            player_id = name_to_id.get(str(vice_captain_name).strip())
-            if player_id and player_id in players_df['PlayerID'].values:
-                vice_captain_ids.append(player_id)
-                print(f"  ✅ Vice-Captain: {vice_captain_name} → {player_id}")
-            else:
-                print(f"  ⚠️  Vice-Captain not found: {vice_captain_name}")
-        
         players_df['IsViceCaptain'] = players_df['PlayerID'].isin(vice_captain_ids)
-        print()
         
         # Mark captains and vice-captains as already sold to their teams
         print("🔒 ASSIGNING CAPTAINS TO TEAMS:")
         print("-" * 70)
         
-        for _, row in captains_df.iterrows():
-            team_name = row.get('TeamName', '')
-            captain_name = row.get('Captain', '')
-            vice_captain_name = row.get('ViceCaptain', '')
-            
-            # Assign captain using ID
-            if not pd.isna(captain_name) and str(captain_name).strip() != '':
-                captain_id = name_to_id.get(str(captain_name).strip())
-                if captain_id:
-                    captain_match = players_df[players_df['PlayerID'] == captain_id]
-                    if not captain_match.empty:
-                        idx = captain_match.index[0]
-                        players_df.at[idx, 'Status'] = 'Sold'
-                        players_df.at[idx, 'SoldTo'] = team_name
-                        players_df.at[idx, 'SoldPrice'] = captain_match.iloc[0]['BaseTokens']
-                        print(f"  ✅ {team_name}: Captain {captain_name} ({captain_id}) assigned")
-            
-            # Assign vice-captain using ID
-            if not pd.isna(vice_captain_name) and str(vice_captain_name).strip() != '':
-                vice_captain_id = name_to_id.get(str(vice_captain_name).strip())
-                if vice_captain_id:
-                    vice_captain_match = players_df[players_df['PlayerID'] == vice_captain_id]
-                    if not vice_captain_match.empty:
-                        idx = vice_captain_match.index[0]
-                        players_df.at[idx, 'Status'] = 'Sold'
-                        players_df.at[idx, 'SoldTo'] = team_name
-                        players_df.at[idx, 'SoldPrice'] = vice_captain_match.iloc[0]['BaseTokens']
-                        print(f"  ✅ {team_name}: Vice-Captain {vice_captain_name} ({vice_captain_id}) assigned")
+        team_by_id = found.drop_duplicates('PlayerID').set_index('PlayerID')['TeamName']
+        assigned_mask = players_df['PlayerID'].isin(team_by_id.index)
+        players_df.loc[assigned_mask, 'Status'] = 'Sold'
+        players_df.loc[assigned_mask, 'SoldTo'] = players_df.loc[assigned_mask, 'PlayerID'].map(team_by_id)
+        players_df.loc[assigned_mask, 'SoldPrice'] = players_df.loc[assigned_mask, 'BaseTokens']
+        
+        for _, row in found.iterrows():
+            label = 'Captain' if row['Position'] == 'Captain' else 'Vice-Captain'
+            print(f"  ✅ {row['TeamName']}: {label} {row['Name']} ({row['PlayerID']}) assigned")
         
         print()
         
@@ -174,36 +141,20 @@ def process_captains():
             
             # Set captains
             f.write("-- Mark captains\n")
-            for player_id in captain_ids:
-                f.write(f"UPDATE players SET is_captain = TRUE WHERE player_id = '{player_id}';\n")
+            write_update_where_in(f, 'players', {'is_captain': True}, 'player_id', captain_ids)
             
             # Set vice-captains
             f.write("\n-- Mark vice-captains\n")
-            for player_id in vice_captain_ids:
-                f.write(f"UPDATE players SET is_vice_captain = TRUE WHERE player_id = '{player_id}';\n")
+            write_update_where_in(f, 'players', {'is_vice_captain': True}, 'player_id', vice_captain_ids)
             
             # Assign captains and vice-captains to their teams
             f.write("\n-- Assign captains and vice-captains to teams (pre-sold, excluded from auction)\n")
-            for _, row in captains_df.iterrows():
-                team_name = row.get('TeamName', '')
-                captain_name = row.get('Captain', '')
-                vice_captain_name = row.get('ViceCaptain', '')
-                
-                # Find and assign captain
-                if not pd.isna(captain_name) and str(captain_name).strip() != '':
-                    captain_match = players_df[players_df['Name'].str.strip() == str(captain_name).strip()]
-                    if not captain_match.empty:
-                        player_id = captain_match.iloc[0]['PlayerID']
-                        base_tokens = captain_match.iloc[0]['BaseTokens']
-                        f.write(f"UPDATE players SET status = 'Sold', sold_to = '{team_name}', sold_price = {base_tokens} WHERE player_id = '{player_id}';\n")
-                
-                # Find and assign vice-captain
-                if not pd.isna(vice_captain_name) and str(vice_captain_name).strip() != '':
-                    vice_captain_match = players_df[players_df['Name'].str.strip() == str(vice_captain_name).strip()]
-                    if not vice_captain_match.empty:
-                        player_id = vice_captain_match.iloc[0]['PlayerID']
-                        base_tokens = vice_captain_match.iloc[0]['BaseTokens']
-                        f.write(f"UPDATE players SET status = 'Sold', sold_to = '{team_name}', sold_price = {base_tokens} WHERE player_id = '{player_id}';\n")
+            base_tokens_by_id = players_df.drop_duplicates('PlayerID').set_index('PlayerID')['BaseTokens']
+            team_assignments = found.drop_duplicates('PlayerID').sort_values(['TeamName', 'Position'])
+            team_assignments = team_assignments.assign(Status='Sold', SoldPrice=team_assignments['PlayerID'].map(base_tokens_by_id))
+            write_bulk_update(f, 'players', 'player_id', ['status', 'sold_to', 'sold_price'],
+                              frame_rows(team_assignments, ['PlayerID', 'Status', 'TeamName', 'SoldPrice']),
+                              casts={'sold_price': 'integer'})
             
             f.write("\n-- Verify captain assignments\n")
             f.write("SELECT player_id, name, role, is_captain, is_vice_captain, status, sold_to, sold_price FROM players WHERE is_captain = TRUE OR is_vice_captain = TRUE ORDER BY sold_to, is_captain DESC;\n")
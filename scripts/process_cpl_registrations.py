@@ -5,14 +5,27 @@ Processes Colruyt Premier League Registrations 2025.xlsx for auction system
 - Extracts players for auction (from PLAYERS tab)
 - Extracts captains for direct team assignment (from CAPTAINS tab)
 - Maps roles to database-compliant values
+- Assigns captain/vice-captain pairs to teams, balanced by tokens and role
+- Flags likely duplicate registrations for review (registration_duplicates.xlsx)
 - Generates auction-ready Excel file
+- With --incremental, only new/changed registrations (keyed by Employee ID)
+  are emitted as delta Excel/SQL outputs alongside the full snapshot
 """
 
+import argparse
+import json
 import pandas as pd
 import numpy as np
 from pathlib import Path
 import re
 
+import workbook_cache
+from sql_emitter import frame_rows, write_bulk_update, write_insert
+from player_schema import ROLE_ORDER
+from captain_balancer import balance_captains, print_balance_report
+from registration_dedup import find_duplicates, print_duplicate_report, write_review_workbook
+from workbook_writer import WorkbookWriter
+
 def map_role_to_category(preferred_role, secondary_role=None):
     """
     Map player roles to database-compliant categories
@@ -83,7 +96,159 @@ def generate_photo_filename(name):
     else:
         return f"{name_parts[0]}.jpg" if name_parts else "player.jpg"
 
-def process_cpl_registrations():
+# Column-wise equivalents of the helpers above, used by normalize_registrations
+ROLE_CATEGORIES = ['WicketKeeper', 'All-rounder', 'Batsman', 'Bowler']
+
+ROLE_DEPARTMENTS = {
+    'Batsman': 'Batting',
+    'Bowler': 'Bowling',
+    'All-rounder': 'All-rounder',
+    'WicketKeeper': 'Wicket Keeping'
+}
+
+SECONDARY_ROLE_COL = 'Secondary Role (if any)'
+
+_WICKETKEEPER_RE = re.compile(r'wicket|keeper')
+_BATTING_ALL_RE = re.compile(r'batting all|bat all')
+_BOWLING_ALL_RE = re.compile(r'bowling all|bowl all')
+_BATSMAN_RE = re.compile(r'batsman|batting|bats')
+_BOWLER_RE = re.compile(r'bowler|bowling|bowl')
+_ID_STRIP_RE = re.compile(r'[^a-zA-Z0-9]')
+_PHOTO_STRIP_RE = re.compile(r'[^a-zA-Z0-9\s]')
+_FIRST_TOKEN_RE = re.compile(r'(\S+)')
+_LAST_TOKEN_RE = re.compile(r'(\S+)\s*$')
+_TWO_TOKENS_RE = re.compile(r'\S\s+\S')
+
+def map_roles_to_categories(preferred_roles, secondary_roles=None):
+    """Vectorized map_role_to_category, returns a Categorical over ROLE_CATEGORIES"""
+    roles_text = preferred_roles.astype(str).str.lower()
+    if secondary_roles is not None:
+        has_secondary = secondary_roles.notna()
+        roles_text = roles_text.where(
+            ~has_secondary, roles_text + ' ' + secondary_roles.astype(str).str.lower()
+        )
+    
+    # Same priority as map_role_to_category; codes index into ROLE_CATEGORIES
+    conditions = [
+        roles_text.str.contains(_WICKETKEEPER_RE),
+        roles_text.str.contains(_BATTING_ALL_RE) | roles_text.str.contains(_BOWLING_ALL_RE),
+        roles_text.str.contains('all', regex=False) & roles_text.str.contains('round', regex=False),
+        roles_text.str.contains(_BATSMAN_RE),
+        roles_text.str.contains(_BOWLER_RE),
+        roles_text.str.contains('fielder', regex=False),
+    ]
+    choices = [0, 1, 1, 2, 3, 2]
+    codes = np.select(conditions, choices, default=1)
+    return pd.Categorical.from_codes(codes, categories=ROLE_CATEGORIES)
+
+def generate_player_ids(names, employee_ids):
+    """Vectorized generate_player_id"""
+    employee_text = employee_ids.astype(str).str.strip()
+    has_employee_id = employee_ids.notna() & (employee_text != '')
+    from_name = names.str.replace(_ID_STRIP_RE, '', regex=True).str[:8].str.upper()
+    return employee_text.str.upper().where(has_employee_id, from_name)
+
+def generate_photo_filenames(names):
+    """Vectorized generate_photo_filename"""
+    cleaned = names.str.replace(_PHOTO_STRIP_RE, '', regex=True).str.lower()
+    first = cleaned.str.extract(_FIRST_TOKEN_RE, expand=False)
+    last = cleaned.str.extract(_LAST_TOKEN_RE, expand=False)
+    has_two = cleaned.str.contains(_TWO_TOKENS_RE)
+    single = (first + '.jpg').fillna('player.jpg')
+    return (first + '_' + last + '.jpg').where(has_two, single)
+
+def normalize_registrations(registrations_df, is_captain=False):
+    """
+    Build auction player rows from a registrations sheet column-wise.
+    Produces the same frame as applying the per-row helpers with iterrows().
+    """
+    names = registrations_df['Name']
+    secondary = registrations_df[SECONDARY_ROLE_COL] if SECONDARY_ROLE_COL in registrations_df.columns else None
+    
+    roles = map_roles_to_categories(registrations_df['Preferred Role'], secondary)
+    
+    # Per-category lookups indexed by the categorical codes
+    base_tokens = np.array([calculate_base_tokens(role, is_captain=is_captain) for role in ROLE_CATEGORIES], dtype=np.int64)
+    departments = np.array([ROLE_DEPARTMENTS[role] for role in ROLE_CATEGORIES], dtype=object)
+    
+    normalized = pd.DataFrame({
+        'PlayerID': generate_player_ids(names, registrations_df['Employee ID']).values,
+        'Name': names.str.strip().values,
+        'Role': np.asarray(roles, dtype=object),
+        'BaseTokens': base_tokens[roles.codes],
+        'PhotoFileName': generate_photo_filenames(names).values,
+        'Department': departments[roles.codes],
+        'EmployeeID': registrations_df['Employee ID'].values,
+        'ContactNumber': registrations_df['Contact Number'].values,
+        'PreferredRole': registrations_df['Preferred Role'].values,
+        'SecondaryRole': secondary.values if secondary is not None else ''
+    })
+    if is_captain:
+        normalized['IsCaptain'] = True
+    return normalized
+
+# Incremental ingest state: {sheet: {PlayerID: row fingerprint}}
+INGEST_STATE_FILE = Path('data/registration_ingest_state.json')
+
+# Serial numbers shift whenever rows are inserted, so they are not part of a row's identity
+FINGERPRINT_EXCLUDED_COLS = ['S.No']
+
+def registration_fingerprints(registrations_df):
+    """Stable per-row fingerprint of the raw registration columns"""
+    cols = [col for col in registrations_df.columns if col not in FINGERPRINT_EXCLUDED_COLS]
+    hashes = pd.util.hash_pandas_object(registrations_df[cols].astype(str), index=False)
+    return hashes.map('{:016x}'.format).values
+
+def load_ingest_state(state_file=INGEST_STATE_FILE):
+    """Load previously ingested fingerprints (empty on first run)"""
+    if not state_file.exists():
+        return {}
+    with open(state_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def save_ingest_state(state, state_file=INGEST_STATE_FILE):
+    """Write ingested fingerprints atomically"""
+    tmp_file = state_file.with_suffix('.tmp')
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=1, sort_keys=True)
+    tmp_file.replace(state_file)
+
+def diff_registrations(normalized_df, fingerprints, previous):
+    """
+    Compare normalized rows against the previous ingest state.
+    Returns (new_ids, changed_ids, removed_ids, current) where current is the
+    {PlayerID: fingerprint} mapping to store for this sheet.
+    """
+    current = dict(zip(normalized_df['PlayerID'], fingerprints))
+    new_ids = [pid for pid in current if pid not in previous]
+    changed_ids = [pid for pid, fp in current.items() if pid in previous and previous[pid] != fp]
+    removed_ids = [pid for pid in previous if pid not in current]
+    return new_ids, changed_ids, removed_ids, current
+
+PLAYER_INSERT_COLUMNS = ['player_id', 'name', 'role', 'department', 'base_tokens', 'photo_filename', 'status', 'auction_order']
+PLAYER_INSERT_FIELDS = ['PlayerID', 'Name', 'Role', 'Department', 'BaseTokens', 'PhotoFileName', 'Status', 'auction_order']
+
+def write_delta_sql(sql_file, players_df, new_ids, changed_ids):
+    """INSERT new auction players and UPDATE changed ones"""
+    new_rows = players_df[players_df['PlayerID'].isin(new_ids)]
+    changed_rows = players_df[players_df['PlayerID'].isin(changed_ids)]
+    
+    with open(sql_file, 'w', encoding='utf-8') as f:
+        f.write("-- CPL Auction 2025 - Incremental Player Delta\n")
+        f.write("-- Only registrations added or changed since the last ingest\n\n")
+        
+        f.write(f"-- New players: {len(new_rows)}\n")
+        write_insert(f, 'players', PLAYER_INSERT_COLUMNS, frame_rows(new_rows.assign(Status='Available'), PLAYER_INSERT_FIELDS))
+        f.write("\n")
+        
+        f.write(f"-- Changed players: {len(changed_rows)}\n")
+        write_bulk_update(
+            f, 'players', 'player_id', ['name', 'role', 'department', 'base_tokens', 'photo_filename'],
+            frame_rows(changed_rows, ['PlayerID', 'Name', 'Role', 'Department', 'BaseTokens', 'PhotoFileName']),
+            casts={'base_tokens': 'integer'}
+        )
+
+def process_cpl_registrations(incremental=False, num_teams=8):
     """Main processing function"""
     
     print("🏏 CPL Registration Data Processor")
@@ -97,76 +262,58 @@ def process_cpl_registrations():
     
     try:
         # Read the Excel file
-        xls = pd.ExcelFile(input_file)
-        print(f"📊 Found sheets: {xls.sheet_names}")
+        print(f"📊 Found sheets: {workbook_cache.sheet_names(input_file)}")
         print()
         
         # 1. Process PLAYERS tab (for auction)
         print("👥 Processing PLAYERS tab...")
-        players_df = pd.read_excel(input_file, sheet_name='PLAYERS')
+        players_df = workbook_cache.read_excel(input_file, sheet_name='PLAYERS')
         print(f"   Loaded {len(players_df)} players for auction")
         
         # Clean and process players
-        players_processed = []
-        for idx, row in players_df.iterrows():
-            # Map role to category
-            role = map_role_to_category(row['Preferred Role'], row.get('Secondary Role (if any)'))
-            
-            # Generate player data
-            player_data = {
-                'PlayerID': generate_player_id(row['Name'], row['Employee ID']),
-                'Name': row['Name'].strip(),
-                'Role': role,
-                'BaseTokens': calculate_base_tokens(role, is_captain=False),
-                'PhotoFileName': generate_photo_filename(row['Name']),
-                'Department': {
-                    'Batsman': 'Batting',
-                    'Bowler': 'Bowling',
-                    'All-rounder': 'All-rounder',
-                    'WicketKeeper': 'Wicket Keeping'
-                }[role],
-                'EmployeeID': row['Employee ID'],
-                'ContactNumber': row['Contact Number'],
-                'PreferredRole': row['Preferred Role'],
-                'SecondaryRole': row.get('Secondary Role (if any)', '')
-            }
-            players_processed.append(player_data)
-        
-        players_auction_df = pd.DataFrame(players_processed)
+        players_auction_df = normalize_registrations(players_df)
         
         # 2. Process CAPTAINS tab (for direct assignment)
         print("👑 Processing CAPTAINS tab...")
-        captains_df = pd.read_excel(input_file, sheet_name='CAPTAINS')
+        captains_df = workbook_cache.read_excel(input_file, sheet_name='CAPTAINS')
         print(f"   Loaded {len(captains_df)} captains")
         
         # Clean and process captains
-        captains_processed = []
-        for idx, row in captains_df.iterrows():
-            # Map role to category
-            role = map_role_to_category(row['Preferred Role'], row.get('Secondary Role (if any)'))
+        captains_assignment_df = normalize_registrations(captains_df, is_captain=True)
+        
+        # Someone registered twice (or as both player and captain) is flagged for review, not dropped
+        print()
+        registrations = pd.concat([sheet.assign(Sheet=name, Row=np.arange(len(sheet)) + 2)
+                                   for name, sheet in [('PLAYERS', players_df), ('CAPTAINS', captains_df)]],
+                                  ignore_index=True)
+        duplicates = find_duplicates(registrations)
+        print_duplicate_report(duplicates)
+        if not duplicates.clusters.empty:
+            review_file = Path('registration_duplicates.xlsx')
+            write_review_workbook(duplicates, review_file)
+            print(f"   Review the clusters in {review_file} before the auction")
+        
+        if incremental:
+            ingest_state = load_ingest_state()
+            delta = {}
+            for sheet_name, raw_df, normalized_df in [('PLAYERS', players_df, players_auction_df),
+                                                      ('CAPTAINS', captains_df, captains_assignment_df)]:
+                delta[sheet_name] = diff_registrations(
+                    normalized_df, registration_fingerprints(raw_df), ingest_state.get(sheet_name, {})
+                )
+            
+            print()
+            print("🔁 INCREMENTAL INGEST")
+            print("=" * 70)
+            for sheet_name, (new_ids, changed_ids, removed_ids, _) in delta.items():
+                print(f"   {sheet_name}: {len(new_ids)} new, {len(changed_ids)} changed, {len(removed_ids)} removed")
+                for player_id in removed_ids:
+                    print(f"      ⚠️  {player_id} no longer registered (not deleted automatically)")
             
-            # Generate captain data
-            captain_data = {
-                'PlayerID': generate_player_id(row['Name'], row['Employee ID']),
-                'Name': row['Name'].strip(),
-                'Role': role,
-                'BaseTokens': calculate_base_tokens(role, is_captain=True),
-                'PhotoFileName': generate_photo_filename(row['Name']),
-                'Department': {
-                    'Batsman': 'Batting',
-                    'Bowler': 'Bowling',
-                    'All-rounder': 'All-rounder',
-                    'WicketKeeper': 'Wicket Keeping'
-                }[role],
-                'EmployeeID': row['Employee ID'],
-                'ContactNumber': row['Contact Number'],
-                'PreferredRole': row['Preferred Role'],
-                'SecondaryRole': row.get('Secondary Role (if any)', ''),
-                'IsCaptain': True
-            }
-            captains_processed.append(captain_data)
-        
-        captains_assignment_df = pd.DataFrame(captains_processed)
+            if not any(new_ids or changed_ids for new_ids, changed_ids, _, _ in delta.values()):
+                print()
+                print("✅ No new or changed registrations since the last ingest - nothing to regenerate")
+                return True
         
         # 3. Generate role distribution report
         print()
@@ -187,17 +334,17 @@ def process_cpl_registrations():
         
         output_file = Path('assets/CPL_Auction_Data_2025.xlsx')
         
-        with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
+        with WorkbookWriter(output_file) as writer:
             # Players sheet (for auction)
             auction_columns = ['PlayerID', 'Name', 'Role', 'BaseTokens', 'PhotoFileName', 'Department']
-            players_auction_df[auction_columns].to_excel(writer, sheet_name='Players', index=False)
+            writer.write_frame('Players', players_auction_df[auction_columns], validations={'Role': ROLE_ORDER})
             
             # Captains sheet (for reference and team assignment)
-            captains_assignment_df.to_excel(writer, sheet_name='Captains', index=False)
+            writer.write_frame('Captains', captains_assignment_df)
             
             # Full data sheet (with all details)
             all_players = pd.concat([players_auction_df, captains_assignment_df], ignore_index=True)
-            all_players.to_excel(writer, sheet_name='Complete_Data', index=False)
+            writer.write_frame('Complete_Data', all_players)
         
         print(f"✅ Created: {output_file}")
         
@@ -219,18 +366,9 @@ def process_cpl_registrations():
             players_auction_df['auction_order'] = players_auction_df['Role'].map(role_order) * 1000 + players_auction_df.index
             players_auction_df = players_auction_df.sort_values('auction_order')
             
-            f.write("INSERT INTO players (player_id, name, role, department, base_tokens, photo_filename, status, auction_order) VALUES\n")
-            
-            values = []
-            for _, row in players_auction_df.iterrows():
-                clean_name = row['Name'].replace("'", "''")
-                values.append(
-                    f"('{row['PlayerID']}', '{clean_name}', '{row['Role']}', '{row['Department']}', "
-                    f"{row['BaseTokens']}, '{row['PhotoFileName']}', 'Available', {row['auction_order']})"
-                )
-            
-            f.write(',\n'.join(values))
-            f.write(';\n\n')
+            write_insert(f, 'players', PLAYER_INSERT_COLUMNS,
+                         frame_rows(players_auction_df.assign(Status='Available'), PLAYER_INSERT_FIELDS))
+            f.write('\n')
             
             f.write("-- =====================================================\n")
             f.write("-- CAPTAINS (23 captains - for direct team assignment)\n")
@@ -248,13 +386,36 @@ def process_cpl_registrations():
         
         print(f"✅ Created: {sql_file}")
         
+        if incremental:
+            print()
+            print("📝 Generating delta outputs...")
+            
+            players_new, players_changed = delta['PLAYERS'][0], delta['PLAYERS'][1]
+            captains_new, captains_changed = delta['CAPTAINS'][0], delta['CAPTAINS'][1]
+            
+            delta_file = Path('assets/CPL_Auction_Data_2025_delta.xlsx')
+            with WorkbookWriter(delta_file) as writer:
+                auction_columns = ['PlayerID', 'Name', 'Role', 'BaseTokens', 'PhotoFileName', 'Department']
+                writer.write_frame('New_Players',
+                                   players_auction_df[players_auction_df['PlayerID'].isin(players_new)][auction_columns])
+                writer.write_frame('Changed_Players',
+                                   players_auction_df[players_auction_df['PlayerID'].isin(players_changed)][auction_columns])
+                writer.write_frame('Captains_Delta',
+                                   captains_assignment_df[captains_assignment_df['PlayerID'].isin(captains_new + captains_changed)])
+            print(f"✅ Created: {delta_file}")
+            
+            delta_sql_file = Path('cpl_auction_2025_delta.sql')
+            write_delta_sql(delta_sql_file, players_auction_df, players_new, players_changed)
+            print(f"✅ Created: {delta_sql_file}")
+        
         # 6. Generate captain assignment template
         print()
         print("📋 Generating captain assignment template...")
         
-        # Create team assignment template
-        num_teams = 8  # Adjust based on your needs
-        captains_per_team = len(captains_assignment_df) // num_teams
+        # Create team assignment template, with captains balanced across teams by tokens and role
+        balance = balance_captains(captains_assignment_df, num_teams=num_teams)
+        print_balance_report(balance)
+        leaders = balance.assignments
         
         assignment_file = Path('captain_team_assignments.xlsx')
         
@@ -264,8 +425,8 @@ def process_cpl_registrations():
             teams_data.append({
                 'TeamID': f'CPL_T{i+1:02d}',
                 'TeamName': f'Team {i+1}',
-                'Captain': '',
-                'ViceCaptain': '',
+                'Captain': leaders.at[i, 'Captain'],
+                'ViceCaptain': leaders.at[i, 'ViceCaptain'],
                 'LogoFile': f'team{i+1}_logo.png',
                 'TokensLeft': 1200,
                 'MaxTokens': 1200,
@@ -274,11 +435,9 @@ def process_cpl_registrations():
         
         teams_df = pd.DataFrame(teams_data)
         
-        with pd.ExcelWriter(assignment_file, engine='openpyxl') as writer:
-            teams_df.to_excel(writer, sheet_name='Teams', index=False)
-            captains_assignment_df[['Name', 'Role', 'BaseTokens', 'EmployeeID']].to_excel(
-                writer, sheet_name='Available_Captains', index=False
-            )
+        with WorkbookWriter(assignment_file) as writer:
+            writer.write_frame('Teams', teams_df)
+            writer.write_frame('Available_Captains', captains_assignment_df[['Name', 'Role', 'BaseTokens', 'EmployeeID']])
         
         print(f"✅ Created: {assignment_file}")
         
@@ -309,13 +468,19 @@ def process_cpl_registrations():
         print("🎯 NEXT STEPS:")
         print("=" * 70)
         print("1. Review the generated Excel file: CPL_Auction_Data_2025.xlsx")
-        print("2. Assign captains to teams using: captain_team_assignments.xlsx")
+        print("2. Review the suggested captains in: captain_team_assignments.xlsx")
         print("3. Upload player photos to assets/images/ folder")
         print("4. Run SQL script to insert players into Supabase")
         print("5. Load the auction data in your app")
         print()
         print("🎉 Processing completed successfully!")
         
+        if incremental:
+            ingest_state = {sheet_name: current for sheet_name, (_, _, _, current) in delta.items()}
+            save_ingest_state(ingest_state)
+            print(f"💾 Saved ingest state: {INGEST_STATE_FILE}")
+            print()
+        
         return True
         
     except Exception as e:
@@ -325,7 +490,13 @@ def process_cpl_registrations():
         return False
 
 if __name__ == "__main__":
-    success = process_cpl_registrations()
+    parser = argparse.ArgumentParser(description="Process CPL registrations into auction data")
+    parser.add_argument('--incremental', action='store_true',
+                        help="only emit delta outputs for registrations added or changed since the last run")
+    parser.add_argument('--teams', type=int, default=8, help="number of teams to assign captains to")
+    args = parser.parse_args()
+    
+    success = process_cpl_registrations(incremental=args.incremental, num_teams=args.teams)
     if not success:
         print("\n❌ Processing failed. Please check the errors above.")
         exit(1)
\ No newline at end of file
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Duplicate-registration detection with blocking
+The registrations workbook often has the same person twice (a typo'd
+name, a phone number with or without the country code). Comparing every
+pair is quadratic, so rows are first grouped into blocks that share a
+normalized key: the Employee ID, the last digits of the phone number, or
+a name-token key (the 4-letter prefix of each token, and of each pair of
+tokens). Only rows in the same block are scored, with the Dice
+coefficient of their name trigrams plus the exact ID/phone matches, and
+the accepted pairs are joined into clusters with union-find for review.
+Blocks larger than MAX_BLOCK_SIZE (a common first name) are too
+unspecific to be worth scoring and are skipped, which keeps the work
+near-linear in the number of rows.
+
+    result = find_duplicates(registrations_df)
+    print_duplicate_report(result)
+    write_review_workbook(result, 'data/registration_duplicates.xlsx')
+"""
+
+from collections import namedtuple
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+from name_matcher import name_trigrams, normalize_name
+
+DedupResult = namedtuple('DedupResult', ['pairs', 'clusters', 'stats'])
+
+# First present column of each list is used; a missing key column only disables that block key
+KEY_COLUMNS = {
+    'name': ['Name', 'Full Name'],
+    'employee': ['EmployeeID', 'Employee ID'],
+    'phone': ['ContactNumber', 'Contact Number'],
+}
+
+DEFAULT_THRESHOLD = 0.8
+# Two colleagues can share a name but not an Employee ID: differing IDs need a shared phone to reach the threshold
+EMPLOYEE_MISMATCH = 0.75
+MAX_BLOCK_SIZE = 100
+NAME_PREFIX = 4
+# Enough to drop a country code or trunk prefix; shorter numbers are not used as a key
+PHONE_DIGITS = 9
+
+_EXCEL_FLOAT = r'\.0$'
+
+
+def _column(df, kind):
+    return next((column for column in KEY_COLUMNS[kind] if column in df.columns), None)
+
+
+def _clean_text(values):
+    """Cells as stripped strings with Excel's '1234.0' float rendering undone, missing as NaN"""
+    text = values.astype(str).str.strip().str.replace(_EXCEL_FLOAT, '', regex=True)
+    return text.where(values.notna())
+
+
+def employee_keys(values):
+    """Employee IDs uppercased, without punctuation or leading zeros"""
+    keys = _clean_text(values).str.upper().str.replace(r'[^A-Z0-9]', '', regex=True).str.lstrip('0')
+    return keys.where(keys != '')
+
+
+def phone_keys(values, digits=PHONE_DIGITS):
+    """The last `digits` digits of each phone number (NaN when it has fewer)"""
+    numbers = _clean_text(values).str.replace(r'\D', '', regex=True)
+    return numbers.str[-digits:].where(numbers.str.len() >= digits)
+
+
+def name_keys(normalized_names, prefix=NAME_PREFIX):
+    """
+    Long frame of (row, key) name blocking keys: the prefix of each token
+    and of each sorted pair of tokens. A typo or a reordered name still
+    shares most of these keys with the original.
+    """
+    rows, keys = [], []
+    for row, name in enumerate(normalized_names):
+        prefixes = sorted({token[:prefix] for token in name.split() if len(token) > 1})
+        for key in prefixes + [f"{first} {second}" for first, second in combinations(prefixes, 2)]:
+            rows.append(row)
+            keys.append(key)
+    return pd.DataFrame({'row': np.array(rows, dtype=np.int64), 'key': keys})
+
+
+def _block_pairs(blocks, max_block_size):
+    """
+    (left, right) row pairs within each block, left < right, plus the
+    number of blocks dropped for being larger than max_block_size
+    """
+    blocks = blocks.dropna().drop_duplicates()
+    sizes = blocks.groupby('key')['row'].transform('size')
+    oversized = blocks.loc[sizes > max_block_size, 'key'].nunique()
+    blocks = blocks[(sizes > 1) & (sizes <= max_block_size)]
+    pairs = blocks.merge(blocks, on='key', suffixes=('_left', '_right'))
+    pairs = pairs[pairs['row_left'] < pairs['row_right']]
+    return pairs[['row_left', 'row_right']], oversized
+
+
+def _clusters(pairs, rows):
+    """Cluster number (0, 1, ...) of every row in a pair, by union-find with path halving"""
+    pairs = list(pairs)
+    parent = list(range(rows))
+
+    def root(node):
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    for left, right in pairs:
+        left_root, right_root = root(left), root(right)
+        if left_root != right_root:
+            parent[max(left_root, right_root)] = min(left_root, right_root)
+
+    members = {}
+    for row in sorted({row for pair in pairs for row in pair}):
+        members.setdefault(root(row), []).append(row)
+    return {row: number for number, group in enumerate(members.values()) for row in group}
+
+
+def find_duplicates(df, threshold=DEFAULT_THRESHOLD, max_block_size=MAX_BLOCK_SIZE):
+    """
+    Likely duplicate registrations in df (one row per registration).
+
+    A candidate pair scores the name trigram Dice coefficient, scaled by
+    EMPLOYEE_MISMATCH when both rows have different Employee IDs; a shared
+    phone number then lifts it to (1 + score) / 2 and a shared Employee ID
+    sets it to 1.0. Pairs scoring >= threshold are duplicates.
+
+    Returns DedupResult(pairs, clusters, stats):
+    pairs    - Left, Right (positions in df), Score, NameScore, SameEmployeeID, SamePhone
+    clusters - the rows of df in a duplicate cluster, with ClusterID and ClusterSize in front
+    stats    - rows, candidate_pairs, all_pairs, oversized_blocks, duplicate_pairs, clusters
+    """
+    df = df.reset_index(drop=True)
+    name_column = _column(df, 'name')
+    names = df[name_column].map(lambda name: '' if pd.isna(name) else normalize_name(name)).tolist() \
+        if name_column else [''] * len(df)
+
+    blocks = [name_keys(names)]
+    exact = {}
+    for kind, make_keys in [('employee', employee_keys), ('phone', phone_keys)]:
+        column = _column(df, kind)
+        if column:
+            exact[kind] = make_keys(df[column]).to_numpy()
+            # Prefixed so an ID never lands in the same block as an equal-looking name key
+            blocks.append(pd.DataFrame({'row': np.arange(len(df)), 'key': kind + ':' + pd.Series(exact[kind])}))
+
+    candidates, oversized = _block_pairs(pd.concat(blocks, ignore_index=True), max_block_size)
+    candidates = candidates.drop_duplicates()
+    left = candidates['row_left'].to_numpy()
+    right = candidates['row_right'].to_numpy()
+
+    # Most rows are in no candidate pair, so only those that are get their trigram set built
+    grams = {row: name_trigrams(names[row]) for row in np.union1d(left, right).tolist()}
+    name_score = np.fromiter(
+        (2.0 * len(grams[a] & grams[b]) / (len(grams[a]) + len(grams[b])) if grams[a] and grams[b] else 0.0
+         for a, b in zip(left.tolist(), right.tolist())),
+        dtype=float, count=len(left))
+
+    def compare(kind):
+        """(same, different) masks of the pairs where both rows have the key"""
+        if kind not in exact:
+            return np.zeros(len(left), dtype=bool), np.zeros(len(left), dtype=bool)
+        keys = exact[kind]
+        both = pd.notna(keys[left]) & pd.notna(keys[right])
+        equal = keys[left] == keys[right]
+        return both & equal, both & ~equal
+
+    same_employee, other_employee = compare('employee')
+    same_phone, _ = compare('phone')
+    score = np.where(other_employee, name_score * EMPLOYEE_MISMATCH, name_score)
+    score = np.where(same_phone, (1.0 + score) / 2, score)
+    score = np.where(same_employee, 1.0, score)
+
+    pairs = pd.DataFrame({
+        'Left': left, 'Right': right, 'Score': score.round(4), 'NameScore': name_score.round(4),
+        'SameEmployeeID': same_employee, 'SamePhone': same_phone,
+    })
+    pairs = pairs[pairs['Score'] >= threshold].sort_values(['Left', 'Right']).reset_index(drop=True)
+
+    cluster_of = _clusters(zip(pairs['Left'].tolist(), pairs['Right'].tolist()), len(df))
+    clusters = df.iloc[sorted(cluster_of, key=lambda row: (cluster_of[row], row))].copy()
+    cluster_ids = np.array([cluster_of[row] + 1 for row in clusters.index], dtype=np.int64)
+    clusters.insert(0, 'ClusterSize', np.bincount(cluster_ids)[cluster_ids])
+    clusters.insert(0, 'ClusterID', cluster_ids)
+
+    stats = {
+        'rows': len(df),
+        'candidate_pairs': len(candidates),
+        'all_pairs': len(df) * (len(df) - 1) // 2,
+        'oversized_blocks': int(oversized),
+        'duplicate_pairs': len(pairs),
+        'clusters': len(set(cluster_of.values())),
+    }
+    return DedupResult(pairs, clusters, stats)
+
+
+def print_duplicate_report(result, limit=10, columns=None):
+    """Counts, then the first `limit` clusters with their rows"""
+    stats = result.stats
+    print("👯 DUPLICATE REGISTRATIONS")
+    print("=" * 70)
+    print(f"   Rows: {stats['rows']:,}  candidate pairs: {stats['candidate_pairs']:,} "
+          f"(of {stats['all_pairs']:,})  skipped blocks: {stats['oversized_blocks']}")
+    if result.clusters.empty:
+        print("✅ No duplicate registrations found")
+        return
+    print(f"⚠️  {stats['clusters']} cluster(s) covering {len(result.clusters)} registrations:")
+    shown = columns or [column for column in ['Sheet', 'Row', 'Name', 'EmployeeID', 'Employee ID',
+                                              'ContactNumber', 'Contact Number'] if column in result.clusters]
+    for cluster_id, group in list(result.clusters.groupby('ClusterID', sort=True))[:limit]:
+        print(f"   Cluster {cluster_id}:")
+        for values in group[shown].itertuples(index=False, name=None):
+            print("      " + " | ".join('' if pd.isna(value) else str(value) for value in values))
+    if stats['clusters'] > limit:
+        print(f"   ... and {stats['clusters'] - limit} more")
+
+
+def write_review_workbook(result, path):
+    """Clusters and scored pairs, one sheet each, for someone to confirm or merge"""
+    from workbook_writer import WorkbookWriter
+
+    with WorkbookWriter(path) as writer:
+        writer.write_frame('Clusters', result.clusters)
+        writer.write_frame('Pairs', result.pairs)
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description='Find duplicate registrations in a registrations workbook')
+    parser.add_argument('workbook', nargs='?', default='data/Colruyt Premier League Registrations 2025.xlsx')
+    parser.add_argument('--sheets', nargs='+', default=['PLAYERS', 'CAPTAINS'],
+                        help='Sheets checked together (a person may be in both)')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument('--output', help='Write the clusters and pairs to this .xlsx for review')
+    args = parser.parse_args()
+
+    sheets = pd.read_excel(args.workbook, sheet_name=args.sheets)
+    registrations = pd.concat([sheet.assign(Sheet=name, Row=np.arange(len(sheet)) + 2)
+                               for name, sheet in sheets.items()], ignore_index=True)
+    start = time.perf_counter()
+    result = find_duplicates(registrations, threshold=args.threshold)
+    elapsed = time.perf_counter() - start
+    print_duplicate_report(result)
+    print(f"⏱️  Checked in {elapsed * 1000:.1f} ms")
+    if args.output:
+        write_review_workbook(result, args.output)
+        print(f"✅ Created: {args.output}")
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Versioned, on-demand exports of the auction results
+An export is a set of named sheets (the flat table first) built by a
+callable only when someone asks for a file. CSV and Parquet hold the first
+sheet; XLSX holds all of them (for the results: every sale, then one sheet
+per team squad). Built files are kept per (dataset, format) together with
+the ledger version (number of lots recorded) they were built at, so reruns
+and repeated downloads reuse the bytes until the next sale or unsold lot.
+
+    exports = ResultExports()
+    data = exports.cached('results', 'xlsx', len(ledger))
+    if data is None:
+        data = exports.build('results', 'xlsx', len(ledger), lambda: results_sheets(history, teams))
+
+Parquet needs pyarrow (or fastparquet); without it build() raises ImportError.
+"""
+
+import io
+import re
+import tempfile
+from collections import namedtuple
+from pathlib import Path
+
+import pandas as pd
+
+ExportFormat = namedtuple('ExportFormat', ['label', 'extension', 'mime'])
+
+EXPORT_FORMATS = {
+    'csv': ExportFormat('CSV', 'csv', 'text/csv'),
+    'xlsx': ExportFormat('Excel (sheet per team)', 'xlsx',
+                         'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+    'parquet': ExportFormat('Parquet', 'parquet', 'application/vnd.apache.parquet'),
+}
+
+# Excel limits sheet names to 31 characters without []:*?/\
+MAX_SHEET_NAME = 31
+_SHEET_NAME_RE = re.compile(r'[\[\]:*?/\\]')
+
+
+def results_sheets(auction_history, teams):
+    """{'Results': every sale, <team>: that team's squad, ...} for the results export"""
+    sheets = {'Results': pd.DataFrame(auction_history)}
+    for team_name, team in teams.items():
+        sheets[team_name] = pd.DataFrame(team['squad'])
+    return sheets
+
+
+def unsold_sheets(unsold_players):
+    return {'Unsold': pd.DataFrame(unsold_players)}
+
+
+def sheet_names(names):
+    """Valid, unique Excel sheet names for `names`, in order"""
+    used = set()
+    titles = []
+    for name in names:
+        base = _SHEET_NAME_RE.sub('_', str(name)).strip("' ")[:MAX_SHEET_NAME] or 'Sheet'
+        title, number = base, 1
+        while title.lower() in used:
+            number += 1
+            suffix = f" ({number})"
+            title = base[:MAX_SHEET_NAME - len(suffix)] + suffix
+        used.add(title.lower())
+        titles.append(title)
+    return titles
+
+
+def to_csv(sheets):
+    return next(iter(sheets.values())).to_csv(index=False).encode('utf-8')
+
+
+def to_parquet(sheets):
+    buffer = io.BytesIO()
+    # Object columns can mix str and int (PlayerID); Parquet needs one type per column
+    frame = next(iter(sheets.values()))
+    mixed = [column for column in frame.columns
+             if frame[column].dtype == object and frame[column].map(type).nunique() > 1]
+    frame.astype({column: str for column in mixed}).to_parquet(buffer, index=False)
+    return buffer.getvalue()
+
+
+def to_xlsx(sheets):
+    from workbook_writer import WorkbookWriter
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = Path(tmp_dir) / 'export.xlsx'
+        with WorkbookWriter(path) as writer:
+            for title, frame in zip(sheet_names(sheets), sheets.values()):
+                writer.write_frame(title, frame)
+        return path.read_bytes()
+
+
+BUILDERS = {'csv': to_csv, 'xlsx': to_xlsx, 'parquet': to_parquet}
+
+
+class ResultExports:
+    """Built export files keyed by (dataset, format), each valid for the ledger version it was built at"""
+
+    def __init__(self):
+        self._files = {}
+        self.builds = 0
+
+    def cached(self, dataset, fmt, version):
+        """Bytes built at this version, or None"""
+        entry = self._files.get((dataset, fmt))
+        if entry is not None and entry[0] == version:
+            return entry[1]
+        return None
+
+    def build(self, dataset, fmt, version, make_sheets):
+        """Build (or reuse) the file; make_sheets() -> {sheet name: DataFrame} is only called on a rebuild"""
+        data = self.cached(dataset, fmt, version)
+        if data is None:
+            data = BUILDERS[fmt](make_sheets())
+            self._files[(dataset, fmt)] = (version, data)
+            self.builds += 1
+        return data
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Pre-load validation of the Players and Teams sheets
+Every rule is a column-wise check over the whole frame (isna, duplicated,
+isin, to_numeric), so a 100k-row sheet is validated in one pass in
+milliseconds. Failures are collected into a ValidationReport of Issues
+with the spreadsheet row number (header = row 1), instead of stopping at
+the first problem, and split into errors (the auction cannot run: unknown
+roles, duplicate IDs, bad tokens) and warnings (missing photos or logos).
+Used by cplbidding.py when loading Cpl_data.xlsx and by
+generate_sql_from_players_excel.py before writing SQL.
+
+    report = validate_sheets(players_df, teams_df, photo_index)
+    if not report.ok:
+        print_validation_report(report)
+"""
+
+import re
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from photo_index import legacy_photo_stem
+from player_schema import ROLE_ORDER, STATUS_ORDER
+
+# row is the spreadsheet row (None for sheet-level issues such as a missing column)
+Issue = namedtuple('Issue', ['sheet', 'row', 'column', 'rule', 'severity', 'message', 'value'])
+
+REQUIRED_PLAYER_COLUMNS = ['PlayerID', 'Name', 'Role', 'BaseTokens']
+REQUIRED_TEAM_COLUMNS = ['TeamID', 'TeamName', 'LogoFile']
+
+ERROR = 'error'
+WARNING = 'warning'
+
+_DIRECTORY_PREFIX = re.compile(r'^.*[\\/]')
+_EXTENSION = re.compile(r'\.[^.]*$')
+
+
+class ValidationReport:
+    """Issues found in one validation run, errors first"""
+
+    def __init__(self, issues):
+        self.issues = sorted(issues, key=lambda issue: (issue.severity != ERROR, issue.sheet,
+                                                        issue.row or 0, issue.rule))
+
+    def __len__(self):
+        return len(self.issues)
+
+    @property
+    def errors(self):
+        return [issue for issue in self.issues if issue.severity == ERROR]
+
+    @property
+    def warnings(self):
+        return [issue for issue in self.issues if issue.severity == WARNING]
+
+    @property
+    def ok(self):
+        """True when nothing blocks loading (warnings allowed)"""
+        return not self.errors
+
+    def counts(self):
+        """{(sheet, rule): number of issues}"""
+        counts = {}
+        for issue in self.issues:
+            counts[(issue.sheet, issue.rule)] = counts.get((issue.sheet, issue.rule), 0) + 1
+        return counts
+
+    def to_frame(self):
+        return pd.DataFrame(self.issues, columns=Issue._fields)
+
+
+def _rows(mask):
+    """Spreadsheet row numbers of the True positions of a boolean mask"""
+    return np.flatnonzero(np.asarray(mask)) + 2
+
+
+def _issues(sheet, df, mask, column, rule, severity, message):
+    """One Issue per flagged row; message is formatted with the cell value"""
+    mask = np.asarray(mask, dtype=bool)
+    values = df[column].to_numpy()[mask] if column in df.columns else [None] * int(mask.sum())
+    return [Issue(sheet, int(row), column, rule, severity,
+                  message.format(value='' if pd.isna(value) else value), value)
+            for row, value in zip(_rows(mask), values)]
+
+
+def _text(values):
+    """Values as stripped strings, missing values kept missing"""
+    return values.astype(str).str.strip().where(values.notna())
+
+
+def _missing_columns(sheet, df, required):
+    return [Issue(sheet, None, column, 'missing_column', ERROR, f"Column '{column}' is missing", None)
+            for column in required if column not in df.columns]
+
+
+def _member(keys, index):
+    """Boolean array: which keys are in a (unique) Index"""
+    return index.get_indexer(keys) >= 0
+
+
+def _photo_found(players_df, photo_index):
+    """
+    Column-wise PhotoIndex.resolve(): PhotoFileName (or its stem), then PlayerID, then the
+    legacy name stem. Each fallback only looks at the rows the earlier ones left unresolved.
+    """
+    filenames, stems = set(photo_index.by_filename), set(photo_index.by_stem)
+    found = np.zeros(len(players_df), dtype=bool)
+
+    def pending(column):
+        """Rows still unresolved with a value in `column`, and those values stripped and lowercased"""
+        rows = np.flatnonzero(~found & players_df[column].notna().to_numpy())
+        # One pass per column; chained .str calls each rescan the whole array for missing values
+        return rows, [str(value).strip().lower() for value in players_df[column].to_numpy()[rows]]
+
+    def parsed_photo_hit(key):
+        key = _DIRECTORY_PREFIX.sub('', key)
+        return key in filenames or _EXTENSION.sub('', key) in stems
+
+    if 'PhotoFileName' in players_df.columns:
+        rows, keys = pending('PhotoFileName')
+        # Plain filenames are the common case; only the rest are parsed for a directory or extension
+        found[rows] = [key in filenames or parsed_photo_hit(key) for key in keys]
+    rows, keys = pending('PlayerID')
+    found[rows] = [key in stems for key in keys]
+    rows, keys = pending('Name')
+    found[rows] = [legacy_photo_stem(key) in stems for key in keys]
+    return found
+
+
+def validate_players(players_df, photo_index=None):
+    """Issues of the Players sheet (row numbers follow the frame's row order as read)"""
+    issues = _missing_columns('Players', players_df, REQUIRED_PLAYER_COLUMNS)
+    present = [column for column in REQUIRED_PLAYER_COLUMNS if column in players_df.columns]
+
+    for column in present:
+        issues += _issues('Players', players_df, players_df[column].isna(), column, 'missing_value', ERROR,
+                          f"{column} is empty")
+
+    if 'PlayerID' in players_df.columns:
+        ids = _text(players_df['PlayerID'])
+        duplicated = ids.duplicated(keep=False) & ids.notna()
+        issues += _issues('Players', players_df, duplicated, 'PlayerID', 'duplicate_player_id', ERROR,
+                          "PlayerID {value} appears more than once")
+
+    if 'Role' in players_df.columns:
+        role = players_df['Role']
+        unknown = ~role.isin(ROLE_ORDER) & role.notna()
+        issues += _issues('Players', players_df, unknown, 'Role', 'unknown_role', ERROR,
+                          "Role '{value}' is not one of " + ', '.join(ROLE_ORDER))
+
+    if 'BaseTokens' in players_df.columns:
+        tokens = players_df['BaseTokens']
+        numeric = pd.to_numeric(tokens, errors='coerce')
+        bad = tokens.notna() & (numeric.isna() | (numeric != numeric.round()) | (numeric < 0))
+        issues += _issues('Players', players_df, bad, 'BaseTokens', 'bad_base_tokens', ERROR,
+                          "BaseTokens '{value}' is not a whole number of tokens")
+
+    if 'Status' in players_df.columns:
+        status = players_df['Status']
+        unknown = ~status.isin(STATUS_ORDER) & status.notna()
+        issues += _issues('Players', players_df, unknown, 'Status', 'unknown_status', WARNING,
+                          "Status '{value}' is not one of " + ', '.join(STATUS_ORDER))
+
+    if photo_index is not None and {'PlayerID', 'Name'} <= set(players_df.columns):
+        issues += _issues('Players', players_df, ~_photo_found(players_df, photo_index), 'PhotoFileName',
+                          'missing_photo', WARNING, "No photo found (PhotoFileName '{value}')")
+
+    return issues
+
+
+def validate_teams(teams_df, photo_index=None):
+    """Issues of the Teams sheet"""
+    issues = _missing_columns('Teams', teams_df, REQUIRED_TEAM_COLUMNS)
+
+    for column in ['TeamID', 'TeamName']:
+        if column not in teams_df.columns:
+            continue
+        issues += _issues('Teams', teams_df, teams_df[column].isna(), column, 'missing_value', ERROR,
+                          f"{column} is empty")
+        # Team names are matched case-insensitively by the bulk import, so compare them that way
+        values = _text(teams_df[column]).str.casefold()
+        duplicated = values.duplicated(keep=False) & values.notna()
+        issues += _issues('Teams', teams_df, duplicated, column, f"duplicate_{column.lower()}", ERROR,
+                          f"{column} '{{value}}' appears more than once")
+
+    if photo_index is not None and 'LogoFile' in teams_df.columns:
+        logos = _text(teams_df['LogoFile']).str.lower().str.split(r'[\\/]').str[-1]
+        missing = ~_member(logos, pd.Index(list(photo_index.by_filename)))
+        issues += _issues('Teams', teams_df, missing, 'LogoFile', 'missing_logo', WARNING,
+                          "Logo '{value}' not found")
+
+    return issues
+
+
+def validate_sheets(players_df, teams_df=None, photo_index=None):
+    """ValidationReport for the Players sheet and, if given, the Teams sheet"""
+    issues = validate_players(players_df, photo_index)
+    if teams_df is not None:
+        issues += validate_teams(teams_df, photo_index)
+    return ValidationReport(issues)
+
+
+def print_validation_report(report, limit=20):
+    """Per-rule counts, then the first `limit` issues of each severity"""
+    print("🔍 SHEET VALIDATION")
+    print("=" * 70)
+    if not report.issues:
+        print("✅ All validations passed")
+        return
+    for (sheet, rule), count in report.counts().items():
+        print(f"   {sheet:<8} {rule:<22} {count}")
+    print()
+    for label, icon, issues in [('error', '❌', report.errors), ('warning', '⚠️ ', report.warnings)]:
+        if not issues:
+            continue
+        print(f"{icon} {len(issues)} {label}(s):")
+        for issue in issues[:limit]:
+            where = f"row {issue.row}" if issue.row else "sheet"
+            print(f"   {issue.sheet} {where}: {issue.message}")
+        if len(issues) > limit:
+            print(f"   ... and {len(issues) - limit} more")
+        print()
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    from photo_index import DEFAULT_PHOTO_DIRS, PhotoIndex
+
+    parser = argparse.ArgumentParser(description='Validate the Players and Teams sheets of a workbook')
+    parser.add_argument('workbook', nargs='?', default='assets/Cpl_data.xlsx')
+    parser.add_argument('--dirs', nargs='+', default=[str(directory) for directory in DEFAULT_PHOTO_DIRS],
+                        help='Image directories for the photo/logo checks')
+    args = parser.parse_args()
+
+    sheets = pd.read_excel(args.workbook, sheet_name=None)
+    start = time.perf_counter()
+    report = validate_sheets(sheets['Players'], sheets.get('Teams'), PhotoIndex(args.dirs))
+    elapsed = time.perf_counter() - start
+    print_validation_report(report)
+    print(f"⏱️  Validated in {elapsed * 1000:.1f} ms")
+    raise SystemExit(0 if report.ok else 1)
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Streaming SQL emitter shared by the SQL generator scripts
+Rows are streamed from a DataFrame or any iterator straight to the output
+file as size-bounded multi-row INSERT statements, so memory stays constant
+no matter how many rows are written. Updates are emitted set-based, one
+UPDATE ... FROM (VALUES ...) per chunk instead of one statement per row.
+"""
+
+import math
+import numbers
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_ROWS_PER_STATEMENT = 500
+
+
+def sql_literal(value):
+    """Render a Python/numpy value as a SQL literal"""
+    if isinstance(value, str):
+        return "'" + value.replace("'", "''") + "'"
+    if value is None:
+        return 'NULL'
+    if isinstance(value, (bool, np.bool_)):
+        return 'TRUE' if value else 'FALSE'
+    if isinstance(value, numbers.Integral):
+        return str(int(value))
+    if isinstance(value, numbers.Real):
+        if math.isnan(value):
+            return 'NULL'
+        return repr(float(value))
+    if value is pd.NA or value is pd.NaT:
+        return 'NULL'
+    if isinstance(value, (datetime, date)):
+        return "'" + value.isoformat() + "'"
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def frame_rows(df, columns):
+    """Stream row tuples of the given columns without materializing them"""
+    return df[list(columns)].itertuples(index=False, name=None)
+
+
+def write_insert(f, table, columns, rows, rows_per_statement=DEFAULT_ROWS_PER_STATEMENT):
+    """
+    Write rows as INSERT ... VALUES statements of at most rows_per_statement
+    rows each. `rows` is a DataFrame (its `columns` are used) or an iterable
+    of tuples in column order. Returns the number of rows written.
+    """
+    if isinstance(rows, pd.DataFrame):
+        rows = frame_rows(rows, columns)
+
+    header = f"INSERT INTO {table} ({', '.join(columns)}) VALUES\n"
+    written = 0
+    in_statement = 0
+
+    for row in rows:
+        if in_statement == rows_per_statement:
+            f.write(';\n\n')
+            in_statement = 0
+        f.write(header if in_statement == 0 else ',\n')
+        f.write('(' + ', '.join(sql_literal(value) for value in row) + ')')
+        in_statement += 1
+        written += 1
+
+    if written:
+        f.write(';\n')
+    return written
+
+
+def _chunks(rows, size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def write_bulk_update(f, table, key_column, set_columns, rows, casts=None,
+                      rows_per_statement=DEFAULT_ROWS_PER_STATEMENT):
+    """
+    Write set-based UPDATE ... FROM (VALUES ...) statements, one per chunk of
+    rows_per_statement rows. Row tuples are (key, *set_values); `casts` maps a
+    set column to a SQL type for columns whose VALUES may be all NULL or need
+    an explicit type. Returns the number of rows written.
+    """
+    if isinstance(rows, pd.DataFrame):
+        rows = frame_rows(rows, [key_column, *set_columns])
+    casts = casts or {}
+
+    def source(col):
+        return f"v.{col}::{casts[col]}" if col in casts else f"v.{col}"
+
+    assignments = ', '.join(f"{col} = {source(col)}" for col in set_columns)
+    alias = f"v({', '.join([key_column, *set_columns])})"
+
+    written = 0
+    for chunk in _chunks(rows, rows_per_statement):
+        f.write(f"UPDATE {table} AS t SET {assignments}\nFROM (VALUES\n")
+        f.write(',\n'.join('  (' + ', '.join(sql_literal(value) for value in row) + ')' for row in chunk))
+        f.write(f"\n) AS {alias}\nWHERE t.{key_column} = v.{key_column};\n")
+        written += len(chunk)
+    return written
+
+
+def write_update_where_in(f, table, assignments, key_column, keys,
+                          rows_per_statement=DEFAULT_ROWS_PER_STATEMENT):
+    """
+    Write UPDATE table SET <assignments> WHERE key_column IN (...) for a set of
+    keys that all receive the same values. `assignments` maps column -> value.
+    Returns the number of keys written.
+    """
+    set_clause = ', '.join(f"{col} = {sql_literal(value)}" for col, value in assignments.items())
+
+    written = 0
+    for chunk in _chunks(keys, rows_per_statement):
+        key_list = ', '.join(sql_literal(key) for key in chunk)
+        f.write(f"UPDATE {table} SET {set_clause} WHERE {key_column} IN ({key_list});\n")
+        written += len(chunk)
+    return written
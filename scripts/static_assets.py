@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Precomputed static images for the auction app's first paint
+The CPL banner is a 1.3 MB RGBA PNG that used to be decoded with Pillow on
+every run and then re-encoded by st.image. Here it is converted once into
+a width-capped, optimized PNG (lossless, ~33 KB) under .cache/static_assets,
+keyed by the source's size and modification time, and handed to the page
+as a base64 data: URI, so a warm start neither imports Pillow nor reads
+the original again. Pillow is only imported when an entry is (re)built.
+
+    uri = image_data_uri(IMAGES_DIR / 'cpl.png', width=700)
+    st.markdown(f'<img src="{uri}" width="700">', unsafe_allow_html=True)
+"""
+
+import base64
+from pathlib import Path
+
+CACHE_DIR = Path(__file__).resolve().parent.parent / '.cache' / 'static_assets'
+
+# Bump when the encoding settings change so cached images are rebuilt
+PIPELINE_VERSION = 1
+
+
+def cached_image_path(source, width):
+    """Cache file for a source image at a display width (changes whenever the source does)"""
+    source = Path(source)
+    stat = source.stat()
+    return CACHE_DIR / f"{source.stem}.w{width}.{stat.st_size}-{stat.st_mtime_ns}.v{PIPELINE_VERSION}.png"
+
+
+def build_cached_image(source, width):
+    """Write the optimized PNG for source (at most `width` px wide, aspect kept); returns its path"""
+    from PIL import Image
+
+    path = cached_image_path(source, width)
+    with Image.open(source) as img:
+        img.load()
+        if img.width > width:
+            img = img.resize((width, round(img.height * width / img.width)), Image.LANCZOS)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        for stale in path.parent.glob(f"{Path(source).stem}.w{width}.*.png"):
+            stale.unlink(missing_ok=True)
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        img.save(tmp_path, 'PNG', optimize=True)
+    tmp_path.replace(path)
+    return path
+
+
+def cached_image(source, width):
+    """Bytes of the optimized PNG for source, built on first use; None when the source is missing"""
+    try:
+        path = cached_image_path(source, width)
+    except OSError:
+        return None
+    if not path.exists():
+        path = build_cached_image(source, width)
+    return path.read_bytes()
+
+
+def image_data_uri(source, width):
+    """data:image/png;base64 URI of cached_image(), ready for an <img src>; None when the source is missing"""
+    data = cached_image(source, width)
+    if data is None:
+        return None
+    return 'data:image/png;base64,' + base64.b64encode(data).decode('ascii')
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from photo_sync import format_bytes
+
+    parser = argparse.ArgumentParser(description='Prebuild the cached static images the auction app shows')
+    parser.add_argument('images', nargs='*', default=['assets/images/cpl.png'])
+    parser.add_argument('--width', type=int, default=700, help='Display width in pixels')
+    args = parser.parse_args()
+
+    for image in args.images:
+        path = build_cached_image(image, args.width)
+        print(f"🖼️  {image}: {format_bytes(Path(image).stat().st_size)} -> "
+              f"{format_bytes(path.stat().st_size)} ({path})")
@@ -0,0 +1,68 @@
+"""
+Tests for the checkpointed auction ledger
+Run with: python -m pytest scripts
+"""
+
+import copy
+
+import auction_ledger
+from auction_ledger import AuctionLedger, LedgerState, apply_event
+
+
+def make_teams():
+    return {
+        name: {
+            'id': team_id, 'tokens_left': 1000, 'squad': [], 'max_squad_size': 15,
+            'role_count': {'Batsman': 0, 'Bowler': 0},
+            'category_budgets': {'Batsman': {'spent': 0, 'remaining': 500}, 'Bowler': {'spent': 0, 'remaining': 500}},
+        }
+        for team_id, name in [(1, 'Mavericks'), (2, 'Strikers')]
+    }
+
+
+def player(number):
+    return {'PlayerID': f"P{number}", 'Name': f"Player {number}", 'Role': ['Batsman', 'Bowler'][number % 2],
+            'BaseTokens': 10}
+
+
+def fill(ledger, count):
+    for number in range(count):
+        if number % 5 == 4:
+            ledger.record_unsold(player(number))
+        else:
+            ledger.record_sale(['Mavericks', 'Strikers'][number % 2], player(number), 10 + number)
+
+
+def test_every_point_matches_a_full_replay_from_the_start():
+    teams = make_teams()
+    ledger = AuctionLedger(teams, checkpoint_every=4)
+    fill(ledger, 23)
+    # P4 goes unsold, then is picked up later
+    ledger.record_sale('Mavericks', player(4), 5)
+
+    for n in range(len(ledger) + 1):
+        expected = LedgerState(copy.deepcopy(teams), [])
+        for event in ledger.events[:n]:
+            apply_event(expected, event)
+        assert ledger.state_at(n) == expected
+
+    final = ledger.state_at(len(ledger))
+    assert 'P4' not in [unsold['PlayerID'] for unsold in final.unsold]
+    assert final.teams['Mavericks']['squad'][-1]['BidPrice'] == 5
+    assert teams['Mavericks']['squad'] == []
+
+
+def test_replay_applies_fewer_than_k_events(monkeypatch):
+    ledger = AuctionLedger(make_teams(), checkpoint_every=8)
+    fill(ledger, 100)
+    applied = []
+    real_apply = auction_ledger.apply_event
+    monkeypatch.setattr(auction_ledger, 'apply_event',
+                        lambda state, event: applied.append(event) or real_apply(state, event))
+
+    state = ledger.state_at(37)
+
+    assert [event.number for event in applied] == [33, 34, 35, 36, 37]
+    assert sum(len(team['squad']) for team in state.teams.values()) + len(state.unsold) == 37
+    ledger.state_at(96)
+    assert len(applied) == 5
@@ -0,0 +1,106 @@
+"""
+Tests for the bulk sale import
+Run with: python -m pytest scripts
+"""
+
+import pandas as pd
+
+from bulk_sales import read_results, validate_batch
+
+
+def make_teams():
+    return {
+        name: {
+            'id': team_id, 'tokens_left': 100, 'squad': [], 'max_squad_size': 3,
+            'role_count': {'Batsman': 0, 'Bowler': 0},
+            'category_budgets': {'Batsman': {'spent': 0, 'remaining': 60}, 'Bowler': {'spent': 0, 'remaining': 60}},
+        }
+        for team_id, name in [(1, 'Mavericks'), (2, 'Strikers')]
+    }
+
+
+def check_sale(team, role, price):
+    if team['tokens_left'] < price:
+        return "Insufficient tokens!"
+    if team['category_budgets'][role]['remaining'] < price:
+        return f"Insufficient {role} category budget!"
+    return None
+
+
+PLAYERS = pd.DataFrame({
+    'PlayerID': ['A1', 'B2', 'C3', 1234],
+    'Name': ['Anil', 'Bala', 'Chetan', 'Dev'],
+    'Role': pd.Categorical(['Batsman', 'Batsman', 'Bowler', 'Bowler']),
+    'BaseTokens': [20, 20, 10, 10],
+})
+
+
+def test_reads_csv_and_xlsx_with_header_aliases(tmp_path):
+    csv_path = tmp_path / 'lots.csv'
+    csv_path.write_text("Player ID,Sold To,Sold Price\nA1,Mavericks,40\n,,\n1234, unsold ,\n")
+    xlsx_path = tmp_path / 'lots.xlsx'
+    pd.DataFrame({'PlayerID': ['A1', 1234], 'Team': ['Mavericks', None], 'Price': [40, None]}).to_excel(
+        xlsx_path, index=False)
+
+    rows = read_results(csv_path)
+    assert [tuple(row) for row in rows] == [(2, 'A1', 'Mavericks', '40'), (4, '1234', 'unsold', '')]
+    assert [(row.player_id, row.team) for row in read_results(xlsx_path)] == [('A1', 'Mavericks'), ('1234', '')]
+
+
+def test_reports_every_violation_in_sequence_without_touching_teams(tmp_path):
+    csv_path = tmp_path / 'lots.csv'
+    csv_path.write_text("PlayerID,Team,Price\n"
+                        "A1,mavericks,50\n"     # ok: Batsman budget 60 -> 10
+                        "B2,Mavericks,20\n"     # Batsman budget now exhausted
+                        "A1,Strikers,20\n"      # already sold in this batch
+                        "ZZ,Strikers,20\n"      # unknown player
+                        "C3,Titans,10\n"        # unknown team
+                        "1234,Strikers,5\n")    # below base
+    teams = make_teams()
+
+    plan = validate_batch(read_results(csv_path), PLAYERS, teams, [], check_sale)
+
+    assert [(violation.line, violation.player_id) for violation in plan.violations] == [
+        (3, 'B2'), (4, 'A1'), (5, 'ZZ'), (6, 'C3'), (7, '1234')]
+    assert 'Insufficient Batsman category budget!' in plan.violations[0].message
+    assert 'already sold to Mavericks' in plan.violations[1].message
+    assert teams['Mavericks']['squad'] == []
+
+
+def test_clean_batch_yields_new_teams_history_and_one_set_of_updates(tmp_path):
+    csv_path = tmp_path / 'lots.csv'
+    csv_path.write_text("PlayerID,Team,Price\nC3,,\nA1,Strikers,30\n1234,Mavericks,10\nC3,Strikers,5\n")
+    unsold = [{'PlayerID': 'B2', 'Name': 'Bala', 'Role': 'Batsman', 'BaseTokens': 20}]
+
+    plan = validate_batch(read_results(csv_path), PLAYERS, make_teams(), unsold, check_sale)
+
+    assert plan.violations == []
+    assert [player['PlayerID'] for player in plan.teams['Strikers']['squad']] == ['A1', 'C3']
+    assert plan.teams['Strikers']['tokens_left'] == 65
+    assert plan.teams['Strikers']['category_budgets']['Bowler'] == {'spent': 5, 'remaining': 55}
+    assert [history['SquadSize'] for _, _, _, history in plan.sales] == [1, 1, 2]
+    # C3 went unsold, then sold below base in a re-auction
+    assert plan.unsold == []
+    assert plan.updates == {
+        'C3': {'Status': 'Sold', 'SoldTo': 'Strikers', 'SoldPrice': 5},
+        'A1': {'Status': 'Sold', 'SoldTo': 'Strikers', 'SoldPrice': 30},
+        1234: {'Status': 'Sold', 'SoldTo': 'Mavericks', 'SoldPrice': 10},
+    }
+
+
+def test_player_unsold_again_in_a_later_round_is_listed_once(tmp_path):
+    csv_path = tmp_path / 'lots.csv'
+    csv_path.write_text("PlayerID,Team,Price\nC3,Unsold,\nB2,,\nC3,,\nA1,Mavericks,20\n")
+    unsold = [{'PlayerID': 'B2', 'Name': 'Bala', 'Role': 'Batsman', 'BaseTokens': 20}]
+
+    plan = validate_batch(read_results(csv_path), PLAYERS, make_teams(), unsold, check_sale)
+
+    assert plan.violations == []
+    # Every outcome is an event (for the ledger and the scheduler's rounds); the unsold list gains C3 once
+    assert [(player['PlayerID'], team) for player, team, _ in plan.events] == [
+        ('C3', None), ('B2', None), ('C3', None), ('A1', 'Mavericks')]
+    assert [player['PlayerID'] for player in plan.unsold] == ['C3']
+    assert plan.updates == {
+        'C3': {'Status': 'Unsold'},
+        'A1': {'Status': 'Sold', 'SoldTo': 'Mavericks', 'SoldPrice': 20},
+    }
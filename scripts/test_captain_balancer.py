@@ -0,0 +1,53 @@
+"""
+Tests for the captain/vice-captain balancer
+Run with: python -m pytest scripts
+"""
+
+import random
+
+import pandas as pd
+
+from captain_balancer import _Allocation, balance_captains
+
+
+def test_spreads_roles_and_tokens_and_benches_the_rest():
+    candidates = pd.DataFrame({
+        'Name': ['Keeper A', 'Keeper B', 'Bowler A', 'Bowler B', 'Bat A', 'Bat B', 'Spare'],
+        'Role': ['WicketKeeper', 'WicketKeeper', 'Bowler', 'Bowler', 'Batsman', 'Batsman', 'Batsman'],
+        'BaseTokens': [50, 50, 45, 45, 40, 40, 30],
+        'PlayerID': ['K1', 'K2', 'W1', 'W2', 'B1', 'B2', 'S1'],
+    })
+
+    result = balance_captains(candidates, teams=[('T1', 'Red'), ('T2', 'Blue'), ('T3', 'Green')])
+
+    # Greedy gives every team 90 tokens but both bowlers to Green; spreading them costs a 5-token imbalance
+    assert result.start_objective == 400 and result.objective == 250 and result.moves > 0
+    assert result.role_clashes == 0 and result.token_range == 10
+    tokens = dict(zip(candidates['PlayerID'], candidates['BaseTokens']))
+    for row in result.assignments.itertuples(index=False):
+        assert row.CaptainRole != row.ViceCaptainRole and tokens[row.CaptainID] >= tokens[row.ViceCaptainID]
+    assert result.assignments['TeamName'].tolist() == ['Red', 'Blue', 'Green']
+    assert result.bench['PlayerID'].tolist() == ['S1']
+
+
+def test_swap_deltas_match_the_recomputed_objective():
+    rng = random.Random(3)
+    tokens = [float(rng.randint(20, 80)) for _ in range(40)]
+    roles = [rng.randrange(4) for _ in range(40)]
+    allocation = _Allocation(tokens, roles, 4, [[2 * t, 2 * t + 1] for t in range(12)], role_weight=100.0)
+    bench = list(range(24, 40))
+
+    for _ in range(300):
+        a, b = rng.sample(range(12), 2)
+        x = rng.choice(allocation.teams[a])
+        before = allocation.objective()
+        if rng.random() < 0.5:
+            y = rng.choice(allocation.teams[b])
+            delta = allocation.swap_delta(a, x, b, y)
+            allocation.move(a, x, b, y)
+        else:
+            position = rng.randrange(len(bench))
+            y, bench[position] = bench[position], x
+            delta = allocation.replace_delta(a, x, y)
+            allocation.move(a, x, None, y)
+        assert abs(allocation.objective() - before - delta) < 1e-6
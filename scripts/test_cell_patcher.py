@@ -0,0 +1,69 @@
+"""
+Tests for the in-place cell patcher
+Run with: python -m pytest scripts
+"""
+
+import zipfile
+
+import openpyxl
+import pandas as pd
+from openpyxl.styles import Font
+
+import cell_patcher
+from cell_patcher import patch_cells
+
+
+def make_workbook(path):
+    wb = openpyxl.Workbook()
+    players = wb.active
+    players.title = 'Players'
+    players.append(['PlayerID', 'Name', 'Status', 'SoldPrice'])
+    players.append(['A1', 'Anil', 'Available', None])
+    players.append([1234, 'Bala', 'Available', None])
+    players.append(['C3', 'Chetan', 'Available', None])
+    players['C2'].font = Font(italic=True)
+    wb.create_sheet('Teams').append(['TeamName', 'LogoFile'])
+    wb['Teams'].append(['Mavericks', 'mavericks.png'])
+    wb.save(path)
+
+
+def parts(path):
+    with zipfile.ZipFile(path) as archive:
+        return {name: archive.read(name) for name in archive.namelist()}
+
+
+def test_patches_only_target_cells_and_keeps_other_parts(tmp_path):
+    path = tmp_path / 'book.xlsx'
+    make_workbook(path)
+    before = parts(path)
+
+    report = patch_cells(path, {
+        'C3': {'Status': 'Sold', 'SoldPrice': 60, 'SoldTo': 'Mavericks & <Co>'},
+        '1234': {'Status': 'Unsold'},
+        'ZZ': {'Status': 'Sold'},
+    })
+
+    assert report == (4, 2, ['ZZ'])
+    players = pd.read_excel(path, sheet_name='Players')
+    assert players.columns.tolist() == ['PlayerID', 'Name', 'Status', 'SoldPrice', 'SoldTo']
+    assert players['Status'].tolist() == ['Available', 'Unsold', 'Sold']
+    assert players.loc[2, 'SoldPrice'] == 60 and players.loc[2, 'SoldTo'] == 'Mavericks & <Co>'
+
+    after = parts(path)
+    changed = [name for name in before if before[name] != after[name]]
+    assert changed == ['xl/worksheets/sheet1.xml']
+    assert openpyxl.load_workbook(path)['Players']['C2'].font.i
+
+
+def test_index_is_reused_across_patches(tmp_path, monkeypatch):
+    path = tmp_path / 'book.xlsx'
+    make_workbook(path)
+    builds = []
+    real_build = cell_patcher.build_index
+    monkeypatch.setattr(cell_patcher, 'build_index', lambda *args: builds.append(args) or real_build(*args))
+
+    patch_cells(path, {'A1': {'Status': 'Sold', 'SoldTo': 'Mavericks'}})
+    patch_cells(path, {'C3': {'SoldTo': 'Strikers'}})
+
+    assert len(builds) == 1
+    assert pd.read_excel(path, sheet_name='Players')['SoldTo'].tolist()[::2] == ['Mavericks', 'Strikers']
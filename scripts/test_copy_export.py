@@ -0,0 +1,100 @@
+"""
+Tests for the COPY-format exporter and loader
+Run with: python -m pytest scripts
+The load round trip runs only when CPL_TEST_DSN points at a scratch Postgres.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from copy_export import COPY_TABLES, auction_history_frame, copy_lines, export_tables, load_tables
+
+PLAYERS = pd.DataFrame({
+    'PlayerID': ['A1', 'B2', 'C3'],
+    'Name': ["O'Neil", 'Tab\tName', 'Back\\slash\nNewline'],
+    'Role': ['Batsman', 'Bowler', 'WicketKeeper'],
+    'BaseTokens': [35, 40, 45],
+    'PhotoFileName': ['A1.jpg', np.nan, 'C3.jpg'],
+    'Department': ['Batting', 'Bowling', None],
+    'Status': ['Sold', 'Available', 'Sold'],
+    'SoldTo': ['Mavericks', np.nan, 'Mavericks'],
+    'SoldPrice': [60.0, np.nan, 45.0],
+})
+
+# Column layout of sql/supabase-schema.sql (its sold_to -> teams(team_name)
+# foreign key needs a UNIQUE team_name, so the DDL is restated here)
+SCHEMA = """
+CREATE TABLE teams (id SERIAL PRIMARY KEY, team_id TEXT UNIQUE NOT NULL, team_name TEXT UNIQUE NOT NULL,
+                    logo_file TEXT, tokens_left INTEGER DEFAULT 1000);
+CREATE TABLE players (id SERIAL PRIMARY KEY, player_id TEXT UNIQUE NOT NULL, name TEXT NOT NULL, role TEXT NOT NULL,
+                      base_tokens INTEGER NOT NULL, photo_filename TEXT, department TEXT,
+                      status TEXT DEFAULT 'Available', sold_to TEXT REFERENCES teams(team_name), sold_price INTEGER);
+CREATE TABLE auction_history (id SERIAL PRIMARY KEY, player_id TEXT REFERENCES players(player_id),
+                              team_name TEXT REFERENCES teams(team_name), sold_price INTEGER);
+"""
+TEAMS = pd.DataFrame({'TeamID': ['CPL_T02'], 'TeamName': ['Mavericks'], 'LogoFile': ['Mavericks.png']})
+
+
+def test_copy_lines_escape_and_nulls():
+    lines = copy_lines(PLAYERS, COPY_TABLES['players'])
+    assert lines[0] == "A1\tO'Neil\tBatsman\t35\tA1.jpg\tBatting\tSold\tMavericks\t60"
+    assert lines[1] == 'B2\tTab\\tName\tBowler\t40\t\\N\tBowling\tAvailable\t\\N\t\\N'
+    assert lines[2].startswith('C3\tBack\\\\slash\\nNewline\t')
+
+
+def test_missing_frame_columns_are_null():
+    lines = copy_lines(PLAYERS[['PlayerID', 'Name', 'Role', 'BaseTokens']], COPY_TABLES['players'])
+    assert lines[0].endswith('\t\\N\t\\N\t\\N\t\\N\t\\N')
+
+
+def test_auction_history_from_sold_rows_and_results_csv():
+    from_sheet = auction_history_frame(PLAYERS)
+    assert from_sheet['PlayerID'].tolist() == ['A1', 'C3']
+    assert from_sheet['SoldPrice'].tolist() == [60.0, 45.0]
+
+    results = pd.DataFrame({'Player': ["O'Neil"], 'Team': ['Mavericks'], 'SoldPrice': [70]})
+    from_csv = auction_history_frame(PLAYERS, results)
+    assert from_csv.to_dict('records') == [{'PlayerID': 'A1', 'TeamName': 'Mavericks', 'SoldPrice': 70}]
+
+
+def test_unresolved_and_ambiguous_sales_are_reported_and_skipped(capsys):
+    players = pd.concat([PLAYERS, pd.DataFrame({'PlayerID': ['D4'], 'Name': ["o'neil"], 'Role': ['Bowler'],
+                                                'BaseTokens': [30]})], ignore_index=True)
+    results = pd.DataFrame({'Player': ["O'Neil", 'Nobody Known', 'Tab Name'],
+                            'Team': ['Mavericks'] * 3, 'SoldPrice': [70, 50, 40]})
+
+    history = auction_history_frame(players, results)
+
+    assert history.to_dict('records') == [{'PlayerID': 'B2', 'TeamName': 'Mavericks', 'SoldPrice': 40}]
+    output = capsys.readouterr().out
+    assert "Skipping sale of O'Neil: matches more than one player" in output
+    assert 'Skipping sale of Nobody Known: not found' in output
+
+
+@pytest.mark.skipif(not os.environ.get('CPL_TEST_DSN'), reason='CPL_TEST_DSN not set')
+def test_load_round_trip(tmp_path):
+    psycopg2 = pytest.importorskip('psycopg2')
+
+    export_tables({'teams': TEAMS, 'players': PLAYERS, 'auction_history': auction_history_frame(PLAYERS)}, tmp_path)
+
+    conn = psycopg2.connect(os.environ['CPL_TEST_DSN'])
+    try:
+        with conn.cursor() as cur:
+            cur.execute('CREATE SCHEMA copy_export_test; SET search_path TO copy_export_test')
+            cur.execute(SCHEMA)
+        counts = load_tables(conn, tmp_path)
+        assert counts == {'teams': 1, 'players': 3, 'auction_history': 2}
+
+        with conn.cursor() as cur:
+            cur.execute('SELECT name, photo_filename, sold_price FROM players ORDER BY player_id')
+            assert cur.fetchall() == [("O'Neil", 'A1.jpg', 60), ('Tab\tName', None, None),
+                                      ('Back\\slash\nNewline', 'C3.jpg', 45)]
+    finally:
+        conn.rollback()
+        with conn.cursor() as cur:
+            cur.execute('DROP SCHEMA IF EXISTS copy_export_test CASCADE')
+        conn.commit()
+        conn.close()
@@ -0,0 +1,144 @@
+"""
+Tests for the cplbidding.py database sink
+Run with: CPL_TEST_DSN=postgresql://... python -m pytest scripts
+Each test builds supabase/schema.sql in a throwaway schema of that database.
+"""
+
+import os
+import uuid
+from pathlib import Path
+
+import pytest
+
+pytestmark = pytest.mark.skipif(not os.environ.get('CPL_TEST_DSN'), reason='CPL_TEST_DSN not set')
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def dsn():
+    psycopg2 = pytest.importorskip('psycopg2')
+    schema = f"db_sink_test_{uuid.uuid4().hex[:8]}"
+    ddl = (REPO_DIR / 'supabase' / 'schema.sql').read_text()
+    ddl = ddl.replace('ALTER DATABASE postgres SET "app.jwt_secret"', '-- ALTER DATABASE postgres SET "app.jwt_secret"')
+
+    conn = psycopg2.connect(os.environ['CPL_TEST_DSN'])
+    with conn.cursor() as cur:
+        cur.execute(f"CREATE SCHEMA {schema}; SET search_path TO {schema}")
+        cur.execute(ddl)
+        cur.execute((REPO_DIR / 'sql' / 'fix_foreign_key.sql').read_text())
+        cur.execute((REPO_DIR / 'sql' / 'fix_column_lengths.sql').read_text())
+        cur.execute((REPO_DIR / 'sql' / 'auction_history_event_id.sql').read_text())
+        cur.execute("INSERT INTO teams (team_id, team_name, tokens_left) VALUES ('T1', 'Mavericks', 1000)")
+        cur.execute("INSERT INTO players (player_id, name, role, base_tokens) VALUES "
+                    "('A1', 'Anil', 'Batsman', 35), ('B2', 'Bala', 'Bowler', 40)")
+    conn.commit()
+
+    sep = '&' if '?' in os.environ['CPL_TEST_DSN'] else '?'
+    yield f"{os.environ['CPL_TEST_DSN']}{sep}options=-csearch_path%3D{schema}"
+
+    with conn.cursor() as cur:
+        cur.execute(f"DROP SCHEMA {schema} CASCADE")
+    conn.commit()
+    conn.close()
+
+
+def table_state(dsn):
+    import psycopg2
+
+    with psycopg2.connect(dsn) as conn, conn.cursor() as cur:
+        cur.execute("SELECT player_id, status, sold_to, sold_price FROM players ORDER BY player_id")
+        players = cur.fetchall()
+        cur.execute("SELECT tokens_left FROM teams WHERE team_id = 'T1'")
+        tokens_left = cur.fetchone()[0]
+        cur.execute("SELECT count(*) FROM auction_history")
+        history_rows = cur.fetchone()[0]
+    return players, tokens_left, history_rows
+
+
+def test_sales_are_batched_and_idempotent(dsn):
+    from db_sink import DatabaseSink
+
+    sink = DatabaseSink(dsn, batch_size=10)
+    try:
+        first = sink.record_sale('A1', 'Anil', 'Batsman', 35, 60, 'Mavericks', team_id='T1')
+        sink.record_sale('B2', 'Bala', 'Bowler', 40, 45, 'Mavericks', team_id='T1')
+        # A resend of an already-applied event must not charge the team twice
+        sink.record_sale('A1', 'Anil', 'Batsman', 35, 60, 'Mavericks', team_id='T1', event_id=first)
+        assert sink.flush()
+        metrics = sink.metrics()
+    finally:
+        sink.close()
+
+    assert metrics['pending'] == 0 and metrics['lag_seconds'] == 0.0
+    assert metrics['synced'] == 2 and metrics['duplicates'] == 1 and metrics['failed'] == 0
+    assert table_state(dsn) == ([('A1', 'Sold', 'Mavericks', 60), ('B2', 'Sold', 'Mavericks', 45)], 895, 2)
+
+
+def test_bad_event_does_not_block_the_batch(dsn):
+    from db_sink import DatabaseSink
+
+    sink = DatabaseSink(dsn, batch_size=10)
+    try:
+        sink.record_sale('A1', 'Anil', 'Batsman', 35, 60, 'Mavericks', team_id='T1')
+        sink.record_sale('ZZ', 'Nobody', 'Batsman', 35, 50, 'Mavericks', team_id='NOPE')
+        assert sink.flush()
+        metrics = sink.metrics()
+    finally:
+        sink.close()
+
+    assert metrics['synced'] == 1 and metrics['failed'] == 1
+    assert metrics['last_error']
+    assert table_state(dsn)[1:] == (940, 1)
+
+
+def test_dropped_connection_is_retried(dsn):
+    import psycopg2
+    from db_sink import APPLICATION_NAME, DatabaseSink
+
+    sink = DatabaseSink(dsn, pool_size=1)
+    try:
+        sink.record_sale('A1', 'Anil', 'Batsman', 35, 60, 'Mavericks', team_id='T1')
+        assert sink.flush()
+        with psycopg2.connect(dsn) as conn, conn.cursor() as cur:
+            cur.execute("SELECT pg_terminate_backend(pid) FROM pg_stat_activity WHERE application_name = %s",
+                        [APPLICATION_NAME])
+        sink.record_sale('B2', 'Bala', 'Bowler', 40, 45, 'Mavericks', team_id='T1')
+        assert sink.flush()
+        metrics = sink.metrics()
+    finally:
+        sink.close()
+
+    assert metrics['retries'] >= 1 and metrics['synced'] == 2 and metrics['failed'] == 0
+    assert table_state(dsn)[1:] == (895, 2)
+
+
+def test_sales_made_during_an_outage_land_once_the_database_is_back(dsn):
+    import psycopg2
+    from db_sink import DatabaseSink
+
+    sink = DatabaseSink(dsn, max_backoff=0.05)
+    getconn, attempts = sink.pool.getconn, []
+
+    def unreachable():
+        # Offline for far more attempts than the old retry budget (six)
+        attempts.append(1)
+        if len(attempts) <= 30:
+            raise psycopg2.OperationalError('could not connect to server')
+        return getconn()
+
+    sink.pool.getconn = unreachable
+    try:
+        sink.record_sale('A1', 'Anil', 'Batsman', 35, 60, 'Mavericks', team_id='T1')
+        sink.record_sale('B2', 'Bala', 'Bowler', 40, 45, 'Mavericks', team_id='T1')
+        assert not sink.flush(timeout=0.3)
+        during = sink.metrics()
+        assert during['pending'] == 2 and during['failed'] == 0 and during['lag_seconds'] >= 0.3
+        assert sink.flush()
+        metrics = sink.metrics()
+    finally:
+        sink.close()
+
+    assert len(attempts) > 30 and metrics['retries'] >= 30
+    assert metrics['pending'] == 0 and metrics['synced'] == 2 and metrics['failed'] == 0
+    assert table_state(dsn) == ([('A1', 'Sold', 'Mavericks', 60), ('B2', 'Sold', 'Mavericks', 45)], 895, 2)
@@ -0,0 +1,52 @@
+"""
+Tests for the image derivative pipeline
+Run with: python -m pytest scripts
+"""
+
+from PIL import Image
+
+from image_derivatives import build_derivatives
+
+
+def make_public_dir(tmp_path):
+    public = tmp_path / 'public'
+    (public / 'players').mkdir(parents=True)
+    Image.new('RGB', (900, 1200), (200, 30, 30)).save(public / 'players' / '14HB.jpg', quality=95)
+    Image.new('RGB', (300, 400), (30, 200, 30)).save(public / 'players' / '1P0T.jpg', quality=95)
+    Image.new('RGBA', (800, 800), (0, 0, 255, 128)).save(public / 'Mavericks.png')
+    Image.new('RGBA', (32, 32)).save(public / 'favicon-32x32.png')
+    return public
+
+
+def test_derivatives_are_capped_and_listed_in_manifest(tmp_path):
+    public = make_public_dir(tmp_path)
+    manifest, built, cached = build_derivatives(public, workers=2)
+
+    assert (built, cached) == (3, 0)
+    assert sorted(manifest['players']) == ['14HB', '1P0T'] and list(manifest['logos']) == ['Mavericks']
+
+    photo = manifest['players']['14HB']
+    assert (photo['width'], photo['height']) == (360, 480)
+    assert photo['jpeg']['path'] == 'derived/players/14HB.jpg'
+    assert photo['jpeg']['bytes'] == (public / photo['jpeg']['path']).stat().st_size
+    assert photo['webp']['bytes'] < photo['source_bytes']
+    assert photo['placeholder'].startswith('data:image/webp;base64,')
+    with Image.open(public / photo['jpeg']['path']) as img:
+        assert img.info.get('progressive') or img.info.get('progression')
+
+    # Transparent logos keep their alpha channel instead of getting a JPEG
+    logo = manifest['logos']['Mavericks']
+    assert 'jpeg' not in logo and logo['png']['path'] == 'derived/logos/Mavericks.png'
+
+
+def test_unchanged_sources_are_cached_and_removed_sources_dropped(tmp_path):
+    public = make_public_dir(tmp_path)
+    build_derivatives(public, workers=1)
+
+    Image.new('RGB', (300, 400), (0, 0, 0)).save(public / 'players' / '1P0T.jpg')
+    (public / 'players' / '14HB.jpg').unlink()
+    manifest, built, cached = build_derivatives(public, workers=1)
+
+    assert (built, cached) == (1, 1)
+    assert '14HB' not in manifest['players']
+    assert not (public / 'derived' / 'players' / '14HB.webp').exists()
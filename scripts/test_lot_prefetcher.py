@@ -0,0 +1,48 @@
+"""
+Tests for the upcoming-lot prefetcher
+Run with: python -m pytest scripts
+"""
+
+import threading
+
+import pandas as pd
+import pytest
+
+from lot_prefetcher import LotPrefetcher, lot_order_key
+
+
+def test_rescheduling_cancels_lots_that_left_the_window():
+    prefetcher = LotPrefetcher()
+    release = threading.Event()
+    ran = []
+
+    def job(name):
+        def run():
+            if name == 'lot1':
+                release.wait(5)
+            ran.append(name)
+            return name.upper()
+        return run
+
+    prefetcher.schedule({'lot1': job('lot1'), 'lot2': job('lot2'), 'lot3': job('lot3')})
+    # The order changed while lot1 was running: lot2/lot3 are stale, lot4 is new
+    assert prefetcher.schedule({'lot1': job('lot1'), 'lot4': job('lot4')}) == 1
+    release.set()
+
+    assert prefetcher.result('lot1', lambda: 'foreground') == 'LOT1'
+    assert prefetcher.result('lot4', lambda: 'foreground') == 'LOT4'
+    assert prefetcher.result('lot2', lambda: 'foreground') == 'foreground'
+    assert prefetcher.cancelled == 2 and sorted(ran) == ['lot1', 'lot4']
+    prefetcher.close()
+
+
+def test_failed_jobs_rerun_in_foreground_and_order_key_tracks_order():
+    prefetcher = LotPrefetcher()
+    prefetcher.schedule({'bad': lambda: 1 / 0})
+    with pytest.raises(ZeroDivisionError):
+        prefetcher.result('bad', lambda: 1 / 0)
+    prefetcher.close()
+
+    players = pd.DataFrame({'PlayerID': ['A1', 'B2', 1234], 'Status': ['Available'] * 3})
+    assert lot_order_key(players) == lot_order_key(players.assign(Status='Sold'))
+    assert lot_order_key(players) != lot_order_key(players.iloc[[1, 0, 2]])
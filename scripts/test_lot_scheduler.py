@@ -0,0 +1,91 @@
+"""
+Tests for the lot scheduler and its re-auction rounds
+Run with: python -m pytest scripts
+"""
+
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from lot_scheduler import Lot, LotScheduler, order_players
+from player_schema import compact_players
+
+
+def test_unsold_lots_come_back_in_later_rounds_at_reduced_base():
+    scheduler = LotScheduler(['A', 'B', 'C', 'D'], [40, 30, 20, 10], rounds=3, round_base=0.5)
+
+    assert scheduler.current() == Lot(0, 1, 40)
+    assert scheduler.requeue() == Lot(0, 2, 20)     # A unsold
+    scheduler.advance()                              # B sold
+    assert scheduler.requeue() == Lot(2, 2, 10)     # C unsold
+    assert [lot.row for lot in scheduler.upcoming(5)] == [3, 0, 2]
+    scheduler.advance()                              # D sold
+
+    assert scheduler.current() == Lot(0, 2, 20) and scheduler.round_progress(scheduler.current()) == (1, 2)
+    assert scheduler.requeue() == Lot(0, 3, 10)     # A unsold again
+    scheduler.advance()                              # C sold in round 2
+    assert scheduler.requeue() is None               # A unsold in the last round
+    assert scheduler.current() is None and len(scheduler) == 0
+
+
+def test_discarded_lots_are_skipped_and_orderings_keep_roles_together():
+    scheduler = LotScheduler(['A', 'B', 'C', 'D'], [40, 30, 20, 10], rounds=2)
+    scheduler.requeue()                              # A to round 2
+    scheduler.discard(['B', 'A', 'unknown'])         # settled by a bulk import
+    assert [lot.row for lot in scheduler.upcoming(10)] == [2, 3]
+    assert scheduler.current().row == 2 and len(scheduler) == 2
+    scheduler.advance()
+    scheduler.advance()
+    assert scheduler.current() is None
+
+    players = compact_players(pd.DataFrame({
+        'PlayerID': ['P1', 'P2', 'P3', 'P4', 'P5'],
+        'Name': ['a', 'b', 'c', 'd', 'e'],
+        'Role': ['Bowler', 'Batsman', 'Bowler', 'Batsman', 'WicketKeeper'],
+        'BaseTokens': [30, 30, 50, 40, 20],
+    }))
+    assert order_players(players)['PlayerID'].tolist() == ['P4', 'P2', 'P3', 'P1', 'P5']
+    assert order_players(players, 'base_asc')['PlayerID'].tolist() == ['P2', 'P4', 'P1', 'P3', 'P5']
+    assert order_players(players, 'sheet')['PlayerID'].tolist() == ['P2', 'P4', 'P1', 'P3', 'P5']
+    shuffled = order_players(players, 'shuffle', seed=1)
+    assert shuffled['Role'].tolist() == order_players(players)['Role'].tolist()
+
+
+def test_lots_unsold_on_paper_move_to_the_next_round():
+    scheduler = LotScheduler(['A', 'B', 'C', 'D'], [40, 30, 20, 10], rounds=3, round_base=0.5)
+    scheduler.requeue()                              # A unsold live: round 2
+
+    # Paper results: C unsold before its lot came up, A unsold again in round 2
+    assert scheduler.defer(['C', 'unknown']) == [Lot(2, 2, 10)]
+    assert [(lot.row, lot.round) for lot in scheduler.upcoming(10)] == [(1, 1), (3, 1), (0, 2), (2, 2)]
+    assert scheduler.defer(['A']) == [Lot(0, 3, 10)]
+    assert [(lot.row, lot.round) for lot in scheduler.upcoming(10)] == [(1, 1), (3, 1), (2, 2), (0, 3)]
+    assert len(scheduler) == 4 and scheduler.queued == {1: 4, 2: 2, 3: 1}
+
+    scheduler.advance()                              # B sold
+    scheduler.advance()                              # D sold
+    assert scheduler.current() == Lot(2, 2, 10) and scheduler.round_progress(scheduler.current()) == (2, 2)
+    assert scheduler.defer(['C']) == [Lot(2, 3, 5)]
+    assert scheduler.current() == Lot(0, 3, 10)
+    assert scheduler.defer(['A']) == []              # unsold in the last round: done
+    assert [lot.row for lot in scheduler.upcoming(10)] == [2]
+    scheduler.advance()
+    assert scheduler.current() is None and len(scheduler) == 0
+
+
+def test_sheet_ordering_keeps_the_workbook_order_through_the_app_load():
+    app_test = pytest.importorskip('streamlit.testing.v1')
+    base_dir = Path(__file__).resolve().parent.parent
+    at = app_test.AppTest.from_file(str(base_dir / 'cplbidding.py'), default_timeout=60).run()
+    next(button for button in at.button if 'Load CPL Data' in button.label).click().run()
+    loaded = at.session_state['players_df']
+
+    sheet = pd.read_excel(base_dir / 'assets' / 'Cpl_data.xlsx', sheet_name='Players')
+    assert loaded['PlayerID'].tolist() == sheet['PlayerID'].tolist()
+
+    ordered = order_players(loaded, 'sheet')
+    for role, players in ordered.groupby('Role', observed=True, sort=False):
+        in_sheet = [player_id for player_id in sheet['PlayerID'] if player_id in set(players['PlayerID'])]
+        assert players['PlayerID'].tolist() == in_sheet, role
+    assert ordered['Role'].is_monotonic_increasing
@@ -0,0 +1,90 @@
+"""
+Tests for the trigram name index and the shared name resolvers
+Run with: python -m pytest scripts
+"""
+
+import random
+
+import pandas as pd
+
+from name_matcher import NameIndex, name_trigrams, normalize_name, resolve_player_ids, resolve_team_leaders
+
+SYLLABLES = ['ka', 'ra', 'vi', 'an', 'il', 'su', 'resh', 'ma', 'he', 'th', 'ar', 'ku', 'mar', 'sri', 'nu']
+
+
+def dice(left, right):
+    left, right = name_trigrams(normalize_name(left)), name_trigrams(normalize_name(right))
+    return 2.0 * len(left & right) / (len(left) + len(right))
+
+
+def test_prefix_filter_finds_every_name_above_the_cutoff():
+    rng = random.Random(3)
+
+    def word():
+        return ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+
+    names = [f"{word()} {word()}".title() for _ in range(400)]
+    index = NameIndex(names, [f"P{position}" for position in range(len(names))])
+
+    for query in [names[0], names[7][:-1], names[9].replace('a', 'e', 1), f"{names[3].split()[0]} X"]:
+        for cutoff in (0.5, 0.6, 0.75):
+            # Same set and order as scoring every name (exact matches never repeat as fuzzy ones)
+            brute = sorted(((round(dice(query, name), 4), position) for position, name in enumerate(names)
+                            if dice(query, name) >= cutoff), key=lambda item: (-item[0], item[1]))
+            matches = index.query(query, k=len(names), cutoff=cutoff)
+            assert [(match.score, match.player_id) for match in matches] == \
+                [(score, f"P{position}") for score, position in brute], (query, cutoff)
+
+
+def test_exact_matches_come_first_and_ties_are_flagged():
+    index = NameIndex(['Ravi Kumar', 'Ravi Kumaar', 'R. Kumar', 'ravi  KUMAR.'], ['A', 'B', 'C', 'D'])
+
+    # Both exact (normalized) hits lead with 1.0, then the best fuzzy match
+    matches = index.query('Ravi Kumar', k=3, cutoff=0.5)
+    assert [(match.player_id, match.score) for match in matches][:2] == [('A', 1.0), ('D', 1.0)]
+    assert matches[2].player_id == 'B' and matches[2].score < 1.0
+    assert [match.player_id for match in index.query('Ravi Kumar', k=2)] == ['A', 'D']
+
+    # Two equally good matches: best() refuses to pick, the resolver marks the name Ambiguous
+    assert index.best('Ravi Kumar') is None
+    twins = NameIndex(['Anil Rao', 'Anil Reo'], ['A', 'B'])
+    assert twins.best('Anil Rxo', cutoff=0.5) is None
+    players = pd.DataFrame({'Name': ['Anil Rao', 'Anil Reo', 'Suresh Babu'], 'PlayerID': ['A', 'B', 'C']})
+    resolved = resolve_player_ids(['Anil Rxo', 'Suresh Babu'], players, cutoff=0.5)
+    assert resolved['MatchType'].tolist() == ['fuzzy', 'exact']
+    assert resolved['Ambiguous'].tolist() == [True, False]
+
+
+PLAYERS = pd.DataFrame({
+    'PlayerID': ['P1', 'P2', 'P3', 'P4', 'P5'],
+    'Name': ['Mahethar Reddy', 'Anil Kumar ', 'Sri Harsha', 'Sri Harsha', 'Vamsi Krishna'],
+})
+
+
+def test_resolve_player_ids_exact_fuzzy_missing_and_duplicates():
+    resolved = resolve_player_ids(['MAHETHAR  reddy', 'Anil Kumarr', 'Nobody Here', 'Sri Harsha', None, 'Anil Kumar'],
+                                  PLAYERS)
+
+    assert resolved['MatchType'].tolist() == ['exact', 'fuzzy', 'missing', 'exact', 'missing', 'exact']
+    assert resolved['PlayerID'].tolist()[:2] == ['P1', 'P2'] and resolved['PlayerID'][5] == 'P2'
+    assert resolved['PlayerID'][[2, 4]].isna().all()
+    assert resolved['MatchedName'][1] == 'Anil Kumar' and 0.75 <= resolved['Confidence'][1] < 1.0
+    # The name belongs to two players: resolved to the first, but flagged for review
+    assert resolved['Ambiguous'].tolist() == [False, False, False, True, False, False]
+    assert resolved['PlayerID'][3] == 'P3'
+
+
+def test_resolve_team_leaders_skips_blank_cells():
+    teams = pd.DataFrame({
+        'TeamName': ['Mavericks', 'Strikers', 'Titans'],
+        'Captain': ['Mahethar Reddy', None, 'Vamsi Krishnaa'],
+        'ViceCaptain': ['  ', 'Sri Harsha', 'Unknown Player'],
+    })
+
+    leaders = resolve_team_leaders(teams, PLAYERS)
+
+    assert leaders[['TeamName', 'Position']].values.tolist() == [
+        ['Mavericks', 'Captain'], ['Titans', 'Captain'], ['Strikers', 'ViceCaptain'], ['Titans', 'ViceCaptain']]
+    assert leaders['PlayerID'].tolist()[:3] == ['P1', 'P5', 'P3'] and pd.isna(leaders['PlayerID'][3])
+    assert leaders['MatchType'].tolist() == ['exact', 'fuzzy', 'exact', 'missing']
+    assert leaders['Ambiguous'].tolist() == [False, False, True, False]
@@ -0,0 +1,51 @@
+"""
+Tests for the photo coverage index
+Run with: python -m pytest scripts
+"""
+
+import pandas as pd
+
+from photo_index import PhotoIndex, legacy_photo_stem
+
+
+def make_dirs(tmp_path):
+    players, images = tmp_path / 'players', tmp_path / 'images'
+    players.mkdir()
+    images.mkdir()
+    for path in [players / '14HB.JPG', players / '1P0T.png', images / 'abishai_narla.jpg',
+                 images / 'rahul.jpg', images / 'unused.jpg', images / 'notes.txt', players / '14HB.jpg.bak']:
+        path.write_bytes(b'x')
+    return players, images
+
+
+def test_resolution_order_and_fallbacks(tmp_path):
+    players, images = make_dirs(tmp_path)
+    index = PhotoIndex([players, images, tmp_path / 'does-not-exist'])
+
+    assert index.resolve('rahul.jpg', '14HB').match_type == 'filename'
+    assert index.resolve('14hb.jpg').path == players / '14HB.JPG'
+    assert index.resolve('1P0T.jpg').match_type == 'stem'
+    assert index.resolve('gone.jpg', player_id='14HB') == (players / '14HB.JPG', 'player_id')
+    assert index.resolve(float('nan'), 'ZZZZ', 'Abishai Jason Narla') == (images / 'abishai_narla.jpg', 'legacy')
+    assert index.resolve(None, None, None) == (None, 'missing')
+    assert len(index) == 5
+
+
+def test_coverage_reports_missing_and_orphans(tmp_path):
+    players, images = make_dirs(tmp_path)
+    roster = pd.DataFrame({
+        'PlayerID': ['14HB', '1P0T', '7J4N', '965V'],
+        'Name': ['Mahether Reddy', 'Nevin Joseph', 'Abishai Jason Narla', 'Vivek Dadi'],
+        'PhotoFileName': ['14HB.jpg', None, 'abishai.jpg', '965V.jpg'],
+    })
+
+    report, orphans = PhotoIndex([players, images]).coverage(roster)
+
+    assert report['MatchType'].tolist() == ['filename', 'player_id', 'legacy', 'missing']
+    assert orphans == [str(images / 'rahul.jpg'), str(images / 'unused.jpg')]
+
+
+def test_legacy_stem_matches_registration_rule():
+    assert legacy_photo_stem("D'Souza-Lee  Jr.") == 'dsouzalee_jr'
+    assert legacy_photo_stem('Sachin') == 'sachin'
+    assert legacy_photo_stem('!!!') is None
@@ -0,0 +1,65 @@
+"""
+Tests for the incremental photo sync
+Run with: python -m pytest scripts
+"""
+
+import os
+
+from photo_sync import sync_directory
+
+
+def write(path, data):
+    path.write_bytes(data)
+    return path
+
+
+def test_sync_copies_only_new_and_changed(tmp_path):
+    source, dest, manifest = tmp_path / 'src', tmp_path / 'dst', tmp_path / 'manifest.json'
+    source.mkdir()
+    write(source / 'A1.jpg', b'a' * 100)
+    write(source / 'B2.jpg', b'b' * 200)
+    write(source / 'notes.txt', b'ignored')
+
+    first = sync_directory(source, dest, manifest_path=manifest)
+    assert first.copied == ['A1.jpg', 'B2.jpg'] and first.bytes_copied == 300
+    assert not (dest / 'notes.txt').exists()
+
+    rerun = sync_directory(source, dest, manifest_path=manifest)
+    assert rerun.copied == [] and rerun.unchanged == 2 and rerun.bytes_saved == 300
+
+    # Touched but identical content is not copied; new content is
+    os.utime(source / 'A1.jpg', ns=(1, 1))
+    write(source / 'B2.jpg', b'c' * 200)
+    changed = sync_directory(source, dest, manifest_path=manifest)
+    assert changed.copied == ['B2.jpg']
+    assert (dest / 'B2.jpg').read_bytes() == b'c' * 200
+
+
+def test_first_run_trusts_identical_destination(tmp_path):
+    source, dest = tmp_path / 'src', tmp_path / 'dst'
+    source.mkdir()
+    dest.mkdir()
+    write(source / 'A1.jpg', b'same')
+    write(dest / 'A1.jpg', b'same')
+    write(source / 'B2.jpg', b'new!')
+    write(dest / 'B2.jpg', b'old!')
+
+    report = sync_directory(source, dest, manifest_path=tmp_path / 'manifest.json')
+    assert report.copied == ['B2.jpg'] and report.unchanged == 1
+    assert (dest / 'B2.jpg').read_bytes() == b'new!'
+
+
+def test_orphans_reported_and_optionally_deleted(tmp_path):
+    source, dest, manifest = tmp_path / 'src', tmp_path / 'dst', tmp_path / 'manifest.json'
+    source.mkdir()
+    dest.mkdir()
+    write(source / 'A1.jpg', b'a')
+    write(dest / 'gone.jpg', b'g')
+
+    kept = sync_directory(source, dest, manifest_path=manifest, link=True)
+    assert kept.orphans == ['gone.jpg'] and kept.deleted == []
+    assert (dest / 'gone.jpg').exists()
+    assert os.path.samefile(source / 'A1.jpg', dest / 'A1.jpg')
+
+    removed = sync_directory(source, dest, manifest_path=manifest, delete_orphans=True)
+    assert removed.deleted == ['gone.jpg'] and not (dest / 'gone.jpg').exists()
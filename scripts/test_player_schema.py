@@ -0,0 +1,54 @@
+"""
+Tests for the compact player/team dtypes
+Run with: python -m pytest scripts
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from player_schema import ROLE_ORDER, compact_int, compact_players, compact_teams, normalize_roles
+
+
+def test_roles_sort_in_auction_order_and_unknown_values_are_kept():
+    players = pd.DataFrame({
+        'PlayerID': ['A', 'B', 'C', 'D', 'E'],
+        'Role': ['WicketKeeper', 'Wicket Keeper', 'Batsman', None, 'Bowler'],
+        'BaseTokens': [35.0, 40.0, 50.0, 30.0, 45.0],
+        'Status': ['Sold', None, 'Available', 'Available', 'Unsold'],
+        'SoldTo': ['Mavericks', None, None, None, None],
+    })
+
+    compact = compact_players(players)
+
+    assert list(compact['Role'].cat.categories) == ROLE_ORDER + ['Wicket Keeper']
+    assert compact.sort_values('Role')['PlayerID'].tolist() == ['C', 'E', 'A', 'B', 'D']
+    assert compact['Role'].isin(ROLE_ORDER).tolist() == [True, False, True, False, True]
+    assert compact['BaseTokens'].dtype == np.int16
+    assert compact['Status'].cat.ordered and list(compact['SoldTo'].cat.categories) == ['Mavericks']
+    assert players['Role'].dtype == object
+
+
+def test_compact_int_narrows_only_whole_numbers():
+    assert compact_int(pd.Series([60.0, np.nan, 45.0])).dtype == 'Int16'
+    assert compact_int(pd.Series([1, 70000])).dtype == np.int32
+    assert compact_int(pd.Series([1.5, 2.0])).dtype == np.float64
+    assert compact_int(pd.Series(['12', 'n/a'])).tolist() == ['12', 'n/a']
+
+    teams = compact_teams(pd.DataFrame({'TeamName': ['Mavericks'], 'TokensLeft': [1200], 'MaxSquadSize': [15]}))
+    assert teams['TokensLeft'].dtype == np.int16 and teams['TeamName'].dtype == object
+
+
+def test_known_role_spellings_are_normalized_and_others_kept():
+    roles = normalize_roles(['Wicket Keeper', 'all rounder', ' Bowler ', 'WicketKeeper', 'Fielder', None])
+
+    assert roles.tolist()[:5] == ['WicketKeeper', 'All-rounder', 'Bowler', 'WicketKeeper', 'Fielder']
+    assert roles.isna().tolist() == [False] * 5 + [True]
+
+    # The shipped workbook loads once its 'Wicket Keeper' rows are normalized
+    from sheet_validator import validate_players
+    players = pd.read_excel(Path(__file__).resolve().parent.parent / 'assets' / 'Cpl_data.xlsx', sheet_name='Players')
+    assert any(issue.rule == 'unknown_role' for issue in validate_players(players))
+    players['Role'] = normalize_roles(players['Role'])
+    assert not any(issue.rule == 'unknown_role' for issue in validate_players(players))
@@ -0,0 +1,40 @@
+"""
+Tests for duplicate-registration detection
+Run with: python -m pytest scripts
+"""
+
+import pandas as pd
+
+from registration_dedup import employee_keys, find_duplicates, phone_keys
+
+
+def test_clusters_typos_and_reformatted_numbers_but_not_namesakes():
+    registrations = pd.DataFrame({
+        'Name': ['Sriharsha Reddy', 'Sriharsa  Reddy', 'Kiran Kumar', 'Kumar Kiran', 'Anil Rao',
+                 'Anil Rao', 'Bala Krishna', 'Chetan Sharma'],
+        'Employee ID': ['7J4N', None, '00X12', 'x12', 'A1', 'B2', 'C3', 'D4'],
+        'Contact Number': [9618914121, '+91 96189 14121', '8985011234', None, '1', '2', '7780309060',
+                           '7780309060.0'],
+    })
+
+    result = find_duplicates(registrations)
+
+    pairs = set(zip(result.pairs['Left'], result.pairs['Right']))
+    # Typo + same phone; reordered name + same ID; the two Anil Raos have different IDs and phones
+    assert pairs == {(0, 1), (2, 3)}
+    assert result.clusters['ClusterID'].tolist() == [1, 1, 2, 2]
+    assert result.clusters['Name'].tolist() == ['Sriharsha Reddy', 'Sriharsa  Reddy', 'Kiran Kumar', 'Kumar Kiran']
+    assert (result.clusters['ClusterSize'] == 2).all()
+    assert result.stats['clusters'] == 2 and result.stats['candidate_pairs'] < result.stats['all_pairs']
+
+
+def test_keys_are_normalized_and_oversized_blocks_are_skipped():
+    employees = employee_keys(pd.Series([' 007j-4n', 1234.0, '', None]))
+    assert employees[:2].tolist() == ['7J4N', '1234'] and employees[2:].isna().all()
+    phones = phone_keys(pd.Series(['+91 96189-14121', 9618914121.0, '12345']))
+    assert phones[:2].tolist() == ['618914121'] * 2 and pd.isna(phones[2])
+
+    namesakes = pd.DataFrame({'Name': ['Ravi Teja'] * 5 + ['Ravi Tej']})
+    assert find_duplicates(namesakes).stats['clusters'] == 1
+    capped = find_duplicates(namesakes, max_block_size=4)
+    assert capped.clusters.empty and capped.stats['oversized_blocks'] > 0
@@ -0,0 +1,77 @@
+"""
+Tests for the incremental registration ingest (--incremental)
+Run with: python -m pytest scripts
+"""
+
+import pandas as pd
+
+from process_cpl_registrations import (
+    diff_registrations,
+    load_ingest_state,
+    normalize_registrations,
+    registration_fingerprints,
+    save_ingest_state,
+    write_delta_sql,
+)
+
+REGISTRATIONS = pd.DataFrame({
+    'S.No': [1, 2, 3],
+    'Name': ['Ravi Kumar', 'Anil Rao', 'Sri Harsha'],
+    'Employee ID': ['AB12', 'CD34', 'EF56'],
+    'Contact Number': [9876543210, 9123456780, 9000000000],
+    'Preferred Role': ['Batsman', 'Bowler', 'Wicket Keeper'],
+    'Secondary Role (if any)': [None, 'Batsman', None],
+})
+
+
+def player_ids(raw):
+    normalized = normalize_registrations(raw)
+    return dict(zip(normalized['Name'], normalized['PlayerID']))
+
+
+def diff(raw, previous):
+    return diff_registrations(normalize_registrations(raw), registration_fingerprints(raw), previous)
+
+
+def test_rows_are_classified_new_changed_unchanged_and_removed():
+    _, _, _, first = diff(REGISTRATIONS, {})
+
+    # Rows reordered and renumbered, one changed, one added, one dropped
+    later = pd.concat([REGISTRATIONS, pd.DataFrame({
+        'S.No': [4], 'Name': ['Vamsi Krishna'], 'Employee ID': ['GH78'], 'Contact Number': [9222222222],
+        'Preferred Role': ['Bowler'], 'Secondary Role (if any)': [None]})], ignore_index=True)
+    later = later.drop(index=1).iloc[::-1].reset_index(drop=True)
+    later['S.No'] = range(1, len(later) + 1)
+    later.loc[later['Name'] == 'Sri Harsha', 'Contact Number'] = 9000000001
+
+    new_ids, changed_ids, removed_ids, current = diff(later, first)
+
+    ids, first_ids = player_ids(later), player_ids(REGISTRATIONS)
+    assert new_ids == [ids['Vamsi Krishna']]
+    assert changed_ids == [ids['Sri Harsha']]
+    assert removed_ids == [first_ids['Anil Rao']]
+    assert current[ids['Ravi Kumar']] == first[ids['Ravi Kumar']]
+
+
+def test_state_persists_across_runs_and_delta_sql_has_only_the_delta(tmp_path):
+    state_file = tmp_path / 'registration_ingest_state.json'
+    assert load_ingest_state(state_file) == {}
+
+    new_ids, changed_ids, _, current = diff(REGISTRATIONS, load_ingest_state(state_file).get('PLAYERS', {}))
+    assert len(new_ids) == 3 and changed_ids == []
+    save_ingest_state({'PLAYERS': current}, state_file)
+
+    # Second run with the same sheet: nothing to do
+    assert load_ingest_state(state_file) == {'PLAYERS': current}
+    assert diff(REGISTRATIONS, load_ingest_state(state_file)['PLAYERS'])[:3] == ([], [], [])
+
+    edited = REGISTRATIONS.assign(**{'Preferred Role': ['Batsman', 'Batsman', 'Wicket Keeper']})
+    new_ids, changed_ids, _, _ = diff(edited, load_ingest_state(state_file)['PLAYERS'])
+    players = normalize_registrations(edited).assign(auction_order=[1, 2, 3])
+    sql_file = tmp_path / 'delta.sql'
+    write_delta_sql(sql_file, players, new_ids, changed_ids)
+
+    sql = sql_file.read_text(encoding='utf-8')
+    assert new_ids == [] and changed_ids == [players.at[1, 'PlayerID']]
+    assert '-- New players: 0' in sql and '-- Changed players: 1' in sql
+    assert players.at[1, 'PlayerID'] in sql and players.at[0, 'PlayerID'] not in sql
@@ -0,0 +1,80 @@
+"""
+Parity tests: normalize_registrations must match the original iterrows() path
+Run with: python -m pytest scripts
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from process_cpl_registrations import (
+    calculate_base_tokens,
+    generate_photo_filename,
+    generate_player_id,
+    map_role_to_category,
+    normalize_registrations,
+)
+
+REGISTRATIONS_FILE = Path(__file__).resolve().parent.parent / 'data' / 'Colruyt Premier League Registrations 2025.xlsx'
+
+
+def normalize_registrations_rowwise(registrations_df, is_captain=False):
+    """The per-row loop process_cpl_registrations.py used before vectorizing"""
+    rows = []
+    for _, row in registrations_df.iterrows():
+        role = map_role_to_category(row['Preferred Role'], row.get('Secondary Role (if any)'))
+        player_data = {
+            'PlayerID': generate_player_id(row['Name'], row['Employee ID']),
+            'Name': row['Name'].strip(),
+            'Role': role,
+            'BaseTokens': calculate_base_tokens(role, is_captain=is_captain),
+            'PhotoFileName': generate_photo_filename(row['Name']),
+            'Department': {
+                'Batsman': 'Batting',
+                'Bowler': 'Bowling',
+                'All-rounder': 'All-rounder',
+                'WicketKeeper': 'Wicket Keeping'
+            }[role],
+            'EmployeeID': row['Employee ID'],
+            'ContactNumber': row['Contact Number'],
+            'PreferredRole': row['Preferred Role'],
+            'SecondaryRole': row.get('Secondary Role (if any)', '')
+        }
+        if is_captain:
+            player_data['IsCaptain'] = True
+        rows.append(player_data)
+    return pd.DataFrame(rows)
+
+
+EDGE_CASES = pd.DataFrame({
+    'Name': ['  Ravi  Kumar ', 'Sachin', "D'Souza-Lee Jr.", '!!!', 'Anna Maria Lopez', 'Émile Zola'],
+    'Employee ID': ['ab12', np.nan, '  ', 'x9z9', ' 7k7k ', None],
+    'Contact Number': [9876543210, 9123456780, 9000000000, 9111111111, 9222222222, 9333333333],
+    'Preferred Role': ['Batting All-rounder', 'Wicket Keeper', 'Fielder', np.nan, 'Bowl all rounder', 'Bowler'],
+    'Secondary Role (if any)': [np.nan, 'Batsman', 'Bowling', 'Round arm', np.nan, 'Keeper'],
+})
+
+
+@pytest.mark.parametrize('is_captain', [False, True])
+def test_edge_cases_match_rowwise(is_captain):
+    expected = normalize_registrations_rowwise(EDGE_CASES, is_captain=is_captain)
+    actual = normalize_registrations(EDGE_CASES, is_captain=is_captain)
+    pd.testing.assert_frame_equal(actual, expected)
+
+
+def test_missing_secondary_column_matches_rowwise():
+    registrations = EDGE_CASES.drop(columns=['Secondary Role (if any)'])
+    expected = normalize_registrations_rowwise(registrations)
+    actual = normalize_registrations(registrations)
+    pd.testing.assert_frame_equal(actual, expected)
+
+
+@pytest.mark.skipif(not REGISTRATIONS_FILE.exists(), reason='registrations workbook not available')
+@pytest.mark.parametrize('sheet_name, is_captain', [('PLAYERS', False), ('CAPTAINS', True)])
+def test_registrations_workbook_matches_rowwise(sheet_name, is_captain):
+    registrations = pd.read_excel(REGISTRATIONS_FILE, sheet_name=sheet_name)
+    expected = normalize_registrations_rowwise(registrations, is_captain=is_captain)
+    actual = normalize_registrations(registrations, is_captain=is_captain)
+    pd.testing.assert_frame_equal(actual, expected)
@@ -0,0 +1,61 @@
+"""
+Tests for the versioned result exports
+Run with: python -m pytest scripts
+"""
+
+import io
+
+import pandas as pd
+import pytest
+
+from result_exports import ResultExports, results_sheets, sheet_names, unsold_sheets
+
+HISTORY = [
+    {'Player': 'Ravi Kumar', 'Role': 'Batsman', 'BaseTokens': 50, 'SoldPrice': 60, 'Team': 'Mavericks'},
+    {'Player': 'Anil Rao', 'Role': 'Bowler', 'BaseTokens': 40, 'SoldPrice': 40, 'Team': 'Strikers: Blue'},
+]
+TEAMS = {
+    'Mavericks': {'squad': [{'PlayerID': 'P001', 'Name': 'Ravi Kumar', 'Role': 'Batsman', 'BidPrice': 60}]},
+    'Strikers: Blue': {'squad': [{'PlayerID': 7, 'Name': 'Anil Rao', 'Role': 'Bowler', 'BidPrice': 40}]},
+    'Titans': {'squad': []},
+}
+
+
+def test_exports_are_built_once_per_ledger_version():
+    exports = ResultExports()
+    calls = []
+
+    def make_sheets():
+        calls.append(1)
+        return results_sheets(HISTORY, TEAMS)
+
+    assert exports.cached('results', 'csv', 2) is None
+    data = exports.build('results', 'csv', 2, make_sheets)
+    assert exports.build('results', 'csv', 2, make_sheets) is data
+    assert exports.cached('results', 'csv', 2) is data and len(calls) == 1
+    assert pd.read_csv(io.BytesIO(data))['Team'].tolist() == ['Mavericks', 'Strikers: Blue']
+
+    # The next lot invalidates it; other datasets are cached on their own
+    assert exports.cached('results', 'csv', 3) is None
+    exports.build('results', 'csv', 3, make_sheets)
+    exports.build('unsold', 'csv', 3, lambda: unsold_sheets([]))
+    assert len(calls) == 2 and exports.builds == 3
+
+
+def test_xlsx_has_results_then_one_sheet_per_team():
+    data = ResultExports().build('results', 'xlsx', 2, lambda: results_sheets(HISTORY, TEAMS))
+    sheets = pd.read_excel(io.BytesIO(data), sheet_name=None)
+
+    assert list(sheets) == ['Results', 'Mavericks', 'Strikers_ Blue', 'Titans']
+    assert sheets['Mavericks']['Name'].tolist() == ['Ravi Kumar']
+    assert sheets['Titans'].empty
+    assert sheet_names(['A' * 40, 'a' * 40]) == ['A' * 31, 'a' * 27 + ' (2)']
+
+
+def test_parquet_holds_the_results_table():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        pytest.skip('pyarrow is not installed')
+    parquet = ResultExports().build('results', 'parquet', 2, lambda: results_sheets(HISTORY, TEAMS))
+    assert pd.read_parquet(io.BytesIO(parquet))['SoldPrice'].tolist() == [60, 40]
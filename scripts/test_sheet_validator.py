@@ -0,0 +1,57 @@
+"""
+Tests for the Players/Teams sheet validator
+Run with: python -m pytest scripts
+"""
+
+import pandas as pd
+
+from photo_index import PhotoIndex
+from sheet_validator import validate_sheets
+
+
+def test_reports_every_bad_cell_with_its_excel_row():
+    players = pd.DataFrame({
+        'PlayerID': ['A1', 'B2', 'A1', 1234, None],
+        'Name': ['Anil', 'Bala', 'Chetan', 'Dev', 'Eshwar'],
+        'Role': ['Batsman', 'Wicket Keeper', 'Bowler', 'All-rounder', 'WicketKeeper'],
+        'BaseTokens': [40, 'forty', 35.5, -5, 30],
+        'Status': ['Available', 'Available', 'Sold', 'Retired', None],
+    })
+    teams = pd.DataFrame({'TeamID': [1, 2, 3], 'TeamName': ['Mavericks', 'Strikers', 'mavericks '],
+                          'LogoFile': ['m.png', 's.png', 'm.png']})
+
+    report = validate_sheets(players, teams)
+
+    found = {(issue.sheet, issue.rule, issue.row) for issue in report.issues}
+    assert found == {
+        ('Players', 'missing_value', 6),
+        ('Players', 'duplicate_player_id', 2), ('Players', 'duplicate_player_id', 4),
+        ('Players', 'unknown_role', 3),
+        ('Players', 'bad_base_tokens', 3), ('Players', 'bad_base_tokens', 4), ('Players', 'bad_base_tokens', 5),
+        ('Players', 'unknown_status', 5),
+        ('Teams', 'duplicate_teamname', 2), ('Teams', 'duplicate_teamname', 4),
+    }
+    assert not report.ok and len(report.warnings) == 1
+    assert report.counts()[('Players', 'bad_base_tokens')] == 3
+    assert report.errors[0].sheet == 'Players'
+
+
+def test_missing_columns_and_photo_checks_match_photo_index(tmp_path):
+    for filename in ['a1.jpg', 'Bala_Krishna.png', 'C3.webp', 'logo.png']:
+        (tmp_path / filename).write_bytes(b'')
+    index = PhotoIndex([tmp_path])
+    players = pd.DataFrame({
+        'PlayerID': ['A1', 'B2', 'C3', 'D4', 'E5'],
+        'Name': ['Anil', 'Bala R. Krishna', 'Chetan', 'Dev', 'Eshwar'],
+        'Role': ['Batsman'] * 5,
+        'BaseTokens': [40] * 5,
+        'PhotoFileName': ['photos/A1.JPG', None, 'c3.jpg', 'd4.jpg', None],
+    })
+
+    report = validate_sheets(players, pd.DataFrame({'TeamID': [1], 'TeamName': ['X']}), index)
+
+    missing_photos = [issue.row for issue in report.issues if issue.rule == 'missing_photo']
+    resolved = [index.lookup(*row) for row in players[['PhotoFileName', 'PlayerID', 'Name']].itertuples(index=False)]
+    assert missing_photos == [position + 2 for position, path in enumerate(resolved) if path is None] == [5, 6]
+    assert [(issue.sheet, issue.rule, issue.column) for issue in report.errors] == [
+        ('Teams', 'missing_column', 'LogoFile')]
@@ -0,0 +1,68 @@
+"""
+Tests for the shared streaming SQL emitter
+Run with: python -m pytest scripts
+"""
+
+import io
+
+import numpy as np
+import pandas as pd
+
+from sql_emitter import sql_literal, write_bulk_update, write_insert, write_update_where_in
+
+
+def test_sql_literal_quoting_and_nulls():
+    assert sql_literal("D'Souza") == "'D''Souza'"
+    assert sql_literal(None) == 'NULL'
+    assert sql_literal(float('nan')) == 'NULL'
+    assert sql_literal(pd.NA) == 'NULL'
+    assert sql_literal(np.int64(35)) == '35'
+    assert sql_literal(np.bool_(True)) == 'TRUE'
+    assert sql_literal(False) == 'FALSE'
+    assert sql_literal(12.5) == '12.5'
+
+
+def test_write_insert_batches_rows():
+    out = io.StringIO()
+    rows = ((f"P{i}", i) for i in range(5))
+    written = write_insert(out, 'players', ['player_id', 'base_tokens'], rows, rows_per_statement=2)
+
+    sql = out.getvalue()
+    assert written == 5
+    assert sql.count('INSERT INTO players (player_id, base_tokens) VALUES') == 3
+    assert sql.count(';') == 3
+    assert "('P4', 4);\n" in sql
+
+
+def test_write_insert_accepts_frame_and_skips_empty():
+    df = pd.DataFrame({'player_id': ['A1'], 'name': ["O'Neil"]})
+    out = io.StringIO()
+    assert write_insert(out, 'players', ['player_id', 'name'], df) == 1
+    assert out.getvalue() == "INSERT INTO players (player_id, name) VALUES\n('A1', 'O''Neil');\n"
+
+    empty = io.StringIO()
+    assert write_insert(empty, 'players', ['player_id'], iter([])) == 0
+    assert empty.getvalue() == ''
+
+
+def test_write_bulk_update_is_set_based_and_chunked():
+    out = io.StringIO()
+    rows = [('T1', 'Hits & Misses', 10), ('T2', "Kings' XI", None), ('T3', 'CSK', 5)]
+    written = write_bulk_update(out, 'teams', 'team_id', ['team_name', 'tokens_left'], rows,
+                                casts={'tokens_left': 'integer'}, rows_per_statement=2)
+
+    sql = out.getvalue()
+    assert written == 3
+    assert sql.count('UPDATE teams AS t SET team_name = v.team_name, tokens_left = v.tokens_left::integer') == 2
+    assert "  ('T2', 'Kings'' XI', NULL)" in sql
+    assert sql.count('AS v(team_id, team_name, tokens_left)\nWHERE t.team_id = v.team_id;') == 2
+
+
+def test_write_update_where_in():
+    out = io.StringIO()
+    write_update_where_in(out, 'players', {'is_captain': True}, 'player_id', ['14HB', 'MXL5', '3H3Y'],
+                          rows_per_statement=2)
+    assert out.getvalue() == (
+        "UPDATE players SET is_captain = TRUE WHERE player_id IN ('14HB', 'MXL5');\n"
+        "UPDATE players SET is_captain = TRUE WHERE player_id IN ('3H3Y');\n"
+    )
@@ -0,0 +1,46 @@
+"""
+Tests for the precomputed static images
+Run with: python -m pytest scripts
+"""
+
+import base64
+import io
+import os
+
+from PIL import Image
+
+import static_assets
+from static_assets import cached_image, image_data_uri
+
+
+def test_image_is_capped_to_width_and_served_from_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(static_assets, 'CACHE_DIR', tmp_path / 'cache')
+    source = tmp_path / 'cpl.png'
+    Image.new('RGBA', (1400, 540), (0, 0, 255, 128)).save(source, compress_level=0)
+
+    uri = image_data_uri(source, 700)
+    assert uri.startswith('data:image/png;base64,')
+    with Image.open(io.BytesIO(base64.b64decode(uri.split(',', 1)[1]))) as img:
+        assert (img.size, img.mode) == ((700, 270), 'RGBA')
+    assert len(list((tmp_path / 'cache').glob('*.png'))) == 1
+
+    # A cached entry is read back without touching Pillow
+    monkeypatch.setattr(static_assets, 'build_cached_image', None)
+    assert cached_image(source, 700) == base64.b64decode(uri.split(',', 1)[1])
+    assert image_data_uri(tmp_path / 'missing.png', 700) is None
+
+
+def test_changed_source_replaces_its_cache_entry(tmp_path, monkeypatch):
+    monkeypatch.setattr(static_assets, 'CACHE_DIR', tmp_path / 'cache')
+    source = tmp_path / 'cpl.png'
+    Image.new('RGB', (300, 100), (200, 30, 30)).save(source)
+    first = cached_image(source, 700)
+
+    Image.new('RGB', (300, 120), (30, 200, 30)).save(source)
+    os.utime(source, ns=(source.stat().st_atime_ns, source.stat().st_mtime_ns + 10 ** 9))
+    second = cached_image(source, 700)
+
+    assert first != second
+    with Image.open(io.BytesIO(second)) as img:
+        assert img.size == (300, 120)
+    assert len(list((tmp_path / 'cache').glob('*.png'))) == 1
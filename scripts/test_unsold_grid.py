@@ -0,0 +1,56 @@
+"""
+Tests for the Unsold grid index and the thumbnail cache
+Run with: python -m pytest scripts
+"""
+
+from PIL import Image
+
+import thumbnail_cache
+from thumbnail_cache import ThumbnailCache
+from unsold_grid import UnsoldIndex, index_key
+
+
+def make_players(count):
+    roles = ['Batsman', 'Bowler', 'All-rounder']
+    return [{'PlayerID': f"P{number:02d}", 'Name': f"Player {number} {'Reddy' if number % 2 else 'Kumar'}",
+             'Role': roles[number % 3], 'BaseTokens': 10} for number in range(count)]
+
+
+def test_search_role_filter_and_clamped_pages():
+    players = make_players(40)
+    index = UnsoldIndex(players)
+
+    page = index.page(page_number=1, page_size=12)
+    assert [player['PlayerID'] for player in page.players] == [f"P{number:02d}" for number in range(12, 24)]
+    assert (page.number, page.total_pages, page.matches) == (1, 4, 40)
+    assert [player['PlayerID'] for player in page.next_players][:1] == ['P24']
+
+    page = index.page(' REDDY ', role='Bowler', page_number=9, page_size=4)
+    assert all(player['Role'] == 'Bowler' and 'Reddy' in player['Name'] for player in page.players)
+    assert (page.number, page.total_pages, page.matches, page.next_players) == (1, 2, 7, [])
+    assert index.page('p07').matches == 1
+    assert index.page('nobody').players == [] and index.page('nobody').total_pages == 1
+    assert index_key(players) != index_key(players[1:])
+
+
+def test_prefetched_thumbnails_are_served_from_memory(tmp_path, monkeypatch):
+    paths = []
+    for number in range(4):
+        path = tmp_path / f"P{number}.jpg"
+        Image.new('RGB', (800, 600), (number * 60, 0, 0)).save(path)
+        paths.append(path)
+    loads = []
+    real_load = thumbnail_cache.load_thumbnail
+    monkeypatch.setattr(thumbnail_cache, 'load_thumbnail',
+                        lambda path, size: loads.append(path) or real_load(path, size))
+    cache = ThumbnailCache(size=(150, 150), max_items=3)
+
+    assert cache.prefetch(paths[:3] + [None]) == 3
+    assert cache.prefetch(paths[:3]) == 0
+    assert all(cache.get(path).size == (150, 150) for path in paths[:3])
+    assert len(loads) == 3
+
+    assert cache.get(paths[3]) is not None
+    assert len(cache) == 3 and paths[0] not in cache
+    assert cache.get(tmp_path / 'missing.jpg') is None
+    cache.close()
@@ -0,0 +1,72 @@
+"""
+Tests for the cached Excel loader
+Run with: python -m pytest scripts
+"""
+
+import pandas as pd
+import pytest
+
+import workbook_cache
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    """workbook_cache with its cache in tmp_path; .reads counts the sheets actually parsed"""
+    monkeypatch.setattr(workbook_cache, 'CACHE_DIR', tmp_path / 'cache')
+    read_excel = pd.read_excel
+    calls = []
+
+    def counting_read_excel(path, sheet_name=0, **kwargs):
+        calls.append(sheet_name)
+        return read_excel(path, sheet_name=sheet_name, **kwargs)
+
+    monkeypatch.setattr(workbook_cache.pd, 'read_excel', counting_read_excel)
+    monkeypatch.setattr(workbook_cache, 'reads', calls, raising=False)
+    return workbook_cache
+
+
+def write_workbook(path, sheets):
+    with pd.ExcelWriter(path) as writer:
+        for name, rows in sheets.items():
+            pd.DataFrame({'Value': rows}).to_excel(writer, sheet_name=name, index=False)
+
+
+def test_hits_misses_and_sheet_selectors(cache, tmp_path):
+    workbook = tmp_path / 'book.xlsx'
+    write_workbook(workbook, {'Team A': [1], 'Team_A': [2], 'Team.A': [3]})
+
+    assert cache.read_excel(workbook, 'Team A')['Value'].tolist() == [1]
+    assert cache.read_excel(workbook, 'Team A')['Value'].tolist() == [1]
+    assert cache.reads == ['Team A']
+
+    # Names that sanitize alike are separate cache entries
+    assert cache.read_excel(workbook, 'Team_A')['Value'].tolist() == [2]
+    assert cache.read_excel(workbook, 1)['Value'].tolist() == [2]
+    assert cache.read_excel(workbook)['Value'].tolist() == [1]
+    both = cache.read_excel(workbook, ['Team_A', 0])
+    assert list(both) == ['Team_A', 0] and both[0]['Value'].tolist() == [1]
+    every = cache.read_excel(workbook, None)
+    assert {name: df['Value'].tolist() for name, df in every.items()} == {'Team A': [1], 'Team_A': [2], 'Team.A': [3]}
+    assert cache.reads == ['Team A', 'Team_A', 'Team.A']
+
+    # New content is a new hash, so nothing stale is served
+    write_workbook(workbook, {'Team A': [10]})
+    assert cache.read_excel(workbook, 'Team A')['Value'].tolist() == [10]
+    assert cache.sheet_names(workbook) == ['Team A']
+    assert cache.reads[-1] == 'Team A' and len(cache.reads) == 4
+
+
+def test_unreadable_cache_file_falls_back_to_the_workbook(cache, tmp_path):
+    workbook = tmp_path / 'book.xlsx'
+    write_workbook(workbook, {'Players': [1, 2]})
+    cache.read_excel(workbook, 'Players')
+    cache_file = cache._cache_file(cache.workbook_hash(workbook), 'sheet', 'Players')
+
+    # A pickle from another pandas version fails with e.g. AttributeError, not UnpicklingError
+    cache_file.write_bytes(b'\x80\x04\x95\x1a\x00\x00\x00\x00\x00\x00\x00\x8c\x0cno_such_mod\x94\x8c\x01X\x94\x93\x94.')
+    assert cache.read_excel(workbook, 'Players')['Value'].tolist() == [1, 2]
+    cache_file.write_bytes(b'\x80\x04trunc')
+    assert cache.read_excel(workbook, 'Players')['Value'].tolist() == [1, 2]
+
+    assert cache.reads == ['Players'] * 3
+    assert cache.read_excel(workbook, 'Players')['Value'].tolist() == [1, 2] and len(cache.reads) == 3
@@ -0,0 +1,85 @@
+"""
+Tests for the streaming workbook writer
+Run with: python -m pytest scripts
+"""
+
+import datetime
+
+import numpy as np
+import openpyxl
+import pandas as pd
+import pytest
+from openpyxl.styles import Font
+
+from player_schema import ROLE_ORDER
+from workbook_writer import WorkbookWriter
+
+
+def make_source(path):
+    """Workbook saved the normal way: shared strings, custom number format, bold header"""
+    wb = openpyxl.Workbook()
+    teams = wb.active
+    teams.title = 'Teams'
+    teams.append(['TeamName', 'Budget', 'Founded'])
+    teams.append(['Mavericks', 1000, datetime.datetime(2020, 5, 1)])
+    teams.append(['Strikers', 950.5, datetime.datetime(2021, 6, 2)])
+    teams['A1'].font = Font(bold=True)
+    teams['B2'].number_format = '#,##0.00'
+    wb.create_sheet('Notes').append(['Mavericks'])
+    wb.save(path)
+
+
+def test_frames_and_copied_sheet_round_trip(tmp_path):
+    source, out = tmp_path / 'source.xlsx', tmp_path / 'out.xlsx'
+    make_source(source)
+    players = pd.DataFrame({
+        'PlayerID': ['A1', 'B2', 'C3'],
+        'Role': ['Batsman', 'Bowler', None],
+        'BaseTokens': np.array([35, 40, 45], dtype='int64'),
+        'SoldPrice': [60.0, np.nan, 45.0],
+    })
+
+    with WorkbookWriter(out) as writer:
+        writer.copy_sheet(source, 'Teams')
+        writer.write_frame('Players', players, column_formats={'BaseTokens': '0'},
+                           validations={'Role': ROLE_ORDER}, column_widths={'PlayerID': 12})
+
+    assert pd.read_excel(out, sheet_name='Players').equals(players)
+    assert pd.read_excel(out, sheet_name='Teams').equals(pd.read_excel(source, sheet_name='Teams'))
+
+    wb = openpyxl.load_workbook(out)
+    assert wb.sheetnames == ['Teams', 'Players']
+    teams, sheet = wb['Teams'], wb['Players']
+    assert teams['A1'].font.b and teams['B2'].number_format == '#,##0.00'
+    assert teams['C2'].value == datetime.datetime(2020, 5, 1)
+    assert sheet['C2'].number_format == '0' and sheet['A1'].font.b
+    assert sheet.column_dimensions['A'].width == 12
+    validation = sheet.data_validations.dataValidation[0]
+    assert str(validation.sqref) == 'B2:B1048576' and validation.formula1 == '"Batsman,Bowler,All-rounder,WicketKeeper"'
+
+
+def test_copy_can_rename_and_missing_sheet_raises(tmp_path):
+    source, out = tmp_path / 'source.xlsx', tmp_path / 'out.xlsx'
+    make_source(source)
+
+    with WorkbookWriter(out) as writer:
+        writer.copy_sheet(source, 'Teams', new_name='Teams_2025')
+        writer.copy_sheet(source, 'Notes')
+        with pytest.raises(KeyError):
+            writer.copy_sheet(source, 'Missing')
+
+    assert openpyxl.load_workbook(out).sheetnames == ['Teams_2025', 'Notes']
+    assert pd.read_excel(out, sheet_name='Notes', header=None).iloc[0, 0] == 'Mavericks'
+
+
+def test_failed_write_leaves_existing_file_alone(tmp_path):
+    out = tmp_path / 'out.xlsx'
+    out.write_bytes(b'previous')
+
+    with pytest.raises(RuntimeError):
+        with WorkbookWriter(out) as writer:
+            writer.write_frame('Players', pd.DataFrame({'A': [1]}))
+            raise RuntimeError('boom')
+
+    assert out.read_bytes() == b'previous'
+    assert list(tmp_path.iterdir()) == [out]
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Thread-safe LRU cache of decoded, downsized player photos
+get() returns the thumbnail for an image path, decoding it on first use;
+prefetch() queues paths on a background worker thread so the images the
+app will need next (the next grid page, the next lots) are already
+decoded when they are shown. JPEGs are decoded at reduced scale (draft
+mode), so a 4000px phone photo costs a fraction of a full decode.
+
+    cache = ThumbnailCache(size=(150, 150))
+    cache.prefetch(next_page_paths)
+    img = cache.get(path)
+"""
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from PIL import Image
+
+DEFAULT_SIZE = (200, 200)
+DEFAULT_MAX_ITEMS = 256
+
+
+def load_thumbnail(path, size=DEFAULT_SIZE):
+    """Decode an image straight to size (same square resize the app has always used)"""
+    with Image.open(path) as img:
+        img.draft('RGB', size)
+        return img.resize(size)
+
+
+class ThumbnailCache:
+    """LRU of thumbnails keyed by path; loads requested while a prefetch is running wait for it"""
+
+    def __init__(self, size=DEFAULT_SIZE, max_items=DEFAULT_MAX_ITEMS, workers=1):
+        self.size = tuple(size)
+        self.max_items = max_items
+        self._images = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='thumbnails')
+        self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self._images)
+
+    def __contains__(self, path):
+        return str(path) in self._images
+
+    def _store(self, key, img):
+        with self._lock:
+            self._pending.pop(key, None)
+            if img is None:
+                return
+            self._images[key] = img
+            self._images.move_to_end(key)
+            while len(self._images) > self.max_items:
+                self._images.popitem(last=False)
+
+    def _load(self, key):
+        try:
+            img = load_thumbnail(key, self.size)
+        except (OSError, ValueError):
+            img = None
+        self._store(key, img)
+        return img
+
+    def get(self, path):
+        """Thumbnail for path (None if it is missing or unreadable)"""
+        if path is None:
+            return None
+        key = str(Path(path))
+        with self._lock:
+            img = self._images.get(key)
+            if img is not None:
+                self._images.move_to_end(key)
+                self.hits += 1
+                return img
+            self.misses += 1
+            future = self._pending.get(key)
+        if future is not None:
+            return future.result()
+        return self._load(key)
+
+    def prefetch(self, paths):
+        """Queue the paths not cached or already queued for loading in the background"""
+        queued = 0
+        with self._lock:
+            for path in paths:
+                if path is None:
+                    continue
+                key = str(Path(path))
+                if key in self._images or key in self._pending:
+                    continue
+                self._pending[key] = self._executor.submit(self._load, key)
+                queued += 1
+        return queued
+
+    def close(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Search and paging index for the app's Unsold Players grid
+Built once per unsold list: lower-cased name/PlayerID search keys and
+role -> positions. A page query filters the positions of the role (all of
+them when no role is chosen), matches the search text against the keys,
+and returns only the players of the requested page, so the grid renders
+and loads photos for one page at a time.
+
+    index = UnsoldIndex(unsold_players)
+    page = index.page('reddy', role='Bowler', page_number=0)
+"""
+
+from collections import namedtuple
+
+PAGE_SIZE = 12
+
+# number counts from 0; next_players are the players of the following page (for prefetching)
+UnsoldPage = namedtuple('UnsoldPage', ['players', 'number', 'total_pages', 'matches', 'next_players'])
+
+
+def index_key(players):
+    """Identity of an unsold list (its PlayerIDs in order); rebuild the index when it changes"""
+    return tuple(str(player['PlayerID']) for player in players)
+
+
+class UnsoldIndex:
+    """Role and text index over a list of unsold player dicts"""
+
+    def __init__(self, players):
+        self.players = list(players)
+        self.search_keys = [f"{player['Name']} {player['PlayerID']}".casefold() for player in self.players]
+        self.by_role = {}
+        for position, player in enumerate(self.players):
+            self.by_role.setdefault(player['Role'], []).append(position)
+
+    def __len__(self):
+        return len(self.players)
+
+    def matches(self, query='', role=None):
+        """Positions of the players in role (any role if None) whose name or PlayerID contains query"""
+        positions = range(len(self.players)) if role is None else self.by_role.get(role, [])
+        query = (query or '').strip().casefold()
+        if not query:
+            return list(positions)
+        return [position for position in positions if query in self.search_keys[position]]
+
+    def page(self, query='', role=None, page_number=0, page_size=PAGE_SIZE):
+        """One UnsoldPage; page_number is clamped to the pages the filter leaves"""
+        positions = self.matches(query, role)
+        total_pages = max(1, -(-len(positions) // page_size))
+        number = min(max(page_number, 0), total_pages - 1)
+        start = number * page_size
+        return UnsoldPage(
+            [self.players[position] for position in positions[start:start + page_size]],
+            number,
+            total_pages,
+            len(positions),
+            [self.players[position] for position in positions[start + page_size:start + 2 * page_size]],
+        )
@@ -4,11 +4,16 @@ Update Photo Filenames to Use Player IDs
 Updates Excel and generates SQL to update Supabase
 """
 
-import pandas as pd
+import argparse
 from pathlib import Path
-import shutil
 
-def update_photo_filenames():
+import workbook_cache
+from cell_patcher import patch_cells
+from image_derivatives import build_derivatives, summarize
+from photo_sync import DEFAULT_WORKERS, format_bytes, sync_directory
+from sql_emitter import frame_rows, write_bulk_update
+
+def update_photo_filenames(link=False, delete_orphans=False, workers=DEFAULT_WORKERS, derivatives=True):
     """Update photo filenames to use player_id instead of name-based"""
     
     print("📸 Updating Photo Filenames to Player IDs...")
@@ -23,24 +28,28 @@ def update_photo_filenames():
     
     try:
         # Read players data
-        players_df = pd.read_excel(excel_file, sheet_name='Players')
+        players_df = workbook_cache.read_excel(excel_file, sheet_name='Players')
         
         print(f"📊 Loaded {len(players_df)} players")
         print()
         
         # Update PhotoFileName to use PlayerID
         print("🔧 Updating photo filenames to use Player IDs...")
-        players_df['PhotoFileName'] = players_df['PlayerID'] + '.jpg'
+        new_filenames = players_df['PlayerID'] + '.jpg'
+        changed = players_df['PhotoFileName'] != new_filenames
+        players_df['PhotoFileName'] = new_filenames
         
-        print("✅ Photo filenames updated")
+        print(f"✅ Photo filenames updated ({changed.sum()} changed)")
         print()
         
-        # Save updated Excel
+        # Save updated Excel: only the changed PhotoFileName cells are rewritten
         print("💾 Saving updated Excel file...")
-        with pd.ExcelWriter(excel_file, engine='openpyxl', mode='a', if_sheet_exists='overlay') as writer:
-            players_df.to_excel(writer, sheet_name='Players', index=False)
+        patch = patch_cells(excel_file, {
+            player_id: {'PhotoFileName': filename}
+            for player_id, filename in zip(players_df.loc[changed, 'PlayerID'], players_df.loc[changed, 'PhotoFileName'])
+        })
         
-        print(f"✅ Updated: {excel_file}")
+        print(f"✅ Updated {patch.cells} cell(s) in: {excel_file}")
         print()
         
         # Generate SQL UPDATE statements for Supabase
@@ -52,8 +61,8 @@ def update_photo_filenames():
             f.write("-- Run this in Supabase SQL Editor\n\n")
             
             f.write("-- Update all player photo filenames\n")
-            for _, row in players_df.iterrows():
-                f.write(f"UPDATE players SET photo_filename = '{row['PlayerID']}.jpg' WHERE player_id = '{row['PlayerID']}';\n")
+            write_bulk_update(f, 'players', 'player_id', ['photo_filename'],
+                              frame_rows(players_df, ['PlayerID', 'PhotoFileName']))
             
             f.write("\n-- Verify updates\n")
             f.write("SELECT player_id, name, photo_filename FROM players ORDER BY player_id LIMIT 10;\n")
@@ -61,31 +70,38 @@ def update_photo_filenames():
         print(f"✅ Created: {sql_file}")
         print()
         
-        # Copy player images to public folder for Vercel
-        print("📁 Copying player images to public folder...")
-        
-        source_dir = Path('assets/images/players')
-        dest_dir = Path('public/players')
-        
-        # Create destination directory
-        dest_dir.mkdir(exist_ok=True)
-        
-        # Copy all player images
-        copied_count = 0
-        for img_file in source_dir.glob('*.jpg'):
-            dest_file = dest_dir / img_file.name
-            shutil.copy2(img_file, dest_file)
-            copied_count += 1
-        
-        print(f"✅ Copied {copied_count} player images to public/players/")
+        # Sync player images to public folder for Vercel (only new/changed files)
+        print("📁 Syncing player images to public folder...")
+        
+        sync = sync_directory(Path('assets/images/players'), Path('public/players'), '*.jpg',
+                              workers=workers, link=link, delete_orphans=delete_orphans)
+        copied_count = len(sync.copied)
+        
+        print(f"✅ Copied {copied_count} new/changed player images to public/players/ "
+              f"({format_bytes(sync.bytes_copied)})")
+        print(f"⏭️  Skipped {sync.unchanged} unchanged images ({format_bytes(sync.bytes_saved)} saved)")
+        if sync.deleted:
+            print(f"🗑️  Deleted {len(sync.deleted)} orphaned images from public/players/")
+        elif sync.orphans:
+            print(f"⚠️  {len(sync.orphans)} images in public/players/ have no source "
+                  f"(rerun with --delete-orphans to remove): {', '.join(sync.orphans[:5])}")
         print()
         
+        # Web-optimized derivatives (only images whose content changed are re-encoded)
+        if derivatives:
+            print("🖼️  Building web-optimized photo and logo derivatives...")
+            manifest, built, cached = build_derivatives(Path('public'))
+            source_bytes, derived_bytes = summarize(manifest)
+            print(f"✅ {built} image(s) processed, {cached} cached -> public/derived/manifest.json")
+            print(f"📉 {format_bytes(source_bytes)} of originals served as {format_bytes(derived_bytes)}")
+            print()
+        
         # Generate summary
         print("📊 SUMMARY")
         print("=" * 70)
         print(f"✅ Updated {len(players_df)} player photo filenames")
         print(f"✅ Photo format: [PlayerID].jpg (e.g., 1P0T.jpg)")
-        print(f"✅ Copied {copied_count} images to public/players/")
+        print(f"✅ Synced public/players/ ({copied_count} copied, {sync.unchanged} unchanged)")
         print(f"✅ Generated SQL update script")
         print()
         print("🎯 NEXT STEPS:")
@@ -105,7 +121,16 @@ def update_photo_filenames():
         return False
 
 if __name__ == "__main__":
-    success = update_photo_filenames()
+    parser = argparse.ArgumentParser(description='Switch photo filenames to Player IDs and sync public/players')
+    parser.add_argument('--link', action='store_true', help='Hardlink photos instead of copying when possible')
+    parser.add_argument('--delete-orphans', action='store_true',
+                        help='Remove images from public/players that are not in assets/images/players')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help='Copy threads')
+    parser.add_argument('--no-derivatives', action='store_true', help='Skip building public/derived images')
+    args = parser.parse_args()
+    
+    success = update_photo_filenames(link=args.link, delete_orphans=args.delete_orphans, workers=args.workers,
+                                     derivatives=not args.no_derivatives)
     if not success:
         print("\n❌ Update failed. Please check the errors above.")
         exit(1)
\ No newline at end of file
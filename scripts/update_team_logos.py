@@ -6,6 +6,8 @@ Update team logo filenames in the Excel file
 import pandas as pd
 from pathlib import Path
 
+import workbook_cache
+
 def update_team_logos():
     """Update team logos to match actual files in public folder"""
     
@@ -28,8 +30,8 @@ def update_team_logos():
     players_file = Path('data/CPL_Players_Editable.xlsx')
     
     # Read both sheets
-    players_df = pd.read_excel(players_file, sheet_name='Players')
-    teams_df = pd.read_excel(players_file, sheet_name='Teams')
+    players_df = workbook_cache.read_excel(players_file, sheet_name='Players')
+    teams_df = workbook_cache.read_excel(players_file, sheet_name='Teams')
     
     print(f"📊 Found {len(teams_df)} teams")
     print()
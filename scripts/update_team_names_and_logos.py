@@ -6,6 +6,9 @@ Update team names and logo filenames in captain_team_assignments.xlsx
 import pandas as pd
 from pathlib import Path
 
+import workbook_cache
+from sql_emitter import frame_rows, write_bulk_update
+
 def update_teams():
     """Update team names and logos"""
     
@@ -26,7 +29,7 @@ def update_teams():
     
     # Read captain assignments
     captain_file = Path('data/captain_team_assignments.xlsx')
-    teams_df = pd.read_excel(captain_file, sheet_name='Teams')
+    teams_df = workbook_cache.read_excel(captain_file, sheet_name='Teams')
     
     print("📋 Current teams:")
     for _, row in teams_df.iterrows():
@@ -71,7 +74,7 @@ def update_teams():
     teams_export_df = pd.DataFrame(teams_export)
     
     # Read players
-    players_df = pd.read_excel(players_file, sheet_name='Players')
+    players_df = workbook_cache.read_excel(players_file, sheet_name='Players')
     
     # Write both sheets
     with pd.ExcelWriter(players_file, engine='openpyxl') as writer:
@@ -89,12 +92,8 @@ def update_teams():
         f.write("-- Update Team Names and Logos\n")
         f.write("-- Run this in Supabase SQL Editor\n\n")
         
-        for _, row in teams_df.iterrows():
-            team_id = row['TeamID']
-            team_name = row['TeamName']
-            logo_file = row['LogoFile']
-            
-            f.write(f"UPDATE teams SET team_name = '{team_name}', logo_file = '{logo_file}' WHERE team_id = '{team_id}';\n")
+        write_bulk_update(f, 'teams', 'team_id', ['team_name', 'logo_file'],
+                          frame_rows(teams_df, ['TeamID', 'TeamName', 'LogoFile']))
         
         f.write("\n-- Verify updates\n")
         f.write("SELECT team_id, team_name, logo_file FROM teams ORDER BY team_id;\n")
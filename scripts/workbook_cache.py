@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Shared Excel loader with an on-disk cache of parsed sheets
+Parsed DataFrames are pickled under .cache/workbooks, keyed by the
+workbook's content hash and a hash of the sheet name, so repeated and
+chained script runs skip the openpyxl XML parse entirely. A cache file
+that cannot be unpickled is deleted and the sheet is read again.
+"""
+
+import hashlib
+import pickle
+from pathlib import Path
+
+import pandas as pd
+
+CACHE_DIR = Path(__file__).resolve().parent.parent / '.cache' / 'workbooks'
+
+_HASH_CHUNK = 1 << 20
+
+
+def workbook_hash(path):
+    """Return the content hash used as cache key for a workbook"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _cache_file(content_hash, kind, key=''):
+    # The sheet name is hashed, not sanitized, so 'Team A' and 'Team_A' never share a file
+    key_hash = hashlib.blake2b(str(key).encode('utf-8'), digest_size=8).hexdigest()
+    return CACHE_DIR / content_hash[:2] / f"{content_hash}.{kind}.{key_hash}.pkl"
+
+
+def _load_cached(cache_file):
+    try:
+        with open(cache_file, 'rb') as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        # Truncated, or pickled by another pandas/numpy version: a cache miss, re-read the workbook
+        try:
+            cache_file.unlink(missing_ok=True)
+        except OSError:
+            pass
+        return None
+
+
+def _store_cached(cache_file, value):
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_suffix('.tmp')
+        with open(tmp_file, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp_file.replace(cache_file)
+    except OSError:
+        # A read-only checkout should still load data, just uncached
+        pass
+
+
+def sheet_names(path):
+    """List sheet names of a workbook (cached)"""
+    content_hash = workbook_hash(path)
+    cache_file = _cache_file(content_hash, 'sheets')
+    names = _load_cached(cache_file)
+    if names is None:
+        with pd.ExcelFile(path) as xls:
+            names = list(xls.sheet_names)
+        _store_cached(cache_file, names)
+    return names
+
+
+def read_excel(path, sheet_name=0):
+    """
+    Drop-in replacement for pd.read_excel(path, sheet_name=...)
+    sheet_name may be a name, a position, a list of either, or None for all sheets.
+    """
+    path = Path(path)
+    content_hash = workbook_hash(path)
+
+    if sheet_name is None or isinstance(sheet_name, (list, tuple)):
+        names = sheet_names(path) if sheet_name is None else sheet_name
+        return {name: read_excel(path, name) for name in names}
+
+    if isinstance(sheet_name, int):
+        sheet_name = sheet_names(path)[sheet_name]
+
+    cache_file = _cache_file(content_hash, 'sheet', sheet_name)
+    df = _load_cached(cache_file)
+    if df is None:
+        df = pd.read_excel(path, sheet_name=sheet_name)
+        _store_cached(cache_file, df)
+    return df
+
+
+def clear_cache():
+    """Remove all cached sheets"""
+    removed = 0
+    if CACHE_DIR.exists():
+        for cache_file in CACHE_DIR.rglob('*.pkl'):
+            cache_file.unlink()
+            removed += 1
+    return removed
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) > 1 and sys.argv[1] == '--clear':
+        print(f"🧹 Removed {clear_cache()} cached sheet(s) from {CACHE_DIR}")
+    else:
+        print("Usage: python scripts/workbook_cache.py --clear")
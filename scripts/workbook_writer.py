@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Streaming multi-sheet workbook writer
+DataFrames are written through openpyxl's write-only mode, one row at a
+time, instead of pd.ExcelWriter building the whole workbook in memory.
+Sheets that are only carried over from another workbook are copied at the
+XML level: their worksheet part is spliced into the output as-is, with
+shared-string cells turned into inline strings and style indices remapped,
+so they are never loaded into pandas or openpyxl.
+
+    with WorkbookWriter('out.xlsx') as writer:
+        writer.copy_sheet('assets/Cpl_data.xlsx', 'Teams')
+        writer.write_frame('Players', df, column_formats={'BaseTokens': '0'},
+                           validations={'Role': ROLE_ORDER})
+"""
+
+import copy
+import posixpath
+import re
+import zipfile
+from pathlib import Path
+from xml.etree import ElementTree as ET
+
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+from openpyxl.utils import get_column_letter
+from openpyxl.worksheet.datavalidation import DataValidation
+
+SML_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+REL_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+PKG_REL_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+
+# Excel applies a list validation to this many rows, so rows added later are covered too
+MAX_EXCEL_ROW = 1048576
+FIRST_CUSTOM_NUMFMT_ID = 164
+
+# Rows converted to Python values at a time, so memory does not grow with the frame
+FRAME_CHUNK_ROWS = 10000
+
+_SHARED_CELL_RE = re.compile(rb'<c\b([^>]*?)\st="s"([^>]*)><v>(\d+)</v></c>')
+_STYLE_REF_RE = re.compile(rb'(<(?:c|row|col)\b[^>]*?\s(?:s|style)=")(\d+)"')
+_SHARED_STRING_RE = re.compile(rb'<si>(.*?)</si>|<si/>', re.S)
+_TAB_SELECTED_RE = re.compile(rb'\stabSelected="(?:1|true)"')
+
+ET.register_namespace('', SML_NS)
+
+
+def _q(tag):
+    return f'{{{SML_NS}}}{tag}'
+
+
+def sheet_parts(archive):
+    """{sheet title: worksheet part name} for an open .xlsx zip"""
+    workbook = ET.fromstring(archive.read('xl/workbook.xml'))
+    rels = ET.fromstring(archive.read('xl/_rels/workbook.xml.rels'))
+    targets = {}
+    for rel in rels.iter(f'{{{PKG_REL_NS}}}Relationship'):
+        target = rel.get('Target')
+        targets[rel.get('Id')] = target.lstrip('/') if target.startswith('/') else posixpath.join('xl', target)
+    return {sheet.get('name'): posixpath.normpath(targets[sheet.get(f'{{{REL_NS}}}id')])
+            for sheet in workbook.iter(_q('sheet'))}
+
+
+def row_chunks(stream, chunk_size=1 << 20):
+    """Read a worksheet part in chunks that each end on a </row> (the last one ends the part)"""
+    carry = b''
+    while True:
+        data = stream.read(chunk_size)
+        buffer = carry + data
+        if not data:
+            if buffer:
+                yield buffer
+            return
+        cut = buffer.rfind(b'</row>')
+        if cut < 0:
+            carry = buffer
+            continue
+        cut += len(b'</row>')
+        yield buffer[:cut]
+        carry = buffer[cut:]
+
+
+def _rels_part(part):
+    directory, name = posixpath.split(part)
+    return posixpath.join(directory, '_rels', f'{name}.rels')
+
+
+def _merge_styles(target_xml, source_xml):
+    """
+    Append the source stylesheet's fonts, fills, borders, number formats and
+    cell formats to the target's. Returns (merged styles.xml bytes, offset to
+    add to the source's cell style indices).
+    """
+    target = ET.fromstring(target_xml)
+    source = ET.fromstring(source_xml)
+
+    def section(root, tag):
+        element = root.find(_q(tag))
+        if element is None:
+            element = ET.SubElement(root, _q(tag))
+        return element
+
+    offsets = {}
+    for tag, child in [('fonts', 'font'), ('fills', 'fill'), ('borders', 'border')]:
+        target_section = section(target, tag)
+        existing = target_section.findall(_q(child))
+        offsets[child] = len(existing)
+        for element in section(source, tag).findall(_q(child)):
+            target_section.append(copy.deepcopy(element))
+        target_section.set('count', str(len(target_section.findall(_q(child)))))
+
+    # Custom number formats get fresh IDs so they cannot collide with the target's
+    target_numfmts = target.find(_q('numFmts'))
+    used_ids = [int(fmt.get('numFmtId')) for fmt in (target_numfmts if target_numfmts is not None else [])]
+    next_id = max(used_ids + [FIRST_CUSTOM_NUMFMT_ID - 1]) + 1
+    numfmt_ids = {}
+    source_numfmts = source.find(_q('numFmts'))
+    if source_numfmts is not None and len(source_numfmts):
+        if target_numfmts is None:
+            # numFmts must be the stylesheet's first child
+            target_numfmts = ET.Element(_q('numFmts'))
+            target.insert(0, target_numfmts)
+        for fmt in source_numfmts.findall(_q('numFmt')):
+            numfmt_ids[fmt.get('numFmtId')] = str(next_id)
+            target_numfmts.append(ET.Element(_q('numFmt'), numFmtId=str(next_id), formatCode=fmt.get('formatCode')))
+            next_id += 1
+        target_numfmts.set('count', str(len(target_numfmts)))
+
+    target_xfs = section(target, 'cellXfs')
+    xf_offset = len(target_xfs.findall(_q('xf')))
+    for xf in section(source, 'cellXfs').findall(_q('xf')):
+        xf = copy.deepcopy(xf)
+        for attr, child in [('fontId', 'font'), ('fillId', 'fill'), ('borderId', 'border')]:
+            xf.set(attr, str(int(xf.get(attr, 0)) + offsets[child]))
+        xf.set('numFmtId', numfmt_ids.get(xf.get('numFmtId', '0'), xf.get('numFmtId', '0')))
+        # Named cell styles are not carried over; the formatting itself is
+        xf.set('xfId', '0')
+        target_xfs.append(xf)
+    target_xfs.set('count', str(len(target_xfs.findall(_q('xf')))))
+
+    return ET.tostring(target, encoding='UTF-8', xml_declaration=True), xf_offset
+
+
+def _transplant_chunks(stream, shared_strings, xf_offset, chunk_size=1 << 20):
+    """
+    Rewrite a worksheet part for the output, streaming in chunks cut at row
+    boundaries: shared-string cells become inline strings and style indices
+    are shifted by xf_offset. Only the matching cells are touched.
+    """
+    def inline(match):
+        value = shared_strings[int(match.group(3))]
+        return b'<c%s t="inlineStr"%s><is>%s</is></c>' % (match.group(1), match.group(2), value)
+
+    def shift(match):
+        return b'%s%d"' % (match.group(1), int(match.group(2)) + xf_offset)
+
+    for chunk in row_chunks(stream, chunk_size):
+        chunk = _TAB_SELECTED_RE.sub(b'', chunk)
+        if shared_strings:
+            chunk = _SHARED_CELL_RE.sub(inline, chunk)
+        yield _STYLE_REF_RE.sub(shift, chunk)
+
+
+class WorkbookWriter:
+    """Write-only .xlsx writer for DataFrames plus XML-level sheet copies"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.workbook = Workbook(write_only=True)
+        self._copies = {}
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+    def write_frame(self, sheet_name, df, column_formats=None, validations=None, column_widths=None,
+                    bold_header=True):
+        """
+        Stream a DataFrame into a new sheet (header row plus one row per record, no index).
+        column_formats maps column name -> Excel number format, validations
+        maps column name -> allowed values (an in-cell dropdown) and
+        column_widths maps column name -> width in characters.
+        """
+        ws = self.workbook.create_sheet(sheet_name)
+        columns = list(df.columns)
+        positions = {name: index for index, name in enumerate(columns)}
+
+        # Column dimensions are written with the sheet header, before any row
+        for name, width in (column_widths or {}).items():
+            ws.column_dimensions[get_column_letter(positions[name] + 1)].width = width
+
+        for name, allowed in (validations or {}).items():
+            letter = get_column_letter(positions[name] + 1)
+            validation = DataValidation(type='list', formula1='"' + ','.join(allowed) + '"', allow_blank=True,
+                                        showErrorMessage=True, errorTitle=f'Invalid {name}',
+                                        error=f"{name} must be one of: {', '.join(allowed)}")
+            validation.add(f'{letter}2:{letter}{MAX_EXCEL_ROW}')
+            ws.data_validations.append(validation)
+
+        header_font = Font(bold=True)
+        header = []
+        for name in columns:
+            cell = WriteOnlyCell(ws, value=str(name))
+            if bold_header:
+                cell.font = header_font
+            header.append(cell)
+        ws.append(header)
+
+        formats = [(positions[name], number_format) for name, number_format in (column_formats or {}).items()]
+        for start in range(0, len(df), FRAME_CHUNK_ROWS):
+            chunk = df.iloc[start:start + FRAME_CHUNK_ROWS]
+            # Missing values become empty cells; object dtype also turns numpy scalars into Python ones
+            values = chunk.astype(object).where(chunk.notna(), None)
+            for record in values.itertuples(index=False, name=None):
+                row = list(record)
+                for position, number_format in formats:
+                    cell = WriteOnlyCell(ws, value=row[position])
+                    cell.number_format = number_format
+                    row[position] = cell
+                ws.append(row)
+
+    def copy_sheet(self, source_path, sheet_name, new_name=None):
+        """
+        Carry a sheet over from another workbook without parsing its cells.
+        Sheets with their own relationships (drawings, comments, tables) are
+        copied by value instead, since those parts are not transplanted.
+        """
+        source_path = Path(source_path)
+        with zipfile.ZipFile(source_path) as archive:
+            part = sheet_parts(archive).get(sheet_name)
+            if part is None:
+                raise KeyError(f"Sheet '{sheet_name}' not found in {source_path}")
+            has_rels = _rels_part(part) in archive.namelist()
+
+        title = new_name or sheet_name
+        if has_rels:
+            self.write_frame(title, pd.read_excel(source_path, sheet_name=sheet_name))
+            return
+        # Placeholder sheet: its part is replaced when the workbook is closed
+        self.workbook.create_sheet(title)
+        self._copies[title] = (source_path, part)
+
+    def discard(self):
+        """Abandon the workbook, leaving any existing file at path untouched"""
+        if self._closed:
+            return
+        self._closed = True
+        for ws in self.workbook.worksheets:
+            # Each write-only sheet streams into its own temp file
+            if ws._writer is not None:
+                if not ws.closed:
+                    ws.close()
+                ws._writer.cleanup()
+
+    def close(self):
+        """Write the workbook to path (atomically, through a temp file)"""
+        if self._closed:
+            return
+        self._closed = True
+        tmp_path = self.path.with_name(f".{self.path.name}.tmp")
+        self.workbook.save(tmp_path)
+        try:
+            if self._copies:
+                spliced_path = self.path.with_name(f".{self.path.name}.splice.tmp")
+                self._splice_copies(tmp_path, spliced_path)
+                spliced_path.replace(tmp_path)
+            tmp_path.replace(self.path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+    def _splice_copies(self, written_path, out_path):
+        with zipfile.ZipFile(written_path) as written:
+            parts = sheet_parts(written)
+            styles_xml = written.read('xl/styles.xml')
+            spliced = {}
+            for title, (source_path, source_part) in self._copies.items():
+                with zipfile.ZipFile(source_path) as source:
+                    shared_strings = []
+                    if 'xl/sharedStrings.xml' in source.namelist():
+                        shared_strings = [match.group(1) or b'<t/>' for match in
+                                          _SHARED_STRING_RE.finditer(source.read('xl/sharedStrings.xml'))]
+                    styles_xml, xf_offset = _merge_styles(styles_xml, source.read('xl/styles.xml'))
+                spliced[parts[title]] = (source_path, source_part, shared_strings, xf_offset)
+
+            with zipfile.ZipFile(out_path, 'w', zipfile.ZIP_DEFLATED) as out:
+                for info in written.infolist():
+                    info.compress_type = zipfile.ZIP_DEFLATED
+                    if info.filename == 'xl/styles.xml':
+                        out.writestr(info, styles_xml)
+                    elif info.filename in spliced:
+                        source_path, source_part, shared_strings, xf_offset = spliced[info.filename]
+                        with zipfile.ZipFile(source_path) as source, source.open(source_part) as stream, \
+                                out.open(info, 'w') as dest:
+                            for chunk in _transplant_chunks(stream, shared_strings, xf_offset):
+                                dest.write(chunk)
+                    else:
+                        out.writestr(info, written.read(info.filename))
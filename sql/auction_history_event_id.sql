@@ -0,0 +1,12 @@
+-- Event IDs for sales synced from the Streamlit app (scripts/db_sink.py)
+-- Run once in Supabase SQL Editor; safe to re-run
+
+ALTER TABLE auction_history ADD COLUMN IF NOT EXISTS event_id TEXT;
+
+-- A retried batch re-sends the same event IDs; this index makes the second copy a no-op
+CREATE UNIQUE INDEX IF NOT EXISTS idx_auction_history_event_id ON auction_history(event_id);
+
+-- Verify
+SELECT column_name, data_type
+FROM information_schema.columns
+WHERE table_name = 'auction_history' AND column_name = 'event_id';